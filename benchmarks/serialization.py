@@ -0,0 +1,86 @@
+"""
+Compare the per-row cost of serializing search results through response models and through the fast path.
+
+Run from the repository root:
+
+    python -m benchmarks.serialization --rows 500 --repeat 200
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, Dict, List
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from src.api.endpoints.search import router
+from src.api.schemas import MenuItemResponse
+from src.utils import menu_json
+
+
+def make_rows(count: int) -> List[Dict[str, Any]]:
+    """Build rows shaped like SearchService results."""
+    return [
+        {
+            "name": f"Dish {i}",
+            "description": f"House special number {i}, served with rice and a crème fraîche dip",
+            "price": round(4.5 + (i % 97) * 0.25, 2) if i % 13 else None,
+            "section": f"Section {i % 7}",
+            "restaurant": f"Restaurant {i % 31}",
+        }
+        for i in range(count)
+    ]
+
+
+SEARCH_ROUTE = next(route for route in router.routes if isinstance(route, APIRoute) and route.path == "/search/items")
+LOOP = asyncio.new_event_loop()
+
+
+def response_model_path(rows: List[Dict[str, Any]]) -> bytes:
+    """What /search/items does by default: build models, then let FastAPI validate and serialize them."""
+    models = [MenuItemResponse(**item) for item in rows]
+    content = LOOP.run_until_complete(serialize_response(field=SEARCH_ROUTE.response_field, response_content=models))
+    return JSONResponse(content).body
+
+
+def stdlib_path(rows: List[Dict[str, Any]]) -> bytes:
+    """The fast path without orjson installed."""
+    return menu_json.encode_json(rows)
+
+
+def orjson_path(rows: List[Dict[str, Any]]) -> bytes:
+    """The fast path with orjson installed."""
+    return menu_json.orjson.dumps(rows)
+
+
+def time_per_row(serialize: Callable[[List[Dict[str, Any]]], bytes], rows: List[Dict[str, Any]], repeat: int) -> float:
+    """Get the best per-row time in microseconds over ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        serialize(rows)
+        best = min(best, time.perf_counter() - started)
+    return best / len(rows) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500, help="Rows per response (default: 500)")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed runs per path (default: 200)")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    paths = {"response models": response_model_path, "fast path (json)": stdlib_path}
+    if menu_json.orjson is not None:
+        paths["fast path (orjson)"] = orjson_path
+    # The fast path must not change what clients receive
+    assert stdlib_path(rows) == response_model_path(rows)
+
+    baseline = None
+    print(f"{args.rows} rows per response, best of {args.repeat} runs")
+    for name, serialize in paths.items():
+        cost = time_per_row(serialize, rows, args.repeat)
+        baseline = baseline or cost
+        print(f"  {name:<20} {cost:8.2f} us/row  {baseline / cost:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
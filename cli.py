@@ -1,79 +1,131 @@
 import json
+import os
 import sys
 import argparse
-from src.models.database import create_tables, drop_tables, get_db, Restaurant, Section, MenuItem
+from contextlib import nullcontext
+from typing import Any, Dict, Iterator, Optional
+from sqlalchemy import create_engine
+from src.models.database import create_tables, get_db, sqlite_path
+from src.ingest.normalize import normalize_restaurant
+from src.ingest.loader import bulk_load
+from src.ingest.reader import iter_restaurants, load_restaurants
+from src.ingest.incremental import incremental_load, supports_incremental
+from src.ingest.render import render_menus
+from src.ingest.swap import staged_build
+from src.ingest.sources import is_multi_file_source, iter_parsed, resolve_sources, validate_restaurant
+from src.services.restaurant_service import RestaurantService
+from src.utils.streaming import iter_ndjson
+from src.core.config import settings
+from src.core.exceptions import ValidationError, DatabaseError
 
 
-def build_database(json_file: str):
-    """Build the SQLite database from a JSON file."""
-    print(f"Building database from {json_file}...")
+def read_restaurants(source: str, stream: bool = False, workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Yield normalized restaurants from a menus JSON file, a directory or a glob."""
+    if is_multi_file_source(source):
+        paths = resolve_sources(source)
+        if not paths:
+            raise FileNotFoundError(source)
+        print(f"Parsing {len(paths)} files with {workers or os.cpu_count()} workers...")
+        yield from iter_parsed(paths, workers)
+        return
     
-    try:
-        with open(json_file, 'r') as f:
-            menu_data = json.load(f)
-    except FileNotFoundError:
-        print(f"Error: File {json_file} not found.")
+    with open(source, 'r') as f:
+        try:
+            # Streaming parses one restaurant at a time instead of loading the whole file
+            entries = iter_restaurants(f) if stream else load_restaurants(f)
+            for restaurant_name, restaurant_data in entries:
+                validate_restaurant(restaurant_name, restaurant_data)
+                yield normalize_restaurant(restaurant_name, restaurant_data)
+        except ValidationError as e:
+            raise ValidationError(f"{e.message} in {source}", e.details)
+
+
+def build_database(
+    source: str,
+    batch_size: int = 10000,
+    stream: bool = False,
+    incremental: bool = False,
+    workers: Optional[int] = None
+):
+    """Build the SQLite database from a JSON file, a directory of menu files or a glob."""
+    print(f"Building database from {source}...")
+    
+    target_path = sqlite_path(settings.database_url)
+    if not target_path:
+        print(f"Error: {settings.database_url} is not a SQLite database file.")
         sys.exit(1)
-    except json.JSONDecodeError:
-        print(f"Error: Invalid JSON in {json_file}.")
+    
+    if not is_multi_file_source(source) and not os.path.isfile(source):
+        print(f"Error: File {source} not found.")
         sys.exit(1)
     
-    # Drop existing tables and recreate
-    print("Dropping existing tables...")
-    drop_tables()
-    print("Creating new tables...")
-    create_tables()
+    if incremental and os.path.exists(target_path):
+        # Decide before staging, so a full rebuild never starts from a copy of the old database
+        live = create_engine(f"sqlite:///{target_path}")
+        try:
+            incremental = supports_incremental(live)
+        finally:
+            live.dispose()
+        if not incremental:
+            print("Existing database was built with an older schema, falling back to a full rebuild...")
     
-    # Import data
-    with get_db() as db:
-        for restaurant_name, restaurant_data in menu_data.items():
-            print(f"Importing restaurant: {restaurant_name}")
-            
-            # Create restaurant
-            restaurant = Restaurant(name=restaurant_name)
-            db.add(restaurant)
-            db.flush()  # Flush to get the ID
-            
-            # Get sections array from restaurant data
-            sections = restaurant_data.get("sections", [])
-            
-            # Create sections and items
-            for section_data in sections:
-                section_name = section_data.get("name", "")
-                section = Section(name=section_name, restaurant_id=restaurant.id)
-                db.add(section)
-                db.flush()
-                
-                # Create menu items
-                items = section_data.get("items", [])
-                for item_data in items:
-                    # Handle price - convert to float or None if not a valid number
-                    price = item_data.get("price")
-                    if price is not None:
-                        try:
-                            price = float(price)
-                        except (ValueError, TypeError):
-                            # If price is not a valid number (e.g., "MKT"), set to None
-                            price = None
-                    
-                    menu_item = MenuItem(
-                        name=item_data.get("name", ""),
-                        description=item_data.get("description"),
-                        price=price,
-                        section_id=section.id
-                    )
-                    db.add(menu_item)
+    restaurants = read_restaurants(source, stream, workers)
+    
+    try:
+        # Build into a staging file so the live database is never half-written
+        with staged_build(target_path, copy_existing=incremental) as build:
+            if incremental:
+                # Only restaurants whose content hash changed are written
+                print("Applying incremental changes...")
+                create_tables(build.engine)
+                stats = incremental_load(build.engine, restaurants, batch_size)
+                print(
+                    f"Restaurants: {stats['inserted']} inserted, {stats['updated']} updated, "
+                    f"{stats['deleted']} deleted, {stats['unchanged']} unchanged"
+                )
+            else:
+                print("Creating new tables...")
+                create_tables(build.engine)
+                stats = bulk_load(build.engine, restaurants, batch_size, defer_indexes=True)
             
-            db.commit()
-            print(f"  - Imported {len(sections)} sections")
+            rendered = render_menus(build.engine)
+            print(f"Pre-rendered {rendered['rendered']} menus")
+            print("Checking integrity and analyzing...")
+    except FileNotFoundError:
+        print(f"Error: No menu files match {source}.")
+        sys.exit(1)
+    except json.JSONDecodeError:
+        print(f"Error: Invalid JSON in {source}.")
+        sys.exit(1)
+    except ValidationError as e:
+        print(f"Error: {e.message}.")
+        sys.exit(1)
+    except DatabaseError as e:
+        print(f"Error: {e.message}: {e.details}")
+        sys.exit(1)
     
-        print("Database build complete!")
+    print(
+        f"Imported {stats['restaurants']} restaurants, {stats['sections']} sections "
+        f"and {stats['items']} items in {stats['elapsed']:.2f}s "
+        f"({stats['rows_per_second']:,.0f} rows/sec)"
+    )
+    print(f"Database build complete! Generation {build.generation} is live at {target_path}")
+
+
+def export_items(output: Optional[str] = None):
+    """Write every menu item with its restaurant and section as NDJSON, to a file or stdout."""
+    with get_db() as db, (open(output, "wb") if output else nullcontext(sys.stdout.buffer)) as f:
+        lines = 0
+        for chunk in iter_ndjson(RestaurantService(db).iter_all_items()):
+            f.write(chunk)
+            lines += chunk.count(b"\n")
+    # Progress goes to stderr so stdout stays valid NDJSON
+    print(f"Exported {lines} items to {output or 'stdout'}", file=sys.stderr)
 
 
 def serve():
     """Start the FastAPI server."""
     import uvicorn
-    from src.core.config import settings
     print("Starting FastAPI server...")
     uvicorn.run(
         "main:app",
@@ -88,8 +140,34 @@ def main():
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
     # Build command
-    build_parser = subparsers.add_parser("build", help="Build database from JSON file")
-    build_parser.add_argument("json_file", help="Path to JSON file containing menu data")
+    build_parser = subparsers.add_parser("build", help="Build database from JSON menu files")
+    build_parser.add_argument(
+        "source",
+        help="Path to a JSON file containing menu data, or a directory or glob of per-restaurant JSON/NDJSON files"
+    )
+    build_parser.add_argument(
+        "--batch-size", type=int, default=10000,
+        help="Number of rows buffered per bulk insert (default: 10000)"
+    )
+    build_parser.add_argument(
+        "--stream", action="store_true",
+        help="Parse one restaurant at a time to keep memory flat on very large files"
+    )
+    build_parser.add_argument(
+        "--incremental", action="store_true",
+        help="Only write restaurants whose content changed instead of rebuilding everything"
+    )
+    build_parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Processes used to parse a directory or glob of files (default: CPU count)"
+    )
+    
+    # Export command
+    export_parser = subparsers.add_parser("export", help="Export every menu item as NDJSON")
+    export_parser.add_argument(
+        "--output", "-o", default=None,
+        help="File to write (default: stdout)"
+    )
     
     # Serve command
     subparsers.add_parser("serve", help="Start the API server")
@@ -97,7 +175,9 @@ def main():
     args = parser.parse_args()
     
     if args.command == "build":
-        build_database(args.json_file)
+        build_database(args.source, args.batch_size, args.stream, args.incremental, args.workers)
+    elif args.command == "export":
+        export_items(args.output)
     elif args.command == "serve":
         serve()
     else:
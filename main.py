@@ -1,21 +1,40 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from src.core.config import settings
 from src.core.logging import setup_logging
-from src.api.endpoints import restaurants, search, stats, privacy
+from src.api.endpoints import restaurants, search, stats, export, privacy
+from src.api.middleware import CompressionMiddleware, ConditionalGetMiddleware, ResponseCacheMiddleware
+from src.repositories.memory_repository import snapshot_manager
 
 # Setup logging
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the in-memory snapshot before serving, so no request pays for it."""
+    if settings.backend == "memory":
+        snapshot_manager.get_snapshot()
+    yield
+
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="API to browse restaurant menus with SQLite backend and cross-restaurant search",
+    lifespan=lifespan,
 )
 
+# The last middleware added runs first, so cached responses get validators too
+app.add_middleware(ResponseCacheMiddleware)
+app.add_middleware(ConditionalGetMiddleware)
+app.add_middleware(CompressionMiddleware)
+
 # Include routers
 app.include_router(restaurants.router)
 app.include_router(search.router)
 app.include_router(stats.router)
+app.include_router(export.router)
 app.include_router(privacy.router)
 
 
@@ -1,9 +1,25 @@
-from fastapi import Depends, HTTPException
+from typing import Callable, Dict, Optional, Sequence, Tuple, TypeVar
+from urllib.parse import quote
+from fastapi import Depends, HTTPException, Response
 from sqlalchemy.orm import Session
+from src.core.config import settings
 from src.models.database import get_db
+from src.repositories.memory_repository import MemoryRestaurantRepository, snapshot_manager
+from src.repositories.restaurant_repository import RestaurantRepository
 from src.services.restaurant_service import RestaurantService
 from src.services.search_service import SearchService
-from src.core.exceptions import NotFoundError, ValidationError
+from src.core.exceptions import NotFoundError, ValidationError, restaurant_not_found, validation_error
+from src.utils.fields import parse_fields
+from src.utils.menu_json import encode_json_fast
+from src.utils.pagination import Page
+
+T = TypeVar('T')
+
+# Response header carrying the cursor for the next page, absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Response header naming the restaurant a loosely matched name was resolved to, percent-encoded as in a path
+RESOLVED_RESTAURANT_HEADER = "X-Resolved-Restaurant"
 
 
 def get_database_session() -> Session:
@@ -12,14 +28,67 @@ def get_database_session() -> Session:
         yield db
 
 
-def get_restaurant_service(db: Session = Depends(get_database_session)) -> RestaurantService:
+def get_restaurant_repository(db: Session = Depends(get_database_session)) -> RestaurantRepository:
+    """FastAPI dependency to get the repository for the configured backend."""
+    if settings.backend == "memory":
+        # Sessions are lazy, so the unused one never opens a connection
+        return MemoryRestaurantRepository(snapshot_manager.get_snapshot())
+    return RestaurantRepository(db)
+
+
+def get_restaurant_service(
+    repository: RestaurantRepository = Depends(get_restaurant_repository)
+) -> RestaurantService:
     """FastAPI dependency to get restaurant service."""
-    return RestaurantService(db)
+    return RestaurantService(repository=repository)
 
 
-def get_search_service(db: Session = Depends(get_database_session)) -> SearchService:
+def get_search_service(repository: RestaurantRepository = Depends(get_restaurant_repository)) -> SearchService:
     """FastAPI dependency to get search service."""
-    return SearchService(db)
+    return SearchService(repository=repository)
+
+
+def set_next_cursor(response: Response, page: Page) -> None:
+    """Expose a page's continuation cursor to the client."""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+
+
+def select_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[Tuple[str, ...]]:
+    """Parse a ``fields`` query parameter, rejecting fields the endpoint does not return."""
+    try:
+        return parse_fields(fields, allowed)
+    except ValidationError as e:
+        raise validation_error(str(e), "fields")
+
+
+def rows_response(page: Page, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serialize a page of rows the service already shaped in one pass, bypassing response model validation."""
+    response = Response(encode_json_fast(page.items), media_type="application/json", headers=headers)
+    set_next_cursor(response, page)
+    return response
+
+
+def read_restaurant(
+    restaurant_service: RestaurantService,
+    restaurant_name: str,
+    read: Callable[[str], T]
+) -> Tuple[T, Dict[str, str]]:
+    """Read a restaurant by name, retrying under the restaurant a near miss most likely means.
+    
+    Returns the result with the headers to send. Exact names cost nothing
+    extra; when no restaurant is close enough, the 404 lists suggestions.
+    """
+    try:
+        return read(restaurant_name), {}
+    except NotFoundError as e:
+        if not str(e).startswith("Restaurant"):
+            raise
+    
+    match = restaurant_service.match_restaurant_name(restaurant_name)
+    if match.name is None:
+        raise restaurant_not_found(restaurant_name, match.suggestions)
+    return read(match.name), {RESOLVED_RESTAURANT_HEADER: quote(match.name)}
 
 
 def handle_service_exceptions(func):
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from src.services.restaurant_service import RestaurantService
+from src.api.dependencies import get_restaurant_service
+from src.utils.streaming import iter_ndjson
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+@router.get("/items")
+def export_items(restaurant_service: RestaurantService = Depends(get_restaurant_service)):
+    """Stream every menu item with its restaurant and section as newline-delimited JSON."""
+    # The session stays open until the response is sent, so rows stream straight from the cursor
+    return StreamingResponse(iter_ndjson(restaurant_service.iter_all_items()), media_type="application/x-ndjson")
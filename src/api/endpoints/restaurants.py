@@ -1,29 +1,60 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from src.services.restaurant_service import RestaurantService
-from src.api.dependencies import get_restaurant_service
+from src.api.dependencies import (
+    get_restaurant_service, read_restaurant, rows_response, select_fields, set_next_cursor
+)
+from src.core.config import settings
+from src.utils.fields import MENU_ITEM_FIELDS, RESTAURANT_ITEM_FIELDS
 from src.utils.sorting import SortBy, Order
-from src.core.exceptions import NotFoundError, restaurant_not_found, section_not_found
+from src.utils.streaming import iter_json_array
+from src.core.exceptions import (
+    NotFoundError, ValidationError, restaurant_not_found, section_not_found, validation_error
+)
 
 router = APIRouter(prefix="/restaurants", tags=["Restaurants"])
 
 
 @router.get("", response_model=List[str])
 def get_restaurants(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; all restaurants when omitted"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     restaurant_service: RestaurantService = Depends(get_restaurant_service)
 ):
-    """Return a list of all restaurant names."""
-    return restaurant_service.get_all_restaurants()
+    """Return all restaurant names, or one page of them when a limit is given."""
+    if limit is None and cursor is None:
+        # The session stays open until the response is sent, so names stream straight from the cursor
+        return StreamingResponse(
+            iter_json_array(restaurant_service.iter_restaurant_names()),
+            media_type="application/json"
+        )
+    
+    try:
+        page = restaurant_service.get_restaurants_page(limit or 100, cursor)
+    except ValidationError as e:
+        raise validation_error(str(e), "cursor")
+    
+    set_next_cursor(response, page)
+    return page.items
 
 
 @router.get("/{restaurant_name}")
 def get_restaurant_menu(
     restaurant_name: str,
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return, e.g. name,price; all when omitted"),
     restaurant_service: RestaurantService = Depends(get_restaurant_service)
 ):
     """Return the full menu for a specific restaurant."""
+    item_fields = select_fields(fields, MENU_ITEM_FIELDS)
     try:
-        return restaurant_service.get_restaurant_menu(restaurant_name)
+        menu, headers = read_restaurant(
+            restaurant_service, restaurant_name,
+            lambda name: restaurant_service.get_restaurant_menu_json(name, item_fields)
+        )
+        # Already serialized, so skip FastAPI's encoder and pass the JSON through
+        return Response(menu, media_type="application/json", headers=headers)
     except NotFoundError:
         raise restaurant_not_found(restaurant_name)
 
@@ -35,7 +66,10 @@ def get_restaurant_sections(
 ):
     """Return a list of all section names for a specific restaurant."""
     try:
-        return restaurant_service.get_restaurant_sections(restaurant_name)
+        sections, headers = read_restaurant(
+            restaurant_service, restaurant_name, restaurant_service.get_restaurant_sections_json
+        )
+        return Response(sections, media_type="application/json", headers=headers)
     except NotFoundError:
         raise restaurant_not_found(restaurant_name)
 
@@ -44,11 +78,17 @@ def get_restaurant_sections(
 def get_section_items(
     restaurant_name: str,
     section_name: str,
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return, e.g. name,price; all when omitted"),
     restaurant_service: RestaurantService = Depends(get_restaurant_service)
 ):
     """Return all items in a specific section of a restaurant."""
+    item_fields = select_fields(fields, MENU_ITEM_FIELDS)
     try:
-        return restaurant_service.get_section_items(restaurant_name, section_name)
+        items, headers = read_restaurant(
+            restaurant_service, restaurant_name,
+            lambda name: restaurant_service.get_section_items_json(name, section_name, item_fields)
+        )
+        return Response(items, media_type="application/json", headers=headers)
     except NotFoundError as e:
         if "Restaurant" in str(e):
             raise restaurant_not_found(restaurant_name)
@@ -58,17 +98,33 @@ def get_section_items(
 
 @router.get("/{restaurant_name}/items")
 def get_restaurant_items(
+    response: Response,
     restaurant_name: str,
     price_gt: Optional[float] = Query(None, description="Filter items with price greater than"),
     price_lt: Optional[float] = Query(None, description="Filter items with price less than"),
     sort_by: Optional[SortBy] = Query(None, description="Sort items by name or price"),
     order: Order = Query(Order.asc, description="Sort order"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; all items when omitted"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return, e.g. name,price; all when omitted"),
     restaurant_service: RestaurantService = Depends(get_restaurant_service)
 ):
-    """Return all items from a restaurant with optional filtering and sorting."""
+    """Return items from a restaurant with optional filtering, sorting and paging."""
+    item_fields = select_fields(fields, RESTAURANT_ITEM_FIELDS)
     try:
-        return restaurant_service.get_restaurant_items(
-            restaurant_name, price_gt, price_lt, sort_by, order
+        page, headers = read_restaurant(
+            restaurant_service, restaurant_name,
+            lambda name: restaurant_service.get_restaurant_items_page(
+                name, price_gt, price_lt, sort_by, order, limit, cursor, item_fields
+            )
         )
     except NotFoundError:
-        raise restaurant_not_found(restaurant_name)
\ No newline at end of file
+        raise restaurant_not_found(restaurant_name)
+    except ValidationError as e:
+        raise validation_error(str(e), "cursor")
+    
+    if settings.fast_json:
+        return rows_response(page, headers)
+    response.headers.update(headers)
+    set_next_cursor(response, page)
+    return page.items
\ No newline at end of file
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from typing import List, Optional
 from src.services.search_service import SearchService
-from src.api.dependencies import get_search_service
-from src.api.schemas import MenuItemResponse
+from src.api.dependencies import get_search_service, rows_response, select_fields, set_next_cursor
+from src.api.schemas import MenuItemResponse, SuggestionResponse
+from src.utils.fields import SEARCH_ITEM_FIELDS
 from src.utils.sorting import SortBy, Order
+from src.core.config import settings
 from src.core.exceptions import ValidationError, validation_error
 
 router = APIRouter(prefix="/search", tags=["Cross-Restaurant Search"])
@@ -11,6 +13,7 @@ router = APIRouter(prefix="/search", tags=["Cross-Restaurant Search"])
 
 @router.get("/items", response_model=List[MenuItemResponse])
 def search_items(
+    response: Response,
     query: Optional[str] = Query(None, description="Search in item names and descriptions"),
     price_gt: Optional[float] = Query(None, description="Filter items with price greater than"),
     price_lt: Optional[float] = Query(None, description="Filter items with price less than"),
@@ -18,35 +21,65 @@ def search_items(
     sort_by: Optional[SortBy] = Query(None, description="Sort items by name or price"),
     order: Order = Query(Order.asc, description="Sort order"),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return, e.g. name,price; all when omitted"),
     search_service: SearchService = Depends(get_search_service)
 ):
     """Search for menu items across all restaurants."""
-    results = search_service.search_items(
-        query=query,
-        price_gt=price_gt,
-        price_lt=price_lt,
-        restaurant=restaurant,
-        sort_by=sort_by,
-        order=order,
-        limit=limit
-    )
+    item_fields = select_fields(fields, SEARCH_ITEM_FIELDS)
+    try:
+        page = search_service.search_items_page(
+            query=query,
+            price_gt=price_gt,
+            price_lt=price_lt,
+            restaurant=restaurant,
+            sort_by=sort_by,
+            order=order,
+            limit=limit,
+            cursor=cursor,
+            fields=item_fields
+        )
+    except ValidationError as e:
+        raise validation_error(str(e), "cursor")
     
-    return [MenuItemResponse(**item) for item in results]
+    # Sparse rows don't fit the response model, so they always take the fast path
+    if settings.fast_json or item_fields is not None:
+        return rows_response(page)
+    set_next_cursor(response, page)
+    return [MenuItemResponse(**item) for item in page.items]
 
 
 @router.get("/by-price-range", response_model=List[MenuItemResponse])
 def search_by_price_range(
+    response: Response,
     min_price: float = Query(..., ge=0, description="Minimum price"),
     max_price: float = Query(..., ge=0, description="Maximum price"),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return, e.g. name,price; all when omitted"),
     search_service: SearchService = Depends(get_search_service)
 ):
     """Find all items within a specific price range across all restaurants."""
+    item_fields = select_fields(fields, SEARCH_ITEM_FIELDS)
     try:
-        results = search_service.search_by_price_range(min_price, max_price, limit)
-        return [MenuItemResponse(**item) for item in results]
+        page = search_service.search_by_price_range_page(min_price, max_price, limit, cursor, item_fields)
     except ValidationError as e:
         raise validation_error(str(e))
+    
+    if settings.fast_json or item_fields is not None:
+        return rows_response(page)
+    set_next_cursor(response, page)
+    return [MenuItemResponse(**item) for item in page.items]
+
+
+@router.get("/suggest", response_model=List[SuggestionResponse])
+def suggest(
+    prefix: str = Query(..., min_length=1, description="Beginning of a restaurant, section or item name"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+    search_service: SearchService = Depends(get_search_service)
+):
+    """Complete a partially typed name, for type-ahead search boxes."""
+    return search_service.suggest(prefix, limit)
 
 
 @router.get("/restaurants-with-item", response_model=List[str])
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from src.services.restaurant_service import RestaurantService
-from src.api.dependencies import get_restaurant_service
-from src.api.schemas import RestaurantStatsResponse
+from src.api.dependencies import get_restaurant_service, read_restaurant
+from src.api.middleware import response_cache
+from src.api.schemas import CacheStatsResponse, RestaurantStatsResponse
 from src.core.exceptions import NotFoundError, restaurant_not_found
 
 router = APIRouter(prefix="/stats", tags=["Statistics"])
@@ -9,12 +10,21 @@ router = APIRouter(prefix="/stats", tags=["Statistics"])
 
 @router.get("/restaurant/{restaurant_name}", response_model=RestaurantStatsResponse)
 def get_restaurant_stats(
+    response: Response,
     restaurant_name: str,
     restaurant_service: RestaurantService = Depends(get_restaurant_service)
 ):
     """Get statistics about a restaurant's menu."""
     try:
-        stats = restaurant_service.get_restaurant_stats(restaurant_name)
+        stats, headers = read_restaurant(restaurant_service, restaurant_name, restaurant_service.get_restaurant_stats)
+        response.headers.update(headers)
         return RestaurantStatsResponse(**stats)
     except NotFoundError:
-        raise restaurant_not_found(restaurant_name)
\ No newline at end of file
+        raise restaurant_not_found(restaurant_name)
+
+
+@router.get("/cache", response_model=CacheStatsResponse)
+def get_cache_stats(response: Response):
+    """Get the size and hit counters of the search and stats response cache."""
+    response.headers["Cache-Control"] = "no-store"
+    return CacheStatsResponse(**response_cache.stats())
@@ -0,0 +1,371 @@
+import gzip
+import hashlib
+import zlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.core.cache import ResponseCache
+from src.core.config import settings
+from src.models.database import engine_manager
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only gzip is offered
+    brotli = None
+
+# Paths whose GET responses depend only on the query and the database generation
+CACHED_PATH_PREFIXES = ("/search/", "/stats/restaurant/")
+
+# Response header telling whether a cacheable response was served from the cache
+CACHE_STATUS_HEADER = b"x-cache"
+
+# Paths describing the running process rather than the data, which clients must not cache
+UNVALIDATED_PATHS = frozenset({"/stats/cache"})
+
+# Validators and caching directives a 304 repeats from the full response
+NOT_MODIFIED_HEADERS = ("etag", "last-modified", "cache-control", "vary")
+
+# A new deployment can change responses without a new build, so nothing is older than the process
+SERVED_SINCE = datetime.now(timezone.utc)
+
+
+# Content types worth compressing
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Compressed payloads are keyed by a hash of their content, so they never go stale
+CONTENT_ADDRESSED = "content"
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+
+response_cache: ResponseCache[CachedResponse] = ResponseCache(
+    settings.response_cache_size, settings.response_cache_ttl
+)
+
+# ETags already computed for the current generation, so revalidations are answered without running the endpoint
+response_etags: ResponseCache[str] = ResponseCache(settings.etag_cache_size)
+
+
+# Compressed copies of recently sent bodies, so hot payloads are only compressed once
+compressed_payloads: ResponseCache[bytes] = ResponseCache(settings.compression_cache_size)
+
+
+def cache_key(scope: Scope) -> Tuple[str, str]:
+    """Key a request on its path and its query parameters in sorted order."""
+    params = sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True))
+    return scope["path"], urlencode(params)
+
+
+class ResponseCacheMiddleware:
+    """Serve repeated GET requests for search and stats paths from the response cache.
+
+    Only successful responses are stored. While the serving database has no
+    build generation it can change at any time, so requests go through
+    uncached.
+    """
+
+    def __init__(self, app: ASGIApp, cache: ResponseCache[CachedResponse] = response_cache):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(CACHED_PATH_PREFIXES)
+            or self.cache.max_size <= 0
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # Picks up a newly swapped-in build before its generation is read
+        engine_manager.get_engine()
+        generation = engine_manager.generation
+        if generation is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = cache_key(scope)
+        cached = self.cache.get(key, generation)
+        if cached is not None:
+            await send({
+                "type": "http.response.start",
+                "status": cached.status,
+                "headers": [*cached.headers, (CACHE_STATUS_HEADER, b"HIT")],
+            })
+            await send({"type": "http.response.body", "body": cached.body})
+            return
+
+        start: Message = {}
+        chunks: List[bytes] = []
+
+        async def send_and_store(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                message = {**message, "headers": [*message.get("headers", []), (CACHE_STATUS_HEADER, b"MISS")]}
+            elif message["type"] == "http.response.body" and start["status"] == 200:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    self.cache.put(key, CachedResponse(200, list(start.get("headers", [])), b"".join(chunks)), generation)
+            await send(message)
+
+        await self.app(scope, receive, send_and_store)
+
+
+def content_etag(body: bytes) -> str:
+    """Get a strong ETag from a response body's hash."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag, comparing weakly as RFC 9110 requires."""
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in [candidate.removeprefix("W/") for candidate in candidates]
+
+
+def modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    """Check whether a resource changed after an If-Modified-Since date; unreadable dates count as changed."""
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return True
+    if since.tzinfo is None:
+        return True
+    # HTTP dates have whole seconds
+    return last_modified.replace(microsecond=0) > since
+
+
+class ConditionalGetMiddleware:
+    """Add ETag, Last-Modified and Cache-Control to GET responses and answer revalidations with 304.
+
+    ETags hash the response body, so they only change when the content does,
+    even across builds. Last-Modified is when the serving database was built,
+    or when the process started if that is later.
+    Streamed responses are passed through without an ETag rather than
+    buffered, and are never answered with 304. Once a response's ETag is
+    known for the current generation, a revalidation is answered before the
+    endpoint runs; otherwise only a 200 from the endpoint can become a 304.
+    """
+
+    def __init__(self, app: ASGIApp, etags: ResponseCache[str] = response_etags):
+        self.app = app
+        self.etags = etags
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] in UNVALIDATED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        if_modified_since = request_headers.get("if-modified-since")
+        engine_manager.get_engine()
+        generation, built_at = engine_manager.generation, engine_manager.built_at
+        if built_at is not None:
+            built_at = max(built_at, SERVED_SINCE)
+        last_modified = format_datetime(built_at.replace(microsecond=0), usegmt=True) if built_at else None
+        cache_control = f"public, max-age={settings.http_cache_max_age}"
+        key = cache_key(scope)
+
+        def not_modified(etag: str) -> bool:
+            # If-None-Match takes precedence, and If-Modified-Since is only used without it
+            if if_none_match:
+                return etag_matches(if_none_match, etag)
+            return bool(built_at and if_modified_since and not modified_since(if_modified_since, built_at))
+
+        if generation is not None and (if_none_match or if_modified_since):
+            # Only a request that already produced a 200 in this generation has an ETag recorded
+            etag = self.etags.get(key, generation)
+            if etag is not None and not_modified(etag):
+                headers = [(b"cache-control", cache_control.encode()), (b"etag", etag.encode())]
+                if last_modified:
+                    headers.append((b"last-modified", last_modified.encode()))
+                await send_not_modified(send, headers)
+                return
+
+        start: Optional[Message] = None
+
+        async def send_with_validators(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    await send(message)
+                    return
+                headers = MutableHeaders(raw=list(message.get("headers", [])))
+                headers.setdefault("cache-control", cache_control)
+                if last_modified:
+                    headers.setdefault("last-modified", last_modified)
+                start = {**message, "headers": headers.raw}
+                if "content-length" not in headers:
+                    await send(start)
+                    start = None
+                return
+
+            if start is not None and message["type"] == "http.response.body":
+                held, start = start, None
+                if message.get("more_body", False):
+                    await send(held)
+                    await send(message)
+                    return
+                headers = MutableHeaders(raw=held["headers"])
+                if "etag" not in headers:
+                    headers["etag"] = content_etag(message.get("body", b""))
+                if generation is not None:
+                    self.etags.put(key, headers["etag"], generation)
+                if not_modified(headers["etag"]):
+                    await send_not_modified(send, [
+                        (name, value) for name, value in headers.raw if name.decode("latin-1") in NOT_MODIFIED_HEADERS
+                    ])
+                    return
+                await send({**held, "headers": headers.raw})
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
+
+
+async def send_not_modified(send: Send, headers: List[Tuple[bytes, bytes]]) -> None:
+    """Send a bodiless 304 response."""
+    await send({"type": "http.response.start", "status": 304, "headers": headers})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the content coding a client prefers among those offered, favouring brotli on ties."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, parameters = part.partition(";")
+        weight = 1.0
+        name, _, value = parameters.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+
+    offered = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_weight = None, 0.0
+    for coding in offered:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a whole body."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # A fixed mtime makes the output depend on the body alone
+    return gzip.compress(body, GZIP_LEVEL, mtime=0)
+
+
+class StreamCompressor:
+    """Compress a body arriving in chunks."""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self.compress, self.finish = compressor.process, compressor.finish
+        else:
+            compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+            self.compress, self.finish = compressor.compress, compressor.flush
+
+
+class CompressionMiddleware:
+    """Compress JSON and text responses with the best coding the client accepts.
+
+    Bodies under ``minimum_size`` are sent as is. Whole bodies are compressed
+    once and kept in a cache keyed by their content, so hot payloads such as
+    menus are served from it; streamed bodies are compressed as they go.
+    Responses that may be compressed get a weak ETag, since their bytes
+    differ from the identity response the ETag was computed from while
+    meaning the same.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.compression_minimum_size,
+        cache: ResponseCache[bytes] = compressed_payloads
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        compressor: Optional[StreamCompressor] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=list(message.get("headers", [])))
+                content_length = headers.get("content-length")
+                if message["status"] == 304 or (
+                    message["status"] == 200
+                    and "content-encoding" not in headers
+                    and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+                ):
+                    # Caches must tell apart responses to clients accepting different codings, compressed or not
+                    headers.add_vary_header("Accept-Encoding")
+                    if encoding is not None and "etag" in headers and not headers["etag"].startswith("W/"):
+                        headers["etag"] = "W/" + headers["etag"]
+                    if (
+                        encoding is not None and message["status"] == 200
+                        and (content_length is None or int(content_length) >= self.minimum_size)
+                    ):
+                        start = {**message, "headers": headers.raw}
+                        if content_length is None:
+                            compressor = StreamCompressor(encoding)
+                            headers["content-encoding"] = encoding
+                            await send(start)
+                        return
+                await send({**message, "headers": headers.raw})
+                return
+
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+            elif compressor is not None:
+                body = compressor.compress(message.get("body", b""))
+                more_body = message.get("more_body", False)
+                if not more_body:
+                    body += compressor.finish()
+                if body or not more_body:
+                    await send({"type": "http.response.body", "body": body, "more_body": more_body})
+            else:
+                chunks.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                body = b"".join(chunks)
+                headers = MutableHeaders(raw=start["headers"])
+                # ETags hash the identity body, so they also identify its compressed copy
+                key = (encoding, headers.get("etag") or hashlib.blake2b(body, digest_size=16).digest())
+                compressed = self.cache.get(key, CONTENT_ADDRESSED)
+                if compressed is None:
+                    compressed = compress(body, encoding)
+                    self.cache.put(key, compressed, CONTENT_ADDRESSED)
+                headers["content-encoding"] = encoding
+                headers["content-length"] = str(len(compressed))
+                await send(start)
+                await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
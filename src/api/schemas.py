@@ -24,6 +24,11 @@ class MenuItemWithoutRestaurant(BaseModel):
         from_attributes = True
 
 
+class SuggestionResponse(BaseModel):
+    text: str
+    type: str
+
+
 class RestaurantStatsResponse(BaseModel):
     restaurant: str
     total_sections: int
@@ -35,6 +40,17 @@ class RestaurantStatsResponse(BaseModel):
     max_price: Optional[float]
 
 
+class CacheStatsResponse(BaseModel):
+    generation: Optional[str]
+    size: int
+    max_size: int
+    ttl: Optional[float]
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+
+
 class SearchParams(BaseModel):
     query: Optional[str] = None
     price_gt: Optional[float] = None
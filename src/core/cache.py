@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar('V')
+
+
+class ResponseCache(Generic[V]):
+    """Bounded LRU cache with an optional time to live, scoped to one database generation.
+
+    Entries are only valid for the generation they were computed from: the
+    first lookup for another generation empties the cache, and values
+    computed for a generation that is no longer current are not stored.
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.generation: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _switch(self, generation: str) -> None:
+        if generation != self.generation:
+            self._entries.clear()
+            self.generation = generation
+
+    def get(self, key: Hashable, generation: str) -> Optional[V]:
+        """Get a cached value, counting the lookup as a hit or a miss."""
+        with self._lock:
+            self._switch(generation)
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: V, generation: str) -> None:
+        """Store a value computed from a generation, evicting the least recently used entries."""
+        with self._lock:
+            if self.generation is None:
+                self.generation = generation
+            elif generation != self.generation:
+                return
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the cache's size, limits and hit counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "generation": self.generation,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
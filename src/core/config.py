@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 import os
 
 
@@ -8,6 +8,26 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./menu_data.db"
+    generation_check_interval: float = 1.0  # Seconds between checks for a newly swapped-in build
+    
+    # Backend: "sqlite" queries the database per request, "memory" serves an indexed in-memory snapshot
+    backend: Literal["sqlite", "memory"] = "sqlite"
+    memory_source: Optional[str] = None  # Menus JSON file for the memory backend; defaults to the database
+    
+    # Response cache for search and stats endpoints, emptied whenever a new build goes live
+    response_cache_size: int = 1024  # Maximum cached responses; 0 disables the cache
+    response_cache_ttl: Optional[float] = None  # Seconds a cached response stays valid; None keeps it for the generation
+    
+    # HTTP caching: Cache-Control max-age for GET responses, and ETags remembered per generation for revalidations
+    http_cache_max_age: int = 60
+    etag_cache_size: int = 10000
+    
+    # Response compression: smallest body worth compressing, and how many compressed payloads to keep
+    compression_minimum_size: int = 1024
+    compression_cache_size: int = 512
+    
+    # Serialize item listings straight from service rows, with orjson when installed, skipping response models
+    fast_json: bool = False
     
     # API
     app_name: str = "Menu Explainer API"
@@ -1,5 +1,5 @@
 from fastapi import HTTPException
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 
 class MenuExplainerException(Exception):
@@ -31,16 +31,17 @@ class ConfigurationError(MenuExplainerException):
     pass
 
 
-def restaurant_not_found(restaurant_name: str) -> HTTPException:
-    """Create HTTPException for restaurant not found."""
-    return HTTPException(
-        status_code=404,
-        detail={
-            "error": "Restaurant not found",
-            "message": f"Restaurant '{restaurant_name}' not found",
-            "restaurant_name": restaurant_name
-        }
-    )
+def restaurant_not_found(restaurant_name: str, suggestions: Optional[List[str]] = None) -> HTTPException:
+    """Create HTTPException for restaurant not found, listing close names when there are any."""
+    detail = {
+        "error": "Restaurant not found",
+        "message": f"Restaurant '{restaurant_name}' not found",
+        "restaurant_name": restaurant_name
+    }
+    if suggestions is not None:
+        detail["suggestions"] = suggestions
+    
+    return HTTPException(status_code=404, detail=detail)
 
 
 def section_not_found(restaurant_name: str, section_name: str) -> HTTPException:
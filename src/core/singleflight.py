@@ -0,0 +1,54 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one.
+
+    The first caller for a key runs the function; callers arriving while it
+    runs wait for it and get the same result, or the same exception. Nothing
+    is kept once the call finishes, so later calls run again.
+    """
+
+    def __init__(self):
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def do(self, key: Hashable, function: Callable[[], T]) -> T:
+        """Run ``function`` unless a call for ``key`` is already in flight, and return its result."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = function()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
@@ -0,0 +1,114 @@
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+from sqlalchemy import bindparam, delete, inspect, select, update
+from sqlalchemy.engine import Connection, Engine
+from src.models.database import Restaurant, Section, MenuItem, SCHEMA_VERSION, read_build_meta
+from src.ingest.loader import BulkLoader
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+DELETE_CHUNK_SIZE = 500
+
+
+def chunks(ids: Sequence[int], size: int = DELETE_CHUNK_SIZE) -> Iterator[Sequence[int]]:
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def supports_incremental(engine: Engine) -> bool:
+    """Check whether the existing database was built with the current schema."""
+    if not inspect(engine).has_table(Restaurant.__tablename__):
+        return True
+    return read_build_meta(engine, "schema_version") == str(SCHEMA_VERSION)
+
+
+class IncrementalSync:
+    """Apply only the differences between incoming restaurants and the database.
+
+    Restaurants whose content hash is unchanged are skipped. For a changed
+    restaurant the longest common prefix of unchanged sections is kept, and the
+    remaining sections are replaced, which preserves section order by ID.
+    """
+
+    def __init__(self, connection: Connection, batch_size: int = 10000):
+        self.connection = connection
+        self.loader = BulkLoader(connection, batch_size)
+        self.counts = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+
+        self._existing = {
+            row.name: (row.id, row.content_hash)
+            for row in connection.execute(select(Restaurant.id, Restaurant.name, Restaurant.content_hash))
+        }
+        self._stale_section_ids: List[int] = []
+        self._hash_updates: List[Dict[str, Any]] = []
+
+    def apply(self, restaurant: Dict[str, Any]) -> None:
+        """Diff one normalized restaurant record against the database."""
+        current = self._existing.pop(restaurant["name"], None)
+        if current is None:
+            self.loader.add(restaurant)
+            self.counts["inserted"] += 1
+            return
+
+        restaurant_id, stored_hash = current
+        if stored_hash == restaurant["content_hash"]:
+            self.counts["unchanged"] += 1
+            return
+
+        stored_sections = self.connection.execute(
+            select(Section.id, Section.content_hash)
+            .where(Section.restaurant_id == restaurant_id)
+            .order_by(Section.id)
+        ).all()
+        sections = restaurant["sections"]
+
+        keep = 0
+        while (
+            keep < min(len(stored_sections), len(sections))
+            and stored_sections[keep].content_hash == sections[keep]["content_hash"]
+        ):
+            keep += 1
+
+        self._stale_section_ids.extend(row.id for row in stored_sections[keep:])
+        self.loader.add_sections(restaurant_id, sections[keep:])
+        self._hash_updates.append({"restaurant_id": restaurant_id, "new_hash": restaurant["content_hash"]})
+        self.counts["updated"] += 1
+
+    def finish(self) -> Dict[str, Any]:
+        """Write pending inserts, delete stale rows and return build statistics."""
+        self.loader.flush()
+
+        removed_ids = [restaurant_id for restaurant_id, _ in self._existing.values()]
+        for chunk in chunks(removed_ids):
+            self._stale_section_ids.extend(self.connection.execute(
+                select(Section.id).where(Section.restaurant_id.in_(chunk))
+            ).scalars())
+
+        for chunk in chunks(self._stale_section_ids):
+            self.connection.execute(delete(MenuItem).where(MenuItem.section_id.in_(chunk)))
+            self.connection.execute(delete(Section).where(Section.id.in_(chunk)))
+        for chunk in chunks(removed_ids):
+            self.connection.execute(delete(Restaurant).where(Restaurant.id.in_(chunk)))
+        self.counts["deleted"] = len(removed_ids)
+
+        if self._hash_updates:
+            self.connection.execute(
+                update(Restaurant)
+                .where(Restaurant.id == bindparam("restaurant_id"))
+                .values(content_hash=bindparam("new_hash")),
+                self._hash_updates
+            )
+
+        return {**self.loader.stats(), **self.counts}
+
+
+def incremental_load(
+    engine: Engine,
+    restaurants: Iterable[Dict[str, Any]],
+    batch_size: int = 10000
+) -> Dict[str, Any]:
+    """Apply incoming restaurant records as a diff in a single transaction."""
+    with engine.begin() as connection:
+        connection.exec_driver_sql("PRAGMA synchronous = OFF")
+        sync = IncrementalSync(connection, batch_size)
+        for restaurant in restaurants:
+            sync.apply(restaurant)
+        return sync.finish()
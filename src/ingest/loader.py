@@ -0,0 +1,139 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+from sqlalchemy import Table, func, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import DropIndex
+from src.models.database import Restaurant, Section, MenuItem, MenuItemFlat
+from src.models.derived import DERIVED_TABLES
+from src.core.exceptions import DatabaseError
+
+# Column layout of the row tuples buffered for each table
+RESTAURANT_COLUMNS = ("id", "name", "content_hash")
+SECTION_COLUMNS = ("id", "name", "restaurant_id", "content_hash")
+ITEM_COLUMNS = ("id", "name", "description", "price", "section_id")
+
+
+def compile_insert(connection: Connection, table: Table, columns: Sequence[str]) -> str:
+    """Compile a positional INSERT whose parameters follow ``columns``."""
+    compiled = table.insert().compile(dialect=connection.dialect, column_keys=list(columns))
+    if tuple(compiled.positiontup or ()) != tuple(columns):
+        raise DatabaseError(f"Unexpected column order for bulk insert into '{table.name}'")
+    return str(compiled)
+
+
+class BulkLoader:
+    """Insert normalized restaurants with batched executemany statements.
+
+    IDs are assigned client-side, so sections and items can reference their
+    parents without a flush round trip per row.
+    """
+
+    def __init__(self, connection: Connection, batch_size: int = 10000):
+        self.connection = connection
+        self.batch_size = batch_size
+        self.counts = {"restaurants": 0, "sections": 0, "items": 0}
+
+        self._next_restaurant_id = self._next_id(Restaurant)
+        self._next_section_id = self._next_id(Section)
+        self._next_item_id = self._next_id(MenuItem)
+
+        self._restaurant_rows: List[Tuple] = []
+        self._section_rows: List[Tuple] = []
+        self._item_rows: List[Tuple] = []
+        self._statements = (
+            (compile_insert(connection, Restaurant.__table__, RESTAURANT_COLUMNS), self._restaurant_rows, "restaurants"),
+            (compile_insert(connection, Section.__table__, SECTION_COLUMNS), self._section_rows, "sections"),
+            (compile_insert(connection, MenuItem.__table__, ITEM_COLUMNS), self._item_rows, "items"),
+        )
+        self._started = time.perf_counter()
+
+    def _next_id(self, model) -> int:
+        return (self.connection.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+    def add(self, restaurant: Dict[str, Any]) -> int:
+        """Queue a normalized restaurant record and return its assigned ID."""
+        restaurant_id = self._next_restaurant_id
+        self._next_restaurant_id += 1
+        self._restaurant_rows.append((restaurant_id, restaurant["name"], restaurant["content_hash"]))
+        self.add_sections(restaurant_id, restaurant["sections"])
+        return restaurant_id
+
+    def add_sections(self, restaurant_id: int, sections: Iterable[Dict[str, Any]]) -> None:
+        """Queue normalized sections, and their items, under an existing restaurant."""
+        item_rows = self._item_rows
+        for section in sections:
+            section_id = self._next_section_id
+            self._next_section_id += 1
+            self._section_rows.append((section_id, section["name"], restaurant_id, section["content_hash"]))
+
+            item_id = self._next_item_id
+            for item in section["items"]:
+                item_rows.append((item_id, item["name"], item["description"], item["price"], section_id))
+                item_id += 1
+            self._next_item_id = item_id
+
+        if len(item_rows) + len(self._section_rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all queued rows, parents before children."""
+        for statement, rows, key in self._statements:
+            if rows:
+                self.connection.exec_driver_sql(statement, rows)
+                self.counts[key] += len(rows)
+                rows.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get row counts and throughput for everything flushed so far."""
+        elapsed = time.perf_counter() - self._started
+        total_rows = sum(self.counts.values())
+        return {
+            **self.counts,
+            "rows": total_rows,
+            "elapsed": elapsed,
+            "rows_per_second": total_rows / elapsed if elapsed > 0 else 0.0
+        }
+
+
+@contextmanager
+def deferred_indexes(connection: Connection, *tables: Table):
+    """Suspend index and search-table maintenance for the duration of a load.
+
+    Non-unique indexes and derived-table triggers are dropped, then everything
+    is rebuilt once at the end. Building over the full data set is far cheaper
+    than maintaining it row by row, but only worthwhile for empty tables.
+    """
+    indexes = [index for table in tables for index in table.indexes if not index.unique]
+    derived_tables = DERIVED_TABLES if tables else []
+    for index in indexes:
+        # checkfirst misses expression indexes, so let SQLite skip missing ones instead
+        connection.execute(DropIndex(index, if_exists=True))
+    for derived in derived_tables:
+        derived.drop_triggers(connection)
+    yield
+    for derived in derived_tables:
+        derived.rebuild(connection)
+    for index in indexes:
+        index.create(connection)
+    for derived in derived_tables:
+        derived.create_triggers(connection)
+
+
+def bulk_load(
+    engine: Engine,
+    restaurants: Iterable[Dict[str, Any]],
+    batch_size: int = 10000,
+    defer_indexes: bool = False
+) -> Dict[str, Any]:
+    """Load normalized restaurant records in a single transaction."""
+    with engine.begin() as connection:
+        # Durability comes from rebuilding out of the source JSON, not from fsync
+        connection.exec_driver_sql("PRAGMA synchronous = OFF")
+        tables = (Section.__table__, MenuItem.__table__, MenuItemFlat.__table__) if defer_indexes else ()
+        with deferred_indexes(connection, *tables):
+            loader = BulkLoader(connection, batch_size)
+            for restaurant in restaurants:
+                loader.add(restaurant)
+            loader.flush()
+        return loader.stats()
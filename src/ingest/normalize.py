@@ -0,0 +1,53 @@
+import hashlib
+import json
+import math
+from typing import Any, Dict, Optional
+
+
+def normalize_price(price: Any) -> Optional[float]:
+    """Convert a raw price to float, or None if it is not a valid number (e.g. "MKT")."""
+    if price is None:
+        return None
+    try:
+        value = float(price)
+    except (ValueError, TypeError):
+        return None
+    # "NaN" and "inf" parse as floats but cannot be represented in JSON responses
+    return value if math.isfinite(value) else None
+
+
+def content_hash(value: Any) -> str:
+    """Get a stable SHA-256 digest of a JSON-serializable value."""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def normalize_section(section_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape raw section JSON and stamp it with a content hash."""
+    section = {
+        "name": section_data.get("name", ""),
+        "items": [
+            {
+                "name": item_data.get("name", ""),
+                "description": item_data.get("description"),
+                "price": normalize_price(item_data.get("price"))
+            }
+            for item_data in section_data.get("items", [])
+        ]
+    }
+    section["content_hash"] = content_hash([section["name"], section["items"]])
+    return section
+
+
+def normalize_restaurant(name: str, restaurant_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape raw restaurant JSON into the record consumed by the bulk loader.
+
+    The restaurant hash is derived from its section hashes, so a change to any
+    item changes both the section and the restaurant digest.
+    """
+    sections = [normalize_section(section_data) for section_data in restaurant_data.get("sections", [])]
+    return {
+        "name": name,
+        "content_hash": content_hash([name, [section["content_hash"] for section in sections]]),
+        "sections": sections
+    }
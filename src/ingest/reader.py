@@ -0,0 +1,132 @@
+import json
+import re
+from typing import Any, Dict, Iterator, List, TextIO, Tuple
+from src.core.exceptions import ValidationError
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Errors this close to the end of the buffer may just be a token cut off by
+# the chunk boundary, the longest being a surrogate pair escape
+_TRUNCATION_MARGIN = 12
+
+
+class _JSONStream:
+    """Incrementally decode JSON values from a text stream.
+
+    Only the value being decoded is held in memory. When a value does not fit
+    in the buffer the read size doubles, so a large value costs amortized
+    linear time rather than one re-parse per chunk.
+    """
+
+    def __init__(self, fp: TextIO, chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read_more(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fp.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or '' at end of input."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read_more():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        while True:
+            self.peek()
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as exc:
+                # An error earlier in the value is a syntax error that more input cannot fix
+                truncated = (
+                    exc.pos >= len(self.buffer) - _TRUNCATION_MARGIN
+                    or exc.msg.startswith("Unterminated string")
+                )
+                if truncated and self._read_more():
+                    continue
+                raise
+            # A number that ends the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._read_more():
+                continue
+            self.pos = end
+            return value
+
+
+def _check_unique(name: str, seen: set) -> None:
+    if name in seen:
+        raise ValidationError(f"Duplicate restaurant '{name}'")
+    seen.add(name)
+
+
+def load_restaurants(fp: TextIO) -> List[Tuple[str, Dict[str, Any]]]:
+    """Parse a whole menus JSON file into ``(restaurant_name, restaurant_data)`` pairs.
+
+    Rejects duplicate restaurant names as ``iter_restaurants`` does, where a
+    plain ``json.load`` would keep the last one.
+    """
+    top_level = []
+
+    def keep_pairs(pairs):
+        # Objects are decoded innermost first, so the top-level one is the last seen
+        top_level[:] = pairs
+        return dict(pairs)
+
+    document = json.load(fp, object_pairs_hook=keep_pairs)
+    if not isinstance(document, dict):
+        raise json.JSONDecodeError("Expecting '{'", "", 0)
+    seen = set()
+    for name, _ in top_level:
+        _check_unique(name, seen)
+    return list(document.items())
+
+
+def iter_restaurants(fp: TextIO, chunk_size: int = 1 << 16) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``(restaurant_name, restaurant_data)`` pairs from a menus JSON file.
+
+    The top-level mapping is parsed one restaurant at a time, so memory use is
+    bounded by the largest single restaurant rather than the whole file.
+    """
+    stream = _JSONStream(fp, chunk_size)
+    seen = set()
+
+    stream.expect("{")
+    if stream.peek() == "}":
+        stream.pos += 1
+    else:
+        while True:
+            name = stream.value()
+            if not isinstance(name, str):
+                raise json.JSONDecodeError("Expecting property name", stream.buffer, stream.pos)
+            stream.expect(":")
+            restaurant_data = stream.value()
+
+            _check_unique(name, seen)
+            yield name, restaurant_data
+
+            if stream.peek() == ",":
+                stream.pos += 1
+                continue
+            stream.expect("}")
+            break
+
+    if stream.peek():
+        raise json.JSONDecodeError("Extra data", stream.buffer, stream.pos)
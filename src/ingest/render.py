@@ -0,0 +1,67 @@
+from itertools import groupby
+from typing import Dict, List
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Engine
+from src.models.database import Restaurant, Section, MenuItem, MenuDocument, SectionDocument
+from src.ingest.incremental import chunks
+from src.utils.menu_json import render_menu
+
+
+def render_menus(engine: Engine, batch_size: int = 200) -> Dict[str, int]:
+    """Pre-render menu JSON for every restaurant whose content changed since the last render.
+
+    Each document stores the content hash it was rendered from, so a full
+    build renders everything while an incremental build only re-renders the
+    restaurants it touched.
+    """
+    with engine.begin() as connection:
+        current = {
+            row.name: (row.id, row.content_hash)
+            for row in connection.execute(select(Restaurant.id, Restaurant.name, Restaurant.content_hash))
+        }
+        rendered = dict(connection.execute(select(MenuDocument.restaurant_name, MenuDocument.content_hash)).all())
+
+        # Rows written outside a build have no hash, so they are always re-rendered
+        pending = sorted(
+            restaurant_id for name, (restaurant_id, content_hash) in current.items()
+            if content_hash is None or rendered.get(name) != content_hash
+        )
+        names = {restaurant_id: name for name, (restaurant_id, _) in current.items()}
+        hashes = {restaurant_id: content_hash for restaurant_id, content_hash in current.values()}
+        pending_ids = set(pending)
+        stale_names = [name for name in rendered if name not in current or current[name][0] in pending_ids]
+        for chunk in chunks(stale_names):
+            connection.execute(delete(SectionDocument).where(SectionDocument.restaurant_name.in_(chunk)))
+            connection.execute(delete(MenuDocument).where(MenuDocument.restaurant_name.in_(chunk)))
+
+        for chunk in chunks(pending, batch_size):
+            rows = connection.execute(
+                select(Restaurant.id, Section.id, Section.name, MenuItem.name, MenuItem.description, MenuItem.price)
+                .select_from(Restaurant)
+                .outerjoin(Section, Section.restaurant_id == Restaurant.id)
+                .outerjoin(MenuItem, MenuItem.section_id == Section.id)
+                .where(Restaurant.id.in_(chunk))
+                .order_by(Restaurant.id, Section.id, MenuItem.id)
+            )
+            menus: List[Dict] = []
+            sections: List[Dict] = []
+            for restaurant_id, menu_rows in groupby(rows, key=lambda row: row[0]):
+                document = render_menu(row[1:] for row in menu_rows)
+                name = names[restaurant_id]
+                menus.append({
+                    "restaurant_name": name,
+                    "content_hash": hashes[restaurant_id],
+                    "menu": document.menu,
+                    "sections": document.sections,
+                })
+                # Lookups by name resolve to the first section of that name, as live queries do
+                seen = set()
+                for section_name, items in document.section_items:
+                    if section_name not in seen:
+                        seen.add(section_name)
+                        sections.append({"restaurant_name": name, "section_name": section_name, "items": items})
+            connection.execute(insert(MenuDocument), menus)
+            if sections:
+                connection.execute(insert(SectionDocument), sections)
+
+        return {"rendered": len(pending), "removed": sum(1 for name in rendered if name not in current)}
@@ -0,0 +1,127 @@
+import glob
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from src.core.exceptions import ValidationError
+from src.ingest.normalize import normalize_restaurant
+
+MENU_FILE_SUFFIXES = (".json", ".ndjson", ".jsonl")
+LINE_DELIMITED_SUFFIXES = (".ndjson", ".jsonl")
+
+
+def is_multi_file_source(source: str) -> bool:
+    """Check whether a build source names a directory or a glob rather than one file."""
+    return os.path.isdir(source) or glob.has_magic(source)
+
+
+def resolve_sources(source: str) -> List[str]:
+    """Expand a directory or glob into a sorted list of menu files."""
+    if os.path.isdir(source):
+        paths = [
+            os.path.join(source, name) for name in os.listdir(source)
+            if name.endswith(MENU_FILE_SUFFIXES)
+        ]
+    else:
+        paths = glob.glob(source)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def validate_restaurant(name: Any, restaurant_data: Any) -> None:
+    """Check that raw restaurant JSON has the shape the loader expects."""
+    if not isinstance(name, str) or not name:
+        raise ValidationError("Restaurant name must be a non-empty string", {"name": name})
+    if not isinstance(restaurant_data, dict):
+        raise ValidationError(f"Restaurant '{name}' must be an object")
+
+    sections = restaurant_data.get("sections", [])
+    if not isinstance(sections, list):
+        raise ValidationError(f"Sections of restaurant '{name}' must be a list")
+    for section in sections:
+        if not isinstance(section, dict) or not isinstance(section.get("name", ""), str):
+            raise ValidationError(f"Restaurant '{name}' has a malformed section")
+        items = section.get("items", [])
+        if not isinstance(items, list):
+            raise ValidationError(f"Items of section '{section.get('name')}' in '{name}' must be a list")
+        for item in items:
+            if not isinstance(item, dict) or not isinstance(item.get("name", ""), str):
+                raise ValidationError(f"Section '{section.get('name')}' in '{name}' has a malformed item")
+            description = item.get("description")
+            if description is not None and not isinstance(description, str):
+                raise ValidationError(f"Item '{item.get('name')}' in '{name}' has a non-text description")
+
+
+def _restaurant_entries(document: Any, default_name: str) -> Iterator[Tuple[Any, Any]]:
+    """Yield ``(name, data)`` pairs from a per-restaurant object or a name mapping."""
+    if not isinstance(document, dict):
+        raise ValidationError("Expected a JSON object")
+    if isinstance(document.get("sections"), list):
+        yield document.get("name", default_name), document
+    else:
+        yield from document.items()
+
+
+def parse_file(path: str) -> List[Dict[str, Any]]:
+    """Parse, validate and normalize every restaurant in one JSON or NDJSON file.
+
+    Runs in worker processes, so it only takes and returns picklable values.
+    """
+    default_name = os.path.splitext(os.path.basename(path))[0]
+    records = []
+    try:
+        with open(path, "r") as f:
+            if path.endswith(LINE_DELIMITED_SUFFIXES):
+                documents = (json.loads(line) for line in f if line.strip())
+            else:
+                documents = [json.load(f)]
+            for document in documents:
+                for name, restaurant_data in _restaurant_entries(document, default_name):
+                    validate_restaurant(name, restaurant_data)
+                    records.append(normalize_restaurant(name, restaurant_data))
+    except json.JSONDecodeError as e:
+        raise ValidationError(f"Invalid JSON in {path}: {e}")
+    except ValidationError as e:
+        raise ValidationError(f"{e.message} in {path}", e.details)
+    return records
+
+
+def iter_parsed(paths: List[str], workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Yield normalized restaurants from many files, parsed across a process pool.
+
+    Results come back in file order to a single consumer, and at most a few
+    files per worker are in flight so memory stays bounded.
+    """
+    workers = workers or os.cpu_count() or 1
+    seen = set()
+
+    def checked(records: List[Dict[str, Any]], path: str) -> Iterator[Dict[str, Any]]:
+        for record in records:
+            if record["name"] in seen:
+                raise ValidationError(f"Duplicate restaurant '{record['name']}' in {path}")
+            seen.add(record["name"])
+            yield record
+
+    if workers <= 1:
+        for path in paths:
+            yield from checked(parse_file(path), path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        queued = iter(paths)
+        for path in queued:
+            pending.append((path, executor.submit(parse_file, path)))
+            if len(pending) >= workers * 4:
+                break
+        try:
+            while pending:
+                path, future = pending.popleft()
+                records = future.result()
+                next_path = next(queued, None)
+                if next_path is not None:
+                    pending.append((next_path, executor.submit(parse_file, next_path)))
+                yield from checked(records, path)
+        finally:
+            for _, future in pending:
+                future.cancel()
@@ -0,0 +1,81 @@
+import os
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.engine import Engine
+from src.models.database import BuildMeta, SCHEMA_VERSION
+from src.core.exceptions import DatabaseError
+
+
+def staging_path(target_path: str) -> str:
+    """Get a build file path next to the target, so the final rename stays on one filesystem."""
+    return f"{target_path}.build-{os.getpid()}"
+
+
+def copy_database(source_path: str, destination_path: str) -> None:
+    """Copy a live SQLite database with the online backup API."""
+    source = sqlite3.connect(source_path)
+    destination = sqlite3.connect(destination_path)
+    try:
+        source.backup(destination)
+    finally:
+        destination.close()
+        source.close()
+
+
+def finalize_build(engine: Engine) -> str:
+    """Verify a finished build, refresh planner statistics and stamp a new generation."""
+    generation = uuid.uuid4().hex
+    with engine.begin() as connection:
+        # Loads skip fsync, so make this final commit flush the whole file before the rename
+        connection.exec_driver_sql("PRAGMA synchronous = FULL")
+        result = connection.exec_driver_sql("PRAGMA integrity_check").scalars().all()
+        if result != ["ok"]:
+            raise DatabaseError("Integrity check failed", {"problems": result[:10]})
+
+        connection.exec_driver_sql("ANALYZE")
+        connection.execute(delete(BuildMeta))
+        connection.execute(insert(BuildMeta), [
+            {"key": "generation", "value": generation},
+            {"key": "built_at", "value": datetime.now(timezone.utc).isoformat()},
+            {"key": "schema_version", "value": str(SCHEMA_VERSION)},
+        ])
+    return generation
+
+
+class StagedBuild:
+    """A database build in progress in a staging file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.engine = create_engine(f"sqlite:///{path}")
+        self.generation = None
+
+
+@contextmanager
+def staged_build(target_path: str, copy_existing: bool = False) -> Iterator[StagedBuild]:
+    """Build into a staging file and atomically rename it over ``target_path``.
+
+    Readers of the live database never observe a partial build. If the block
+    raises, the staging file is removed and the live database is untouched.
+    """
+    build_path = staging_path(target_path)
+    if os.path.exists(build_path):
+        os.remove(build_path)
+    if copy_existing and os.path.exists(target_path):
+        copy_database(target_path, build_path)
+
+    build = StagedBuild(build_path)
+    try:
+        yield build
+        build.generation = finalize_build(build.engine)
+        build.engine.dispose()
+        os.replace(build_path, target_path)
+    except BaseException:
+        build.engine.dispose()
+        if os.path.exists(build_path):
+            os.remove(build_path)
+        raise
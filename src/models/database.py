@@ -1,13 +1,26 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, Float, ForeignKey, Index
+import os
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import create_engine, event, func, Column, Integer, String, Text, Float, ForeignKey, Index, LargeBinary, select
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker, Session
 from contextlib import contextmanager
+from typing import Optional, Tuple
 from src.core.config import settings
+from src.core.logging import get_logger
+from src.models.derived import DERIVED_TABLES
 
 Base = declarative_base()
 
-engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Bumped whenever the schema changes, so incremental builds know to start over
+SCHEMA_VERSION = 6
+
+logger = get_logger(__name__)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 
 class Restaurant(Base):
@@ -15,8 +28,11 @@ class Restaurant(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), unique=True, nullable=False, index=True)
+    content_hash = Column(String(64), nullable=True)
     
-    sections = relationship("Section", back_populates="restaurant", cascade="all, delete-orphan")
+    sections = relationship(
+        "Section", back_populates="restaurant", cascade="all, delete-orphan", order_by="Section.id"
+    )
 
 
 class Section(Base):
@@ -25,9 +41,10 @@ class Section(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     restaurant_id = Column(Integer, ForeignKey("restaurants.id"), nullable=False)
+    content_hash = Column(String(64), nullable=True)
     
     restaurant = relationship("Restaurant", back_populates="sections")
-    items = relationship("MenuItem", back_populates="section", cascade="all, delete-orphan")
+    items = relationship("MenuItem", back_populates="section", cascade="all, delete-orphan", order_by="MenuItem.id")
     
     __table_args__ = (
         Index("idx_section_restaurant", "restaurant_id", "name"),
@@ -52,17 +69,166 @@ class MenuItem(Base):
     )
 
 
-def create_tables():
-    Base.metadata.create_all(bind=engine)
+class MenuItemFlat(Base):
+    """Read-only copy of menu items with their section and restaurant names.
+    
+    Derived from the normalized tables at build time and kept in sync by
+    triggers, so read paths can filter and list items from a single table.
+    """
+    __tablename__ = "menu_items_flat"
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    price = Column(Float, nullable=True)
+    section_id = Column(Integer, nullable=False)
+    section_name = Column(String(255), nullable=False)
+    restaurant_id = Column(Integer, nullable=False)
+    restaurant_name = Column(String(255), nullable=False)
+    
+    __table_args__ = (
+        Index("idx_flat_restaurant_price", "restaurant_name", "price"),
+        Index("idx_flat_price", "price"),
+        Index("idx_flat_restaurant_lower_name", "restaurant_name", func.lower(name)),
+        Index("idx_flat_lower_name", func.lower(name)),
+    )
+
+
+class MenuDocument(Base):
+    """A restaurant's full menu and section list, rendered to JSON at build time."""
+    __tablename__ = "menu_documents"
+    
+    restaurant_name = Column(String(255), primary_key=True)
+    content_hash = Column(String(64), nullable=True)
+    menu = Column(LargeBinary, nullable=False)
+    sections = Column(LargeBinary, nullable=False)
+
+
+class SectionDocument(Base):
+    """One section's item array, rendered to JSON at build time."""
+    __tablename__ = "section_documents"
+    
+    restaurant_name = Column(String(255), primary_key=True)
+    section_name = Column(String(255), primary_key=True)
+    items = Column(LargeBinary, nullable=False)
+
+
+class BuildMeta(Base):
+    __tablename__ = "build_meta"
+    
+    key = Column(String(64), primary_key=True)
+    value = Column(Text, nullable=False)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_derived_tables(target, connection, **kw):
+    for derived in DERIVED_TABLES:
+        derived.create(connection)
+
+
+@event.listens_for(Base.metadata, "after_drop")
+def _drop_derived_tables(target, connection, **kw):
+    for derived in DERIVED_TABLES:
+        derived.drop(connection)
+
+
+def sqlite_path(database_url: str) -> Optional[str]:
+    """Get the database file path of a SQLite URL, or None for other databases."""
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return os.path.abspath(url.database)
+
+
+def read_build_meta(bind: Engine, key: str) -> Optional[str]:
+    """Read a value stamped into a database by its build, if any."""
+    try:
+        with bind.connect() as connection:
+            return connection.execute(select(BuildMeta.value).where(BuildMeta.key == key)).scalar()
+    except SQLAlchemyError:
+        return None
+
+
+def read_generation(bind: Engine) -> Optional[str]:
+    """Read the build generation stamped into a database, if any."""
+    return read_build_meta(bind, "generation")
+
+
+def read_built_at(bind: Engine) -> Optional[datetime]:
+    """Read when a database was built, if it was stamped by a build."""
+    built_at = read_build_meta(bind, "built_at")
+    return datetime.fromisoformat(built_at) if built_at else None
+
+
+class EngineManager:
+    """Own the serving engine and reopen it when the database file is swapped.
+
+    Builds write a new file and rename it over the old one, so a change of
+    inode means a new database generation. Sessions already open keep reading
+    the old file until they close.
+    """
+    
+    def __init__(self, database_url: str, check_interval: float = 1.0):
+        self.database_url = database_url
+        self.path = sqlite_path(database_url)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._engine = self._create_engine()
+        self._file_id = self._stat()
+        self._checked_at = time.monotonic()
+        # Avoid creating an empty database file just to look for a stamp
+        self.generation, self.built_at = self._read_stamp() if self._file_id else (None, None)
+    
+    def _read_stamp(self) -> Tuple[Optional[str], Optional[datetime]]:
+        generation = read_generation(self._engine)
+        return generation, read_built_at(self._engine) if generation else None
+    
+    def _create_engine(self) -> Engine:
+        return create_engine(self.database_url, connect_args={"check_same_thread": False})
+    
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        if not self.path:
+            return None
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_dev, stat.st_ino)
+    
+    def get_engine(self) -> Engine:
+        """Get the current engine, reopening it if a new build was swapped in."""
+        if self.path and time.monotonic() - self._checked_at >= self.check_interval:
+            with self._lock:
+                self._checked_at = time.monotonic()
+                file_id = self._stat()
+                if file_id != self._file_id:
+                    previous = self._engine
+                    self._engine = self._create_engine()
+                    self._file_id = file_id
+                    self.generation, self.built_at = self._read_stamp() if file_id else (None, None)
+                    previous.dispose()
+                    logger.info("Reopened database for generation %s", self.generation)
+        return self._engine
+
+
+engine_manager = EngineManager(settings.database_url, settings.generation_check_interval)
+
+
+def get_engine() -> Engine:
+    return engine_manager.get_engine()
+
+
+def create_tables(bind: Optional[Engine] = None):
+    Base.metadata.create_all(bind=bind or get_engine())
 
 
-def drop_tables():
-    Base.metadata.drop_all(bind=engine)
+def drop_tables(bind: Optional[Engine] = None):
+    Base.metadata.drop_all(bind=bind or get_engine())
 
 
 @contextmanager
 def get_db():
-    db = SessionLocal()
+    db = SessionLocal(bind=get_engine())
     try:
         yield db
     finally:
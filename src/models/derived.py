@@ -0,0 +1,190 @@
+from typing import Dict, Sequence
+from sqlalchemy import Column, Float, Integer, MetaData, Table, Text
+from sqlalchemy.engine import Connection
+
+# Virtual tables are not created by metadata.create_all, so they get their own metadata
+virtual_metadata = MetaData()
+
+menu_items_fts = Table(
+    "menu_items_fts",
+    virtual_metadata,
+    Column("rowid", Integer, primary_key=True),
+    Column("name", Text),
+    Column("description", Text),
+    Column("rank", Float),
+)
+
+menu_item_trigrams = Table(
+    "menu_item_trigrams",
+    virtual_metadata,
+    Column("rowid", Integer, primary_key=True),
+    Column("name", Text),
+    Column("restaurant_id", Integer),
+)
+
+
+class DerivedTable:
+    """A search structure derived from the menu tables.
+
+    Triggers keep it in sync with ``menu_items``, so ORM writes and incremental
+    builds never leave it stale. Full builds drop the triggers while bulk
+    loading and rebuild the table in one pass afterwards, which is several
+    times faster than maintaining it row by row.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        create: Sequence[str],
+        triggers: Dict[str, str],
+        rebuild: Sequence[str],
+        drop: Sequence[str] = ()
+    ):
+        self.name = name
+        self.create_statements = create
+        self.triggers = triggers
+        self.rebuild_statements = rebuild
+        self.drop_statements = drop
+
+    def create(self, connection: Connection) -> None:
+        for statement in self.create_statements:
+            connection.exec_driver_sql(statement)
+        self.create_triggers(connection)
+
+    def create_triggers(self, connection: Connection) -> None:
+        for name, body in self.triggers.items():
+            connection.exec_driver_sql(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+    def drop_triggers(self, connection: Connection) -> None:
+        for name in self.triggers:
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+
+    def rebuild(self, connection: Connection) -> None:
+        for statement in self.rebuild_statements:
+            connection.exec_driver_sql(statement)
+
+    def drop(self, connection: Connection) -> None:
+        for statement in self.drop_statements:
+            connection.exec_driver_sql(statement)
+
+
+SEARCH_INDEX = DerivedTable(
+    "menu_items_fts",
+    create=[
+        "CREATE VIRTUAL TABLE IF NOT EXISTS menu_items_fts USING fts5("
+        "name, description, content='menu_items', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+    ],
+    triggers={
+        "menu_items_fts_insert": (
+            "AFTER INSERT ON menu_items BEGIN "
+            "INSERT INTO menu_items_fts(rowid, name, description) VALUES (new.id, new.name, new.description); "
+            "END"
+        ),
+        "menu_items_fts_delete": (
+            "AFTER DELETE ON menu_items BEGIN "
+            "INSERT INTO menu_items_fts(menu_items_fts, rowid, name, description) "
+            "VALUES ('delete', old.id, old.name, old.description); "
+            "END"
+        ),
+        "menu_items_fts_update": (
+            "AFTER UPDATE ON menu_items BEGIN "
+            "INSERT INTO menu_items_fts(menu_items_fts, rowid, name, description) "
+            "VALUES ('delete', old.id, old.name, old.description); "
+            "INSERT INTO menu_items_fts(rowid, name, description) VALUES (new.id, new.name, new.description); "
+            "END"
+        ),
+    },
+    rebuild=["INSERT INTO menu_items_fts(menu_items_fts) VALUES ('rebuild')"],
+    drop=["DROP TABLE IF EXISTS menu_items_fts"],
+)
+
+# Answers case-insensitive substring LIKE queries on item names from trigrams, and
+# carries the restaurant ID so matches resolve without joining back to sections
+TRIGRAM_INDEX = DerivedTable(
+    "menu_item_trigrams",
+    create=[
+        "CREATE VIRTUAL TABLE IF NOT EXISTS menu_item_trigrams USING fts5("
+        "name, restaurant_id UNINDEXED, tokenize='trigram')",
+    ],
+    triggers={
+        "menu_item_trigrams_insert": (
+            "AFTER INSERT ON menu_items BEGIN "
+            "INSERT INTO menu_item_trigrams(rowid, name, restaurant_id) "
+            "SELECT new.id, new.name, restaurant_id FROM sections WHERE id = new.section_id; "
+            "END"
+        ),
+        "menu_item_trigrams_delete": (
+            "AFTER DELETE ON menu_items BEGIN "
+            "DELETE FROM menu_item_trigrams WHERE rowid = old.id; "
+            "END"
+        ),
+        "menu_item_trigrams_update": (
+            "AFTER UPDATE OF name, section_id ON menu_items BEGIN "
+            "DELETE FROM menu_item_trigrams WHERE rowid = old.id; "
+            "INSERT INTO menu_item_trigrams(rowid, name, restaurant_id) "
+            "SELECT new.id, new.name, restaurant_id FROM sections WHERE id = new.section_id; "
+            "END"
+        ),
+    },
+    rebuild=[
+        "DELETE FROM menu_item_trigrams",
+        "INSERT INTO menu_item_trigrams(rowid, name, restaurant_id) "
+        "SELECT menu_items.id, menu_items.name, sections.restaurant_id "
+        "FROM menu_items JOIN sections ON sections.id = menu_items.section_id",
+    ],
+    drop=["DROP TABLE IF EXISTS menu_item_trigrams"],
+)
+
+_FLAT_ITEM_SELECT = (
+    "SELECT menu_items.id, menu_items.name, menu_items.description, menu_items.price, "
+    "sections.id, sections.name, restaurants.id, restaurants.name "
+    "FROM menu_items JOIN sections ON sections.id = menu_items.section_id "
+    "JOIN restaurants ON restaurants.id = sections.restaurant_id"
+)
+_FLAT_ITEM_INSERT = (
+    "INSERT INTO menu_items_flat(id, name, description, price, section_id, section_name, "
+    "restaurant_id, restaurant_name) "
+)
+
+# The menu_items_flat table itself is declared on the ORM metadata (MenuItemFlat)
+FLAT_ITEMS = DerivedTable(
+    "menu_items_flat",
+    create=[],
+    triggers={
+        "menu_items_flat_insert": (
+            "AFTER INSERT ON menu_items BEGIN "
+            f"{_FLAT_ITEM_INSERT}{_FLAT_ITEM_SELECT} WHERE menu_items.id = new.id; "
+            "END"
+        ),
+        "menu_items_flat_delete": (
+            "AFTER DELETE ON menu_items BEGIN "
+            "DELETE FROM menu_items_flat WHERE id = old.id; "
+            "END"
+        ),
+        "menu_items_flat_update": (
+            "AFTER UPDATE ON menu_items BEGIN "
+            "DELETE FROM menu_items_flat WHERE id = old.id; "
+            f"{_FLAT_ITEM_INSERT}{_FLAT_ITEM_SELECT} WHERE menu_items.id = new.id; "
+            "END"
+        ),
+        "menu_items_flat_section_update": (
+            "AFTER UPDATE OF name, restaurant_id ON sections BEGIN "
+            "UPDATE menu_items_flat SET section_name = new.name, restaurant_id = new.restaurant_id, "
+            "restaurant_name = (SELECT name FROM restaurants WHERE id = new.restaurant_id) "
+            "WHERE section_id = new.id; "
+            "END"
+        ),
+        "menu_items_flat_restaurant_update": (
+            "AFTER UPDATE OF name ON restaurants BEGIN "
+            "UPDATE menu_items_flat SET restaurant_name = new.name WHERE restaurant_id = new.id; "
+            "END"
+        ),
+    },
+    rebuild=[
+        "DELETE FROM menu_items_flat",
+        f"{_FLAT_ITEM_INSERT}{_FLAT_ITEM_SELECT}",
+    ],
+)
+
+DERIVED_TABLES = [SEARCH_INDEX, TRIGRAM_INDEX, FLAT_ITEMS]
@@ -0,0 +1,36 @@
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+from sqlalchemy.engine import Engine
+from src.core.logging import get_logger
+
+T = TypeVar('T')
+
+logger = get_logger(__name__)
+
+
+class GenerationCache(Generic[T]):
+    """Hold a structure built from the serving database, rebuilding it when the generation changes.
+
+    Each build stamps a new generation, so a structure built for one
+    generation stays valid until the next one goes live. Databases without a
+    generation are never cached.
+    """
+
+    def __init__(self, name: str, build: Callable[[Engine], T]):
+        self.name = name
+        self.build = build
+        self._lock = threading.Lock()
+        self._value: Optional[T] = None
+        self._generation: Optional[str] = None
+
+    def get(self, engine: Engine, generation: Optional[str]) -> Optional[T]:
+        """Get the structure for a database generation; unstamped databases get None."""
+        if generation is None:
+            return None
+        if self._value is None or self._generation != generation:
+            with self._lock:
+                if self._value is None or self._generation != generation:
+                    self._value = self.build(engine)
+                    self._generation = generation
+                    logger.info("Built %s for generation %s", self.name, generation)
+        return self._value
@@ -0,0 +1,567 @@
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from collections.abc import Sequence
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from src.core.config import settings
+from src.core.exceptions import NotFoundError
+from src.core.logging import get_logger
+from src.ingest.normalize import normalize_restaurant
+from src.ingest.reader import iter_restaurants
+from src.ingest.sources import validate_restaurant
+from src.models.database import Restaurant, Section, MenuItem, BuildMeta, engine_manager
+from src.repositories.name_index import NameMatch, RestaurantNameIndex
+from src.repositories.suggest_index import SuggestIndex, Suggestion
+from src.utils.menu_json import RenderedMenu, render_menu
+from src.utils.fulltext import TextIndex, like_regex, like_substring_regex, search_terms
+from src.utils.pagination import Page, ordered_page
+from src.utils.sorting import SortBy, Order, sort_value, sql_lower
+
+logger = get_logger(__name__)
+
+# Joins a restaurant's item names into the single string searched for substrings
+ITEM_NAME_SEPARATOR = "\x00"
+
+
+class RestaurantRecord:
+    __slots__ = ("id", "name", "sections", "items", "rendered")
+
+    def __init__(self, id: int, name: str):
+        self.id = id
+        self.name = name
+        self.sections: List["SectionRecord"] = []
+        self.items: List["ItemRecord"] = []
+        self.rendered: Optional[RenderedMenu] = None
+
+
+class SectionRecord:
+    __slots__ = ("id", "name", "restaurant", "items")
+
+    def __init__(self, id: int, name: str, restaurant: RestaurantRecord):
+        self.id = id
+        self.name = name
+        self.restaurant = restaurant
+        self.items: List["ItemRecord"] = []
+
+
+class ItemRecord:
+    """A menu item, readable like a ``menu_items_flat`` row."""
+    __slots__ = ("id", "name", "description", "price", "section")
+
+    def __init__(self, id: int, name: str, description: Optional[str], price: Optional[float], section: SectionRecord):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.price = price
+        self.section = section
+
+    @property
+    def section_id(self) -> int:
+        return self.section.id
+
+    @property
+    def section_name(self) -> str:
+        return self.section.name
+
+    @property
+    def restaurant_id(self) -> int:
+        return self.section.restaurant.id
+
+    @property
+    def restaurant_name(self) -> str:
+        return self.section.restaurant.name
+
+
+class RenderedSection(NamedTuple):
+    items: bytes
+
+
+class _Slice(Sequence):
+    """A read-only window onto a list, without copying it."""
+
+    def __init__(self, rows: List[Any], start: int, stop: int):
+        self.rows = rows
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, index: int) -> Any:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.rows[self.start + index]
+
+
+class MenuSnapshot:
+    """An indexed, read-only copy of the menu data held in memory.
+
+    Restaurants are hashed by name and sections by restaurant and section
+    name. Items are kept in ID order alongside presorted name and price
+    orders, a full-text index and, per restaurant, its distinct item names
+    joined into one string for substring search. Rows must be added parents
+    first and in ID order, then ``freeze`` builds the sorted structures.
+    """
+
+    def __init__(self, generation: Optional[str] = None):
+        self.generation = generation
+        self.restaurants: List[RestaurantRecord] = []
+        self.restaurants_by_name: Dict[str, RestaurantRecord] = {}
+        self.sections_by_name: Dict[Tuple[str, str], SectionRecord] = {}
+        self.items: List[ItemRecord] = []
+        self.items_by_name: List[ItemRecord] = []
+        self.items_by_price: List[ItemRecord] = []
+        self.unpriced_items: List[ItemRecord] = []
+        self.item_names: List[Tuple[RestaurantRecord, str]] = []
+        self.text_index = TextIndex()
+        self._suggest_index: Optional[SuggestIndex] = None
+        self._name_index: Optional[RestaurantNameIndex] = None
+        self._restaurant_ids: Dict[int, RestaurantRecord] = {}
+        self._section_ids: Dict[int, SectionRecord] = {}
+
+    def add_restaurant(self, id: int, name: str) -> None:
+        restaurant = RestaurantRecord(id, name)
+        self.restaurants.append(restaurant)
+        self.restaurants_by_name[name] = restaurant
+        self._restaurant_ids[id] = restaurant
+
+    def add_section(self, id: int, name: str, restaurant_id: int) -> None:
+        restaurant = self._restaurant_ids[restaurant_id]
+        section = SectionRecord(id, name, restaurant)
+        restaurant.sections.append(section)
+        # Lookups by name resolve to the first section of that name, as the SQL lookup does
+        self.sections_by_name.setdefault((restaurant.name, name), section)
+        self._section_ids[id] = section
+
+    def add_item(self, id: int, name: str, description: Optional[str], price: Optional[float], section_id: int) -> None:
+        section = self._section_ids[section_id]
+        item = ItemRecord(id, name, description, price, section)
+        section.items.append(item)
+        section.restaurant.items.append(item)
+        self.items.append(item)
+        self.text_index.add(name, description)
+
+    def freeze(self) -> "MenuSnapshot":
+        """Build the sorted orders and drop the lookups only needed while loading."""
+        self.items_by_name = sorted(self.items, key=lambda item: (sql_lower(item.name), item.id))
+        self.items_by_price = sorted(
+            (item for item in self.items if item.price is not None), key=lambda item: (item.price, item.id)
+        )
+        self.unpriced_items = [item for item in self.items if item.price is None]
+        self.item_names = [
+            (restaurant, ITEM_NAME_SEPARATOR.join(dict.fromkeys(sql_lower(item.name) for item in restaurant.items)))
+            for restaurant in self.restaurants
+        ]
+        self.text_index.freeze()
+        self._restaurant_ids = {}
+        self._section_ids = {}
+        return self
+
+    def suggest_index(self) -> SuggestIndex:
+        """Get the name completion index, building it on first use."""
+        if self._suggest_index is None:
+            names = Counter((item.name, "item") for item in self.items)
+            for restaurant in self.restaurants:
+                names[(restaurant.name, "restaurant")] += 1
+                names.update((section.name, "section") for section in restaurant.sections)
+            self._suggest_index = SuggestIndex((text, kind, count) for (text, kind), count in names.items())
+        return self._suggest_index
+
+    def name_index(self) -> RestaurantNameIndex:
+        """Get the fuzzy restaurant name index, building it on first use."""
+        if self._name_index is None:
+            self._name_index = RestaurantNameIndex(sorted(self.restaurants_by_name))
+        return self._name_index
+
+
+def load_snapshot(engine: Engine, batch_size: int = 10000) -> MenuSnapshot:
+    """Read a database into a snapshot, stamped with the generation of its build."""
+    with engine.connect() as connection:
+        # One connection keeps reading the same file even if a new build is swapped in meanwhile
+        snapshot = MenuSnapshot(
+            connection.execute(select(BuildMeta.value).where(BuildMeta.key == "generation")).scalar()
+        )
+        for row in connection.execute(select(Restaurant.id, Restaurant.name).order_by(Restaurant.id)):
+            snapshot.add_restaurant(*row)
+        for row in connection.execute(
+            select(Section.id, Section.name, Section.restaurant_id).order_by(Section.id)
+        ):
+            snapshot.add_section(*row)
+        items = connection.execution_options(yield_per=batch_size).execute(
+            select(MenuItem.id, MenuItem.name, MenuItem.description, MenuItem.price, MenuItem.section_id)
+            .order_by(MenuItem.id)
+        )
+        for row in items:
+            snapshot.add_item(*row)
+    return snapshot.freeze()
+
+
+def load_snapshot_file(path: str) -> MenuSnapshot:
+    """Read a menus JSON file straight into a snapshot, numbering rows as a fresh build would."""
+    snapshot = MenuSnapshot()
+    section_id = item_id = 0
+    with open(path, "r") as f:
+        for restaurant_id, (name, restaurant_data) in enumerate(iter_restaurants(f), start=1):
+            validate_restaurant(name, restaurant_data)
+            restaurant = normalize_restaurant(name, restaurant_data)
+            snapshot.add_restaurant(restaurant_id, restaurant["name"])
+            for section in restaurant["sections"]:
+                section_id += 1
+                snapshot.add_section(section_id, section["name"], restaurant_id)
+                for item in section["items"]:
+                    item_id += 1
+                    snapshot.add_item(item_id, item["name"], item["description"], item["price"], section_id)
+    return snapshot.freeze()
+
+
+class SnapshotManager:
+    """Own the serving snapshot and reload it when a new build is swapped in.
+
+    Snapshots come from ``source`` when it names a menus JSON file, otherwise
+    from the serving database. A reload runs on the request that notices the
+    new generation while other requests keep reading the previous snapshot.
+    """
+
+    def __init__(self, source: Optional[str] = None):
+        self.source = source
+        self._lock = threading.Lock()
+        self._snapshot: Optional[MenuSnapshot] = None
+
+    def _load(self) -> MenuSnapshot:
+        if self.source:
+            snapshot = load_snapshot_file(self.source)
+        else:
+            snapshot = load_snapshot(engine_manager.get_engine())
+        logger.info("Loaded %d menu items into memory for generation %s", len(snapshot.items), snapshot.generation)
+        return snapshot
+
+    def get_snapshot(self) -> MenuSnapshot:
+        """Get the current snapshot, loading it on first use."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._load()
+                return self._snapshot
+
+        if not self.source:
+            engine_manager.get_engine()
+            if snapshot.generation != engine_manager.generation and self._lock.acquire(blocking=False):
+                try:
+                    self._snapshot = self._load()
+                finally:
+                    self._lock.release()
+        return self._snapshot
+
+
+snapshot_manager = SnapshotManager(settings.memory_source)
+
+
+class MemoryRestaurantRepository:
+    """Read-only counterpart of ``RestaurantRepository`` over a ``MenuSnapshot``.
+
+    Provides the reads the services use, with the same results, ordering and
+    cursors as the SQLite repository. Rows are already in memory, so ``fields``
+    only shapes menu rows and otherwise leaves projection to the services.
+    """
+
+    def __init__(self, snapshot: MenuSnapshot):
+        self.snapshot = snapshot
+
+    @property
+    def source(self) -> MenuSnapshot:
+        """The snapshot this repository reads, so results are only shared between readers of the same data."""
+        return self.snapshot
+
+    def get_by_name(self, name: str) -> Optional[RestaurantRecord]:
+        """Get restaurant by name."""
+        return self.snapshot.restaurants_by_name.get(name)
+
+    def match_name(self, name: str, limit: int = 5) -> NameMatch:
+        """Find the restaurant a misspelled or loosely written name refers to, or close names."""
+        return self.snapshot.name_index().match(name, limit)
+
+    def iter_names(self, batch_size: int = 1000) -> Iterator[str]:
+        """Iterate every restaurant name in ID order."""
+        return (restaurant.name for restaurant in self.snapshot.restaurants)
+
+    def iter_items(self, batch_size: int = 1000) -> Iterator[Tuple]:
+        """Iterate every item with its restaurant and section names in ID order.
+
+        ``batch_size`` only matches ``RestaurantRepository.iter_items``; the rows are already in memory.
+        """
+        return (
+            (item.restaurant_name, item.section_name, item.name, item.description, item.price)
+            for item in self.snapshot.items
+        )
+
+    def get_names_page(self, limit: int = 100, cursor: Optional[str] = None) -> Page:
+        """Get one page of restaurant names in ID order."""
+        page = ordered_page(self.snapshot.restaurants, limit, cursor, scope=Restaurant.__tablename__)
+        return Page([restaurant.name for restaurant in page.items], page.next_cursor)
+
+    def get_restaurant_with_sections(self, name: str) -> Optional[RestaurantRecord]:
+        """Get restaurant with all sections."""
+        return self.get_by_name(name)
+
+    def get_menu_rows(self, name: str, fields: Optional[Sequence[str]] = None) -> List[Tuple]:
+        """Get a restaurant's whole menu as rows shaped like ``RestaurantRepository.get_menu_rows``."""
+        restaurant = self.get_by_name(name)
+        if restaurant is None:
+            return []
+        if fields is None:
+            values = lambda item: (item.name, item.description, item.price)
+            width = 3
+        else:
+            values = lambda item: (item.id, *(getattr(item, field) for field in fields))
+            width = len(fields) + 1
+        if not restaurant.sections:
+            return [(None,) * (width + 2)]
+
+        rows = []
+        for section in restaurant.sections:
+            if not section.items:
+                rows.append((section.id, section.name) + (None,) * width)
+            for item in section.items:
+                rows.append((section.id, section.name, *values(item)))
+        return rows
+
+    def get_rendered_menu(self, name: str) -> Optional[RenderedMenu]:
+        """Get a restaurant's rendered menu, rendering it on first use.
+
+        Snapshots never change, so the rendering is kept on the restaurant for
+        later requests.
+        """
+        restaurant = self.get_by_name(name)
+        if restaurant is None:
+            return None
+        if restaurant.rendered is None:
+            restaurant.rendered = render_menu(self.get_menu_rows(name))
+        return restaurant.rendered
+
+    def get_rendered_section(self, restaurant_name: str, section_name: str) -> Optional[RenderedSection]:
+        """Get a section's rendered item array, rendering the menu on first use."""
+        rendered = self.get_rendered_menu(restaurant_name)
+        if rendered is None:
+            return None
+        for name, items in rendered.section_items:
+            if name == section_name:
+                return RenderedSection(items)
+        return None
+
+    def get_section_by_name(
+        self, restaurant_name: str, section_name: str, fields: Optional[Sequence[str]] = None
+    ) -> Optional[SectionRecord]:
+        """Get specific section from a restaurant, with its items."""
+        return self.snapshot.sections_by_name.get((restaurant_name, section_name))
+
+    @staticmethod
+    def _price_filter(price_gt: Optional[float], price_lt: Optional[float]) -> List[Callable[[ItemRecord], bool]]:
+        # Comparisons with NULL are never true in SQL, so unpriced items never pass a price filter
+        predicates = []
+        if price_gt is not None:
+            predicates.append(lambda item: item.price is not None and item.price > price_gt)
+        if price_lt is not None:
+            predicates.append(lambda item: item.price is not None and item.price < price_lt)
+        return predicates
+
+    @staticmethod
+    def _combine(predicates: List[Callable[[ItemRecord], bool]]) -> Optional[Callable[[ItemRecord], bool]]:
+        if not predicates:
+            return None
+        if len(predicates) == 1:
+            return predicates[0]
+        return lambda item: all(predicate(item) for predicate in predicates)
+
+    @staticmethod
+    def _sorted_page(
+        items: List[ItemRecord],
+        key: Optional[Callable[[ItemRecord], Any]],
+        descending: bool,
+        limit: Optional[int],
+        cursor: Optional[str],
+        predicate: Optional[Callable[[ItemRecord], bool]],
+        scope: str
+    ) -> Page:
+        """Sort a subset of items in ID order by ``key`` and read one page of it."""
+        if key is None:
+            return ordered_page(items, limit, cursor, predicate=predicate, scope=scope)
+        keyed = sorted((item for item in items if key(item) is not None), key=lambda item: (key(item), item.id))
+        unkeyed = [item for item in items if key(item) is None]
+        return ordered_page(keyed, limit, cursor, key, descending, unkeyed, predicate, scope)
+
+    def get_restaurant_items(
+        self,
+        restaurant_name: str,
+        price_gt: Optional[float] = None,
+        price_lt: Optional[float] = None,
+        sort_by: Optional[SortBy] = None,
+        order: Order = Order.asc
+    ) -> List[ItemRecord]:
+        """Get all items from a restaurant with optional price filtering and sorting."""
+        return self.get_restaurant_items_page(restaurant_name, price_gt, price_lt, sort_by, order).items
+
+    def get_restaurant_items_page(
+        self,
+        restaurant_name: str,
+        price_gt: Optional[float] = None,
+        price_lt: Optional[float] = None,
+        sort_by: Optional[SortBy] = None,
+        order: Order = Order.asc,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Page:
+        """Get one page of a restaurant's items, or all of them without a limit."""
+        restaurant = self.get_by_name(restaurant_name)
+        predicate = self._combine(self._price_filter(price_gt, price_lt))
+        items = restaurant.items if restaurant else []
+        if predicate:
+            items = [item for item in items if predicate(item)]
+        return self._sorted_page(
+            items, sort_value(sort_by), order == Order.desc, limit, cursor, None,
+            scope=f"items:{sort_by.value if sort_by else 'id'}:{order.value}"
+        )
+
+    def search_items_across_restaurants(
+        self,
+        query_text: Optional[str] = None,
+        price_gt: Optional[float] = None,
+        price_lt: Optional[float] = None,
+        restaurant_name: Optional[str] = None,
+        sort_by: Optional[SortBy] = None,
+        order: Order = Order.asc,
+        limit: int = 100
+    ) -> List[ItemRecord]:
+        """Search for items across all restaurants."""
+        return self.search_items_page(
+            query_text, price_gt, price_lt, restaurant_name, sort_by, order, limit
+        ).items
+
+    def search_items_page(
+        self,
+        query_text: Optional[str] = None,
+        price_gt: Optional[float] = None,
+        price_lt: Optional[float] = None,
+        restaurant_name: Optional[str] = None,
+        sort_by: Optional[SortBy] = None,
+        order: Order = Order.asc,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Page:
+        """Search for one page of items across all restaurants.
+
+        Text queries are ranked like the FTS5 index, unless an explicit sort is
+        requested. Unfiltered listings read the presorted orders directly.
+        """
+        snapshot = self.snapshot
+        key = sort_value(sort_by)
+        descending = order == Order.desc
+        scope = f"items:{sort_by.value if sort_by else 'id'}:{order.value}"
+        predicates = self._price_filter(price_gt, price_lt)
+
+        terms = search_terms(query_text) if query_text else []
+        ranked = None
+        if terms:
+            # Rows number items in ID order, so sorting rows sorts matches by ID
+            ranks = snapshot.text_index.rank(terms)
+            rows = sorted(ranks)
+            if key is None:
+                # Relevance order, where a stable sort leaves equal ranks in ID order
+                rows.sort(key=ranks.__getitem__)
+                scope = "items:rank"
+            candidates = [snapshot.items[row] for row in rows]
+            if key is None:
+                ranked = candidates
+                key = dict(zip(candidates, map(ranks.__getitem__, rows))).__getitem__
+        else:
+            if query_text:
+                # Nothing the index can match (e.g. only punctuation), fall back to a substring scan
+                pattern = like_regex(f"%{query_text}%")
+                predicates.append(
+                    lambda item: pattern.fullmatch(item.name) is not None or
+                    (item.description is not None and pattern.fullmatch(item.description) is not None)
+                )
+            candidates = None
+
+        if restaurant_name:
+            if candidates is None:
+                restaurant = self.get_by_name(restaurant_name)
+                candidates = restaurant.items if restaurant else []
+            else:
+                predicates.append(lambda item: item.restaurant_name == restaurant_name)
+
+        predicate = self._combine(predicates)
+        if ranked is not None:
+            return ordered_page(ranked, limit, cursor, key, predicate=predicate, scope=scope)
+        if candidates is not None:
+            return self._sorted_page(candidates, key, descending, limit, cursor, predicate, scope)
+        if key is None:
+            return ordered_page(snapshot.items, limit, cursor, predicate=predicate, scope=scope)
+        if sort_by == SortBy.name:
+            return ordered_page(snapshot.items_by_name, limit, cursor, key, descending, (), predicate, scope)
+        return ordered_page(
+            snapshot.items_by_price, limit, cursor, key, descending, snapshot.unpriced_items, predicate, scope
+        )
+
+    def get_items_by_price_range(
+        self,
+        min_price: float,
+        max_price: float,
+        limit: int = 100
+    ) -> List[ItemRecord]:
+        """Get items within a specific price range."""
+        return self.get_items_by_price_range_page(min_price, max_price, limit).items
+
+    def get_items_by_price_range_page(
+        self,
+        min_price: float,
+        max_price: float,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Page:
+        """Get one page of items within a price range, cheapest first."""
+        items = self.snapshot.items_by_price
+        price = attrgetter("price")
+        in_range = _Slice(
+            items, bisect_left(items, min_price, key=price), bisect_right(items, max_price, key=price)
+        )
+        return ordered_page(in_range, limit, cursor, price, scope="price")
+
+    def get_restaurants_with_item(self, item_name: str) -> List[RestaurantRecord]:
+        """Find restaurants that serve an item with the given name.
+
+        Each restaurant's item names are searched as one string, which stops
+        at the first match.
+        """
+        pattern = like_substring_regex(item_name, ITEM_NAME_SEPARATOR)
+        return [restaurant for restaurant, names in self.snapshot.item_names if pattern.search(names)]
+
+    def get_suggestions(self, prefix: str, limit: int = 10) -> List[Suggestion]:
+        """Complete a prefix to restaurant, section and item names."""
+        return self.snapshot.suggest_index().complete(prefix, limit)
+
+    def get_restaurant_stats(self, restaurant_name: str) -> dict:
+        """Get statistics about a restaurant's menu."""
+        restaurant = self.get_by_name(restaurant_name)
+        if not restaurant:
+            raise NotFoundError(f"Restaurant '{restaurant_name}' not found")
+
+        prices = [item.price for item in restaurant.items if item.price is not None]
+        average = sum(prices) / len(prices) if prices else None
+
+        return {
+            "restaurant": restaurant_name,
+            "total_sections": len(restaurant.sections),
+            "total_items": len(restaurant.items),
+            "items_with_price": len(prices),
+            "items_without_price": len(restaurant.items) - len(prices),
+            "average_price": round(average, 2) if average else None,
+            "min_price": min(prices) if prices else None,
+            "max_price": max(prices) if prices else None
+        }
@@ -0,0 +1,107 @@
+import re
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from src.models.database import Restaurant
+from src.repositories.generation_cache import GenerationCache
+from src.utils.fulltext import fold_term
+
+# Words clients add to or drop from a restaurant's name without meaning another restaurant
+FILLER_WORDS = frozenset({"the", "and", "restaurant", "restaurants"})
+
+# Trigram similarity the best match needs to be resolved, and how far ahead of the runner-up it must be
+RESOLVE_SIMILARITY = 0.45
+RESOLVE_MARGIN = 0.1
+
+# Trigram similarity a name needs to be offered as a suggestion
+SUGGEST_SIMILARITY = 0.2
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def name_words(name: str) -> List[str]:
+    """Split a name into folded words, treating punctuation and underscores as spaces."""
+    return _NON_WORD.sub(" ", fold_term(name)).split()
+
+
+def name_key(name: str) -> str:
+    """Normalize a name for lookups that ignore case, accents, punctuation and filler words."""
+    words = name_words(name)
+    return " ".join(word for word in words if word not in FILLER_WORDS) or " ".join(words)
+
+
+def trigrams(key: str) -> FrozenSet[str]:
+    """Get the trigrams of each word in a key, padded as pg_trgm pads them."""
+    grams = set()
+    for word in key.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class NameMatch(NamedTuple):
+    name: Optional[str]
+    suggestions: List[str]
+
+
+class RestaurantNameIndex:
+    """Restaurant names keyed by their normalized form, with a trigram index for typos.
+
+    A name is resolved when its normalized form belongs to exactly one
+    restaurant, or when a single restaurant is clearly the most similar by
+    trigram Jaccard similarity. Otherwise the closest names are returned as
+    suggestions.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = list(names)
+        self.by_key: Dict[str, List[int]] = defaultdict(list)
+        self.grams: List[FrozenSet[str]] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        for position, name in enumerate(self.names):
+            key = name_key(name)
+            self.by_key[key].append(position)
+            grams = trigrams(key)
+            self.grams.append(grams)
+            for gram in grams:
+                self.postings[gram].append(position)
+
+    @classmethod
+    def load(cls, engine: Engine) -> "RestaurantNameIndex":
+        """Read every restaurant name."""
+        with engine.connect() as connection:
+            return cls(connection.execute(select(Restaurant.name).order_by(Restaurant.name)).scalars())
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def match(self, name: str, limit: int = 5) -> NameMatch:
+        """Find the restaurant a name most likely refers to, or up to ``limit`` close names."""
+        key = name_key(name)
+        exact = self.by_key.get(key, [])
+        if len(exact) == 1:
+            return NameMatch(self.names[exact[0]], [])
+
+        grams = trigrams(key)
+        shared = Counter(position for gram in grams for position in self.postings.get(gram, ()))
+        scored = sorted(
+            (-count / (len(grams) + len(self.grams[position]) - count), self.names[position])
+            for position, count in shared.items()
+        )
+        if not exact and scored and -scored[0][0] >= RESOLVE_SIMILARITY:
+            if len(scored) == 1 or scored[1][0] - scored[0][0] >= RESOLVE_MARGIN:
+                return NameMatch(scored[0][1], [])
+
+        # Names sharing the normalized form are the likeliest, whatever their trigram score
+        suggestions = [self.names[position] for position in exact]
+        suggestions += [
+            candidate for negative, candidate in scored
+            if -negative >= SUGGEST_SIMILARITY and candidate not in suggestions
+        ]
+        return NameMatch(None, suggestions[:limit])
+
+
+restaurant_name_indexes: GenerationCache[RestaurantNameIndex] = GenerationCache(
+    "restaurant name index", RestaurantNameIndex.load
+)
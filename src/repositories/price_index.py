@@ -0,0 +1,80 @@
+from typing import List, Optional, Tuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from src.core.exceptions import ValidationError
+from src.models.database import MenuItemFlat
+from src.repositories.generation_cache import GenerationCache
+
+
+class PriceIndex:
+    """Priced item IDs sorted by ``(price, id)`` in NumPy arrays.
+
+    Built once per database generation, it resolves price ranges and keyset
+    seeks with binary searches instead of SQL. Unpriced items are left out,
+    since no price filter ever matches them.
+    """
+
+    def __init__(self, prices: np.ndarray, ids: np.ndarray):
+        self.prices = prices
+        self.ids = ids
+
+    @classmethod
+    def load(cls, engine: Engine) -> "PriceIndex":
+        """Read every priced item in index order."""
+        with engine.connect() as connection:
+            rows = connection.execute(
+                select(MenuItemFlat.price, MenuItemFlat.id)
+                .where(MenuItemFlat.price.is_not(None))
+                .order_by(MenuItemFlat.price, MenuItemFlat.id)
+            ).all()
+        prices = np.fromiter((row[0] for row in rows), dtype=np.float64, count=len(rows))
+        ids = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+        return cls(prices, ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def seek(
+        self,
+        low: Optional[float] = None,
+        high: Optional[float] = None,
+        low_inclusive: bool = True,
+        high_inclusive: bool = True,
+        after: Optional[List] = None,
+        descending: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Tuple[float, int]]:
+        """Get up to ``limit`` ``(price, id)`` pairs within a price range, in price order.
+
+        ``after`` is the ``[price, id]`` position of the last row already read,
+        as stored in a cursor; reading continues strictly past it.
+        """
+        prices, ids = self.prices, self.ids
+        start = 0 if low is None else int(np.searchsorted(prices, low, "left" if low_inclusive else "right"))
+        stop = len(prices) if high is None else int(np.searchsorted(prices, high, "right" if high_inclusive else "left"))
+
+        if after is not None:
+            try:
+                value, last_id = float(after[0]), int(after[1])
+            except (TypeError, ValueError, IndexError):
+                raise ValidationError("Invalid cursor", {"position": after})
+            # Rows sharing the cursor's price are in ID order, so the position splits them with one more search
+            ties = slice(int(np.searchsorted(prices, value, "left")), int(np.searchsorted(prices, value, "right")))
+            split = ties.start + int(np.searchsorted(ids[ties], last_id, "left" if descending else "right"))
+            if descending:
+                stop = min(stop, split)
+            else:
+                start = max(start, split)
+
+        if stop <= start:
+            return []
+        if descending:
+            first = start if limit is None else max(start, stop - limit)
+            selected = slice(stop - 1, first - 1 if first else None, -1)
+        else:
+            selected = slice(start, stop if limit is None else min(stop, start + limit))
+        return list(zip(prices[selected].tolist(), ids[selected].tolist()))
+
+
+price_indexes: GenerationCache[PriceIndex] = GenerationCache("price index", PriceIndex.load)
@@ -1,9 +1,24 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from src.models.database import Restaurant, Section, MenuItem
+from typing import Iterator, List, Optional, Sequence, TypeVar
+from sqlalchemy.orm import Query, Session, load_only, selectinload
+from sqlalchemy import Row, func, literal_column, select
+from sqlalchemy.engine import Engine
+from src.models.database import (
+    Restaurant, Section, MenuItem, MenuItemFlat, MenuDocument, SectionDocument, engine_manager
+)
+from src.models.derived import menu_item_trigrams, menu_items_fts
 from src.repositories.base import BaseRepository
+from src.repositories.generation_cache import GenerationCache
+from src.repositories.name_index import NameMatch, RestaurantNameIndex, restaurant_name_indexes
+from src.repositories.price_index import PriceIndex, price_indexes
+from src.repositories.suggest_index import Suggestion, query_suggestions, suggest_indexes
 from src.core.exceptions import NotFoundError
+from src.utils.fields import item_columns
+from src.utils.fulltext import build_match_query
+from src.utils.pagination import Page, SortKey, decode_cursor, encode_cursor, keyset_page, seek_condition
+from src.utils.sorting import SortBy, Order, sort_key
+
+
+T = TypeVar('T')
 
 
 class RestaurantRepository(BaseRepository[Restaurant]):
@@ -12,23 +27,145 @@ class RestaurantRepository(BaseRepository[Restaurant]):
     def __init__(self, db: Session):
         super().__init__(db, Restaurant)
     
+    @property
+    def source(self) -> Engine:
+        """The database this repository reads, so results are only shared between readers of the same data."""
+        return self.db.get_bind()
+    
+    def _cached(self, cache: GenerationCache[T]) -> Optional[T]:
+        """Get a structure cached for the serving database, or None if this session reads another database."""
+        bind = self.db.get_bind()
+        if bind is not engine_manager.get_engine():
+            return None
+        return cache.get(bind, engine_manager.generation)
+    
+    def _price_index(self) -> Optional[PriceIndex]:
+        return self._cached(price_indexes)
+    
+    def _name_index(self) -> RestaurantNameIndex:
+        index = self._cached(restaurant_name_indexes)
+        return index if index is not None else RestaurantNameIndex.load(self.db.get_bind())
+    
+    def _item_query(self, fields: Optional[Sequence[str]] = None) -> Query:
+        """Query flat item rows, loading only the columns that hold ``fields`` when given."""
+        query = self.db.query(MenuItemFlat)
+        if fields is not None:
+            columns = [getattr(MenuItemFlat, column) for column in item_columns(fields)]
+            query = query.options(load_only(*columns, raiseload=True))
+        return query
+    
+    def _indexed_price_page(
+        self,
+        index: PriceIndex,
+        low: Optional[float],
+        high: Optional[float],
+        inclusive: bool,
+        descending: bool,
+        limit: int,
+        cursor: Optional[str],
+        scope: str,
+        fields: Optional[Sequence[str]] = None
+    ) -> Page:
+        """Read one page of a price-ordered range from the price index, then load just its rows by ID."""
+        position = decode_cursor(cursor, scope, 2) if cursor else None
+        entries = index.seek(low, high, inclusive, inclusive, position, descending, limit + 1)
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = encode_cursor(scope, list(entries[-1]))
+        
+        ids = [item_id for _, item_id in entries]
+        rows = {row.id: row for row in self._item_query(fields).filter(MenuItemFlat.id.in_(ids))}
+        return Page([rows[item_id] for item_id in ids], next_cursor)
+    
     def get_by_name(self, name: str) -> Optional[Restaurant]:
         """Get restaurant by name."""
         return self.db.query(Restaurant).filter(Restaurant.name == name).first()
     
+    def match_name(self, name: str, limit: int = 5) -> NameMatch:
+        """Find the restaurant a misspelled or loosely written name refers to, or close names."""
+        return self._name_index().match(name, limit)
+    
+    def iter_names(self, batch_size: int = 1000) -> Iterator[str]:
+        """Stream every restaurant name in ID order without loading ORM objects."""
+        return self.db.execute(
+            select(Restaurant.name)
+            .order_by(Restaurant.id)
+            .execution_options(yield_per=batch_size)
+        ).scalars()
+    
+    def iter_items(self, batch_size: int = 1000) -> Iterator[Row]:
+        """Stream every item with its restaurant and section names in ID order, in constant memory.
+        
+        Rows are ``(restaurant_name, section_name, name, description, price)``.
+        """
+        return self.db.execute(
+            select(
+                MenuItemFlat.restaurant_name, MenuItemFlat.section_name,
+                MenuItemFlat.name, MenuItemFlat.description, MenuItemFlat.price
+            )
+            .order_by(MenuItemFlat.id)
+            .execution_options(yield_per=batch_size)
+        )
+    
+    def get_names_page(self, limit: int = 100, cursor: Optional[str] = None) -> Page:
+        """Get one page of restaurant names in ID order."""
+        page = keyset_page(
+            self.db.query(Restaurant.id, Restaurant.name), Restaurant.id, limit, cursor,
+            scope=Restaurant.__tablename__
+        )
+        return Page([row.name for row in page.items], page.next_cursor)
+    
     def get_restaurant_with_sections(self, name: str) -> Optional[Restaurant]:
         """Get restaurant with all sections loaded."""
         return (
             self.db.query(Restaurant)
+            .options(selectinload(Restaurant.sections))
             .filter(Restaurant.name == name)
             .first()
         )
     
-    def get_section_by_name(self, restaurant_name: str, section_name: str) -> Optional[Section]:
-        """Get specific section from a restaurant."""
+    def get_menu_rows(self, name: str, fields: Optional[Sequence[str]] = None) -> List[Row]:
+        """Get a restaurant's whole menu as one flat, ordered result.
+        
+        Rows are ``(section_id, section_name, item_name, description, price)``
+        in menu order. Outer joins keep a row for empty sections, and a single
+        all-NULL row for a restaurant without sections, so no rows means the
+        restaurant does not exist. With ``fields``, only those item columns are
+        read and rows are ``(section_id, section_name, item_id, *fields)``.
+        """
+        if fields is None:
+            columns = [MenuItem.name, MenuItem.description, MenuItem.price]
+        else:
+            columns = [MenuItem.id, *(getattr(MenuItem, field) for field in fields)]
+        return self.db.execute(
+            select(Section.id, Section.name, *columns)
+            .select_from(Restaurant)
+            .outerjoin(Section, Section.restaurant_id == Restaurant.id)
+            .outerjoin(MenuItem, MenuItem.section_id == Section.id)
+            .where(Restaurant.name == name)
+            .order_by(Section.id, MenuItem.id)
+        ).all()
+    
+    def get_rendered_menu(self, name: str) -> Optional[MenuDocument]:
+        """Get the menu pre-rendered for a restaurant by the last build, if any."""
+        return self.db.get(MenuDocument, name)
+    
+    def get_rendered_section(self, restaurant_name: str, section_name: str) -> Optional[SectionDocument]:
+        """Get a section's item array pre-rendered by the last build, if any."""
+        return self.db.get(SectionDocument, (restaurant_name, section_name))
+    
+    def get_section_by_name(
+        self, restaurant_name: str, section_name: str, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Section]:
+        """Get specific section from a restaurant, with its items loaded, or just their ``fields`` columns."""
+        items = selectinload(Section.items)
+        if fields is not None:
+            items = items.load_only(*(getattr(MenuItem, field) for field in fields), raiseload=True)
         return (
             self.db.query(Section)
             .join(Restaurant)
+            .options(items)
             .filter(Restaurant.name == restaurant_name, Section.name == section_name)
             .first()
         )
@@ -37,22 +174,43 @@ class RestaurantRepository(BaseRepository[Restaurant]):
         self, 
         restaurant_name: str,
         price_gt: Optional[float] = None,
-        price_lt: Optional[float] = None
-    ) -> List[MenuItem]:
-        """Get all items from a restaurant with optional price filtering."""
+        price_lt: Optional[float] = None,
+        sort_by: Optional[SortBy] = None,
+        order: Order = Order.asc
+    ) -> List[MenuItemFlat]:
+        """Get all items from a restaurant with optional price filtering and sorting."""
+        return self.get_restaurant_items_page(restaurant_name, price_gt, price_lt, sort_by, order).items
+    
+    def get_restaurant_items_page(
+        self,
+        restaurant_name: str,
+        price_gt: Optional[float] = None,
+        price_lt: Optional[float] = None,
+        sort_by: Optional[SortBy] = None,
+        order: Order = Order.asc,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Page:
+        """Get one page of a restaurant's items, or all of them without a limit.
+        
+        ``fields`` limits the columns read to those holding the named response fields.
+        """
         query = (
-            self.db.query(MenuItem)
-            .join(Section)
-            .join(Restaurant)
-            .filter(Restaurant.name == restaurant_name)
+            self._item_query(fields)
+            .filter(MenuItemFlat.restaurant_name == restaurant_name)
         )
         
         if price_gt is not None:
-            query = query.filter(MenuItem.price > price_gt)
+            query = query.filter(MenuItemFlat.price > price_gt)
         if price_lt is not None:
-            query = query.filter(MenuItem.price < price_lt)
+            query = query.filter(MenuItemFlat.price < price_lt)
         
-        return query.all()
+        return keyset_page(
+            query, MenuItemFlat.id, limit, cursor,
+            sort_key=sort_key(MenuItemFlat.name, MenuItemFlat.price, sort_by, order),
+            scope=f"items:{sort_by.value if sort_by else 'id'}:{order.value}"
+        )
     
     def search_items_across_restaurants(
         self,
@@ -60,62 +218,156 @@ class RestaurantRepository(BaseRepository[Restaurant]):
         price_gt: Optional[float] = None,
         price_lt: Optional[float] = None,
         restaurant_name: Optional[str] = None,
+        sort_by: Optional[SortBy] = None,
+        order: Order = Order.asc,
         limit: int = 100
-    ) -> List[MenuItem]:
+    ) -> List[MenuItemFlat]:
         """Search for items across all restaurants."""
-        query = self.db.query(MenuItem).join(Section).join(Restaurant)
+        return self.search_items_page(
+            query_text, price_gt, price_lt, restaurant_name, sort_by, order, limit
+        ).items
+    
+    def search_items_page(
+        self,
+        query_text: Optional[str] = None,
+        price_gt: Optional[float] = None,
+        price_lt: Optional[float] = None,
+        restaurant_name: Optional[str] = None,
+        sort_by: Optional[SortBy] = None,
+        order: Order = Order.asc,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Page:
+        """Search for one page of items across all restaurants.
+        
+        Text queries go through the FTS5 index and are ordered by bm25 relevance,
+        unless an explicit sort is requested. Other queries default to ID order.
+        ``fields`` limits the columns read to those holding the named response fields.
+        """
+        key = sort_key(MenuItemFlat.name, MenuItemFlat.price, sort_by, order)
+        scope = f"items:{sort_by.value if sort_by else 'id'}:{order.value}"
+        
+        if (
+            sort_by == SortBy.price and not query_text and not restaurant_name
+            and (price_gt is not None or price_lt is not None)
+        ):
+            # A price-sorted listing bounded by price filters is exactly a price index range
+            index = self._price_index()
+            if index is not None:
+                return self._indexed_price_page(
+                    index, price_gt, price_lt, False, order == Order.desc, limit, cursor, scope, fields
+                )
+        
+        query = self._item_query(fields)
+        seek_cursor = cursor
         
-        if query_text:
+        match_query = build_match_query(query_text) if query_text else None
+        if match_query:
+            rank, rowid = menu_items_fts.c.rank, menu_items_fts.c.rowid
+            matches = select(rowid, rank).where(literal_column(menu_items_fts.name).match(match_query))
+            if key is None:
+                scope = "items:rank"
+                # FTS5 only evaluates rank inside the MATCH query, so seek there rather than in keyset_page
+                if cursor:
+                    matches = matches.where(seek_condition(rank, rowid, decode_cursor(cursor, scope, 2)))
+                    seek_cursor = None
+                if price_gt is None and price_lt is None and not restaurant_name:
+                    # Without other filters, rank and limit inside the index before touching the base tables
+                    matches = matches.order_by(rank, rowid).limit(limit + 1)
+            matches = matches.subquery()
+            query = query.join(matches, matches.c.rowid == MenuItemFlat.id)
+            if key is None:
+                key = SortKey(matches.c.rank)
+        elif query_text:
+            # Nothing the index can match (e.g. only punctuation), fall back to a substring scan
             search_pattern = f"%{query_text}%"
             query = query.filter(
-                (MenuItem.name.ilike(search_pattern)) | 
-                (MenuItem.description.ilike(search_pattern))
+                (MenuItemFlat.name.ilike(search_pattern)) | 
+                (MenuItemFlat.description.ilike(search_pattern))
             )
         
         if price_gt is not None:
-            query = query.filter(MenuItem.price > price_gt)
+            query = query.filter(MenuItemFlat.price > price_gt)
         if price_lt is not None:
-            query = query.filter(MenuItem.price < price_lt)
+            query = query.filter(MenuItemFlat.price < price_lt)
         
         if restaurant_name:
-            query = query.filter(Restaurant.name == restaurant_name)
+            query = query.filter(MenuItemFlat.restaurant_name == restaurant_name)
         
-        return query.limit(limit).all()
+        return keyset_page(query, MenuItemFlat.id, limit, seek_cursor, sort_key=key, scope=scope)
     
     def get_items_by_price_range(
         self, 
         min_price: float, 
         max_price: float, 
         limit: int = 100
-    ) -> List[MenuItem]:
+    ) -> List[MenuItemFlat]:
         """Get items within a specific price range."""
-        return (
-            self.db.query(MenuItem)
-            .join(Section)
-            .join(Restaurant)
-            .filter(MenuItem.price >= min_price, MenuItem.price <= max_price)
-            .order_by(MenuItem.price)
-            .limit(limit)
-            .all()
+        return self.get_items_by_price_range_page(min_price, max_price, limit).items
+    
+    def get_items_by_price_range_page(
+        self,
+        min_price: float,
+        max_price: float,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Page:
+        """Get one page of items within a price range, cheapest first.
+        
+        Served from the in-process price index when the session reads the
+        serving database. ``fields`` limits the columns read as for ``search_items_page``.
+        """
+        index = self._price_index()
+        if index is not None:
+            return self._indexed_price_page(
+                index, min_price, max_price, True, False, limit, cursor, "price", fields
+            )
+        
+        query = (
+            self._item_query(fields)
+            .filter(MenuItemFlat.price >= min_price, MenuItemFlat.price <= max_price)
         )
+        return keyset_page(query, MenuItemFlat.id, limit, cursor, sort_key=SortKey(MenuItemFlat.price), scope="price")
     
     def get_restaurants_with_item(self, item_name: str) -> List[Restaurant]:
-        """Find restaurants that serve an item with the given name."""
+        """Find restaurants that serve an item with the given name.
+        
+        The substring match runs against the trigram index, so only candidate
+        items are visited rather than every row of ``menu_items``.
+        """
+        # SQLite's LIKE is already case-insensitive; ilike() would wrap the column in lower() and skip the index
+        restaurant_ids = (
+            select(menu_item_trigrams.c.restaurant_id)
+            .where(menu_item_trigrams.c.name.like(f"%{item_name}%"))
+        )
         return (
             self.db.query(Restaurant)
-            .join(Section)
-            .join(MenuItem)
-            .filter(MenuItem.name.ilike(f"%{item_name}%"))
-            .distinct()
+            .filter(Restaurant.id.in_(restaurant_ids))
             .all()
         )
     
+    def get_suggestions(self, prefix: str, limit: int = 10) -> List[Suggestion]:
+        """Complete a prefix to restaurant, section and item names."""
+        index = self._cached(suggest_indexes)
+        if index is None:
+            # Databases without a build generation can change at any time, so they are queried per call
+            return query_suggestions(self.db, prefix, limit)
+        return index.complete(prefix, limit)
+    
     def get_restaurant_stats(self, restaurant_name: str) -> dict:
         """Get statistics about a restaurant's menu."""
         restaurant = self.get_by_name(restaurant_name)
         if not restaurant:
             raise NotFoundError(f"Restaurant '{restaurant_name}' not found")
         
+        section_count = (
+            self.db.query(func.count(Section.id))
+            .filter(Section.restaurant_id == restaurant.id)
+            .scalar()
+        )
+        
         # Get aggregated statistics
         stats = (
             self.db.query(
@@ -132,7 +384,7 @@ class RestaurantRepository(BaseRepository[Restaurant]):
         
         return {
             "restaurant": restaurant_name,
-            "total_sections": len(restaurant.sections),
+            "total_sections": section_count,
             "total_items": stats.total_items or 0,
             "items_with_price": stats.items_with_price or 0,
             "items_without_price": (stats.total_items or 0) - (stats.items_with_price or 0),
@@ -0,0 +1,99 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from src.models.database import Restaurant, Section, MenuItemFlat
+from src.repositories.generation_cache import GenerationCache
+from src.utils.fulltext import fold_term
+from src.utils.sorting import sql_lower
+
+# Kinds of name offered as completions, in the order they are listed for the same text
+SUGGESTION_KINDS = ("restaurant", "section", "item")
+
+
+class Suggestion(NamedTuple):
+    text: str
+    kind: str
+
+
+class SuggestIndex:
+    """Distinct restaurant, section and item names sorted by their folded form.
+
+    A completion is a bisect to the first name starting with the folded
+    prefix followed by a slice, so its cost depends on the number of results
+    rather than the number of names. Names differing only in case or accents
+    are merged into their most common spelling.
+    """
+
+    def __init__(self, names: Iterable[Tuple[str, str, int]]):
+        spellings: Dict[Tuple[str, int], Tuple[int, str]] = {}
+        for text, kind, count in names:
+            key = (fold_term(text), SUGGESTION_KINDS.index(kind))
+            best = spellings.get(key)
+            # Most common spelling wins, ties go to the alphabetically first one
+            if best is None or (-count, text) < (-best[0], best[1]):
+                spellings[key] = (count, text)
+
+        entries = sorted((folded, rank, text) for (folded, rank), (_, text) in spellings.items())
+        self.keys: List[str] = [folded for folded, _, _ in entries]
+        self.suggestions: List[Suggestion] = [Suggestion(text, SUGGESTION_KINDS[rank]) for _, rank, text in entries]
+
+    @classmethod
+    def load(cls, engine: Engine) -> "SuggestIndex":
+        """Read every distinct name with its number of occurrences."""
+        with engine.connect() as connection:
+            names = [
+                (name, "restaurant", 1) for name in connection.execute(select(Restaurant.name)).scalars()
+            ]
+            for kind, column in (("section", Section.name), ("item", MenuItemFlat.name)):
+                names += [
+                    (name, kind, count)
+                    for name, count in connection.execute(select(column, func.count()).group_by(column))
+                ]
+        return cls(names)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Suggestion]:
+        """Get up to ``limit`` names starting with ``prefix``, ignoring case and accents, in folded order."""
+        folded = fold_term(prefix.lstrip())
+        if not folded:
+            return []
+        keys = self.keys
+        start = bisect_left(keys, folded)
+        stop = start
+        while stop < len(keys) and stop - start < limit and keys[stop].startswith(folded):
+            stop += 1
+        return self.suggestions[start:stop]
+
+
+def query_suggestions(db: Session, prefix: str, limit: int = 10) -> List[Suggestion]:
+    """Complete a prefix with bounded queries, for databases that have no cached index.
+
+    Each kind reads at most ``limit`` distinct names from a ``lower(name)``
+    range, which the item name index answers without a scan. SQLite only folds
+    ASCII case, so unlike ``SuggestIndex`` accents are not ignored here.
+    """
+    low = sql_lower(prefix.lstrip())
+    if not low:
+        return []
+    high = low[:-1] + chr(ord(low[-1]) + 1)
+
+    names = []
+    for kind, column in (("restaurant", Restaurant.name), ("section", Section.name), ("item", MenuItemFlat.name)):
+        key = func.lower(column)
+        keys = (
+            select(key).where(key >= low, key < high)
+            .group_by(key).order_by(key).limit(limit)
+            .scalar_subquery()
+        )
+        names += [
+            (name, kind, count)
+            for name, count in db.execute(select(column, func.count()).where(key.in_(keys)).group_by(column))
+        ]
+    return SuggestIndex(names).complete(prefix, limit)
+
+
+suggest_indexes: GenerationCache[SuggestIndex] = GenerationCache("suggest index", SuggestIndex.load)
@@ -1,59 +1,138 @@
-from typing import List, Optional, Dict, Any
+from typing import Callable, Iterator, List, Optional, Dict, Any, Sequence, TypeVar
 from sqlalchemy.orm import Session
+from src.core.singleflight import SingleFlight
+from src.repositories.name_index import NameMatch
 from src.repositories.restaurant_repository import RestaurantRepository
 from src.core.exceptions import NotFoundError
-from src.utils.sorting import sort_menu_items, SortBy, Order
+from src.utils.fields import MENU_ITEM_FIELDS, project_item
+from src.utils.menu_json import encode_json, render_menu
+from src.utils.pagination import Page
+from src.utils.sorting import SortBy, Order
+
+T = TypeVar('T')
+
+# Per-restaurant reads that bursts of identical requests share while one is in flight
+restaurant_flights = SingleFlight()
 
 
 class RestaurantService:
     """Service layer for restaurant business logic."""
     
-    def __init__(self, db: Session):
-        self.repository = RestaurantRepository(db)
+    def __init__(self, db: Optional[Session] = None, repository: Optional[RestaurantRepository] = None):
+        self.repository = repository if repository is not None else RestaurantRepository(db)
+    
+    def _shared(self, operation: str, restaurant_name: str, compute: Callable[[], T]) -> T:
+        """Run a read once for all identical concurrent requests against the same data."""
+        return restaurant_flights.do((operation, restaurant_name, self.repository.source), compute)
+    
+    def match_restaurant_name(self, restaurant_name: str) -> NameMatch:
+        """Find the restaurant a name that matched none exactly most likely refers to."""
+        return self.repository.match_name(restaurant_name)
     
     def get_all_restaurants(self) -> List[str]:
         """Get list of all restaurant names."""
-        restaurants = self.repository.get_all()
-        return [r.name for r in restaurants]
+        return list(self.repository.iter_names())
     
-    def get_restaurant_menu(self, restaurant_name: str) -> Dict[str, List[Dict[str, Any]]]:
-        """Get full menu for a restaurant."""
-        restaurant = self.repository.get_by_name(restaurant_name)
-        if not restaurant:
+    def iter_restaurant_names(self) -> Iterator[str]:
+        """Stream all restaurant names in constant memory."""
+        return self.repository.iter_names()
+    
+    def iter_all_items(self) -> Iterator[Dict[str, Any]]:
+        """Stream every item of every restaurant, with its restaurant and section, in constant memory."""
+        for restaurant, section, name, description, price in self.repository.iter_items():
+            yield {
+                "restaurant": restaurant,
+                "section": section,
+                "name": name,
+                "description": description,
+                "price": price
+            }
+    
+    def get_restaurants_page(self, limit: int = 100, cursor: Optional[str] = None) -> Page:
+        """Get one page of restaurant names."""
+        return self.repository.get_names_page(limit, cursor)
+    
+    def get_restaurant_menu(
+        self, restaurant_name: str, fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get full menu for a restaurant, with only ``fields`` of each item when given."""
+        rows = self.repository.get_menu_rows(restaurant_name, fields)
+        if not rows:
             raise NotFoundError(f"Restaurant '{restaurant_name}' not found")
         
         menu = {}
-        for section in restaurant.sections:
-            menu[section.name] = [
-                {
-                    "name": item.name,
-                    "description": item.description,
-                    "price": item.price
-                }
-                for item in section.items
-            ]
+        current_section = None
+        for section_id, section_name, *values in rows:
+            if section_id is None:
+                break
+            if section_id != current_section:
+                items = menu[section_name] = []
+                current_section = section_id
+            # Item names, or the item IDs leading projected rows, are only NULL for empty sections
+            if values[0] is None:
+                continue
+            if fields is None:
+                items.append(dict(zip(MENU_ITEM_FIELDS, values)))
+            else:
+                items.append(dict(zip(fields, values[1:])))
         
         return menu
     
+    def get_restaurant_menu_json(self, restaurant_name: str, fields: Optional[Sequence[str]] = None) -> bytes:
+        """Get the full menu for a restaurant as JSON bytes.
+        
+        Serves the copy pre-rendered at build time with one primary-key lookup,
+        and falls back to rendering from a single ordered join. Concurrent
+        requests for the same menu share one read. Menus narrowed to ``fields``
+        are read from just those columns.
+        """
+        if fields is not None:
+            return encode_json(self.get_restaurant_menu(restaurant_name, fields))
+        return self._shared("menu", restaurant_name, lambda: self._read_restaurant_menu_json(restaurant_name))
+    
+    def _read_restaurant_menu_json(self, restaurant_name: str) -> bytes:
+        rendered = self.repository.get_rendered_menu(restaurant_name)
+        if rendered is not None:
+            return rendered.menu
+        
+        rows = self.repository.get_menu_rows(restaurant_name)
+        if not rows:
+            raise NotFoundError(f"Restaurant '{restaurant_name}' not found")
+        return render_menu(rows).menu
+    
     def get_restaurant_sections(self, restaurant_name: str) -> List[str]:
         """Get all section names for a restaurant."""
-        restaurant = self.repository.get_by_name(restaurant_name)
+        restaurant = self.repository.get_restaurant_with_sections(restaurant_name)
         if not restaurant:
             raise NotFoundError(f"Restaurant '{restaurant_name}' not found")
         
         return [section.name for section in restaurant.sections]
     
-    def get_section_items(self, restaurant_name: str, section_name: str) -> List[Dict[str, Any]]:
-        """Get all items in a specific section."""
+    def get_restaurant_sections_json(self, restaurant_name: str) -> bytes:
+        """Get all section names for a restaurant as JSON bytes, pre-rendered when available."""
+        return self._shared("sections", restaurant_name, lambda: self._read_restaurant_sections_json(restaurant_name))
+    
+    def _read_restaurant_sections_json(self, restaurant_name: str) -> bytes:
+        rendered = self.repository.get_rendered_menu(restaurant_name)
+        if rendered is not None:
+            return rendered.sections
+        return encode_json(self.get_restaurant_sections(restaurant_name))
+    
+    def get_section_items(
+        self, restaurant_name: str, section_name: str, fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get all items in a specific section, with only ``fields`` of each when given."""
         # First check if restaurant exists
         restaurant = self.repository.get_by_name(restaurant_name)
         if not restaurant:
             raise NotFoundError(f"Restaurant '{restaurant_name}' not found")
         
-        section = self.repository.get_section_by_name(restaurant_name, section_name)
+        section = self.repository.get_section_by_name(restaurant_name, section_name, fields)
         if not section:
             raise NotFoundError(f"Section '{section_name}' not found in restaurant '{restaurant_name}'")
         
+        if fields is not None:
+            return [project_item(item, fields) for item in section.items]
         return [
             {
                 "name": item.name,
@@ -63,6 +142,17 @@ class RestaurantService:
             for item in section.items
         ]
     
+    def get_section_items_json(
+        self, restaurant_name: str, section_name: str, fields: Optional[Sequence[str]] = None
+    ) -> bytes:
+        """Get all items in a specific section as JSON bytes, pre-rendered when available."""
+        if fields is not None:
+            return encode_json(self.get_section_items(restaurant_name, section_name, fields))
+        rendered = self.repository.get_rendered_section(restaurant_name, section_name)
+        if rendered is not None:
+            return rendered.items
+        return encode_json(self.get_section_items(restaurant_name, section_name))
+    
     def get_restaurant_items(
         self,
         restaurant_name: str,
@@ -72,28 +162,44 @@ class RestaurantService:
         order: Order = Order.asc
     ) -> List[Dict[str, Any]]:
         """Get all items from a restaurant with filtering and sorting."""
+        return self.get_restaurant_items_page(restaurant_name, price_gt, price_lt, sort_by, order).items
+    
+    def get_restaurant_items_page(
+        self,
+        restaurant_name: str,
+        price_gt: Optional[float] = None,
+        price_lt: Optional[float] = None,
+        sort_by: Optional[SortBy] = None,
+        order: Order = Order.asc,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Page:
+        """Get one page of a restaurant's items with filtering and sorting, with only ``fields`` when given."""
         # Check if restaurant exists
         restaurant = self.repository.get_by_name(restaurant_name)
         if not restaurant:
             raise NotFoundError(f"Restaurant '{restaurant_name}' not found")
         
         # Get items with filtering
-        items = self.repository.get_restaurant_items(restaurant_name, price_gt, price_lt)
+        page = self.repository.get_restaurant_items_page(
+            restaurant_name, price_gt, price_lt, sort_by, order, limit, cursor, fields
+        )
         
         # Format response
-        result = [
+        if fields is not None:
+            return Page([project_item(item, fields) for item in page.items], page.next_cursor)
+        items = [
             {
                 "name": item.name,
                 "description": item.description,
                 "price": item.price,
-                "section": item.section.name
+                "section": item.section_name
             }
-            for item in items
+            for item in page.items
         ]
-        
-        # Apply sorting
-        return sort_menu_items(result, sort_by, order)
+        return Page(items, page.next_cursor)
     
     def get_restaurant_stats(self, restaurant_name: str) -> Dict[str, Any]:
-        """Get statistics about a restaurant's menu."""
-        return self.repository.get_restaurant_stats(restaurant_name)
\ No newline at end of file
+        """Get statistics about a restaurant's menu, sharing one read between concurrent requests."""
+        return self._shared("stats", restaurant_name, lambda: self.repository.get_restaurant_stats(restaurant_name))
\ No newline at end of file
@@ -1,15 +1,17 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 from sqlalchemy.orm import Session
 from src.repositories.restaurant_repository import RestaurantRepository
 from src.core.exceptions import ValidationError
+from src.utils.fields import project_item
+from src.utils.pagination import Page
 from src.utils.sorting import SortBy, Order
 
 
 class SearchService:
     """Service layer for cross-restaurant search functionality."""
     
-    def __init__(self, db: Session):
-        self.repository = RestaurantRepository(db)
+    def __init__(self, db: Optional[Session] = None, repository: Optional[RestaurantRepository] = None):
+        self.repository = repository if repository is not None else RestaurantRepository(db)
     
     def search_items(
         self,
@@ -22,40 +24,33 @@ class SearchService:
         limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Search for menu items across all restaurants."""
-        # Get items from repository
-        items = self.repository.search_items_across_restaurants(
+        return self.search_items_page(query, price_gt, price_lt, restaurant, sort_by, order, limit).items
+    
+    def search_items_page(
+        self,
+        query: Optional[str] = None,
+        price_gt: Optional[float] = None,
+        price_lt: Optional[float] = None,
+        restaurant: Optional[str] = None,
+        sort_by: Optional[SortBy] = None,
+        order: Order = Order.asc,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Page:
+        """Search for one page of menu items across all restaurants, with only ``fields`` when given."""
+        page = self.repository.search_items_page(
             query_text=query,
             price_gt=price_gt,
             price_lt=price_lt,
             restaurant_name=restaurant,
-            limit=limit
+            sort_by=sort_by,
+            order=order,
+            limit=limit,
+            cursor=cursor,
+            fields=fields
         )
-        
-        # Format response
-        result = [
-            {
-                "name": item.name,
-                "description": item.description,
-                "price": item.price,
-                "section": item.section.name,
-                "restaurant": item.section.restaurant.name
-            }
-            for item in items
-        ]
-        
-        # Apply sorting if requested
-        if sort_by:
-            if sort_by == SortBy.name:
-                result.sort(key=lambda x: x["name"].lower(), reverse=(order == Order.desc))
-            elif sort_by == SortBy.price:
-                # Sort with prices first, then without prices
-                items_with_price = [item for item in result if item["price"] is not None]
-                items_without_price = [item for item in result if item["price"] is None]
-                
-                items_with_price.sort(key=lambda x: x["price"], reverse=(order == Order.desc))
-                result = items_with_price + items_without_price
-        
-        return result
+        return Page(self._format_items(page.items, fields), page.next_cursor)
     
     def search_by_price_range(
         self, 
@@ -64,22 +59,45 @@ class SearchService:
         limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Find all items within a specific price range across all restaurants."""
+        return self.search_by_price_range_page(min_price, max_price, limit).items
+    
+    def search_by_price_range_page(
+        self,
+        min_price: float,
+        max_price: float,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Page:
+        """Find one page of items within a price range, cheapest first."""
         if min_price > max_price:
             raise ValidationError("min_price must be less than or equal to max_price")
         
-        items = self.repository.get_items_by_price_range(min_price, max_price, limit)
-        
+        page = self.repository.get_items_by_price_range_page(min_price, max_price, limit, cursor, fields)
+        return Page(self._format_items(page.items, fields), page.next_cursor)
+    
+    @staticmethod
+    def _format_items(items, fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        if fields is not None:
+            return [project_item(item, fields) for item in items]
         return [
             {
                 "name": item.name,
                 "description": item.description,
                 "price": item.price,
-                "section": item.section.name,
-                "restaurant": item.section.restaurant.name
+                "section": item.section_name,
+                "restaurant": item.restaurant_name
             }
             for item in items
         ]
     
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, str]]:
+        """Complete a partially typed name to restaurant, section and item names."""
+        return [
+            {"text": suggestion.text, "type": suggestion.kind}
+            for suggestion in self.repository.get_suggestions(prefix, limit)
+        ]
+    
     def find_restaurants_with_item(self, item_name: str) -> List[str]:
         """Find all restaurants that have an item with the given name."""
         restaurants = self.repository.get_restaurants_with_item(item_name)
@@ -0,0 +1,47 @@
+from typing import Any, Dict, Optional, Sequence, Tuple
+from src.core.exceptions import ValidationError
+
+# Fields of an item inside a menu or section, then those added by item listings and by search
+MENU_ITEM_FIELDS = ("name", "description", "price")
+RESTAURANT_ITEM_FIELDS = MENU_ITEM_FIELDS + ("section",)
+SEARCH_ITEM_FIELDS = RESTAURANT_ITEM_FIELDS + ("restaurant",)
+
+# Attribute of a ``menu_items_flat`` row holding each response field
+ITEM_ATTRIBUTES = {
+    "name": "name",
+    "description": "description",
+    "price": "price",
+    "section": "section_name",
+    "restaurant": "restaurant_name",
+}
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[Tuple[str, ...]]:
+    """Parse a comma-separated ``fields`` parameter, or return None when it asks for every field.
+
+    The selected fields come back in the order of ``allowed``, so responses
+    keep the same key order whichever order the client lists them in.
+    """
+    if fields is None:
+        return None
+    requested = {field.strip() for field in fields.split(",")} - {""}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValidationError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. Choose from: {', '.join(allowed)}",
+            {"fields": fields}
+        )
+    if not requested:
+        raise ValidationError("At least one field is required", {"fields": fields})
+    selected = tuple(field for field in allowed if field in requested)
+    return None if len(selected) == len(allowed) else selected
+
+
+def item_columns(fields: Sequence[str]) -> Tuple[str, ...]:
+    """Get the row attributes holding the given fields."""
+    return tuple(ITEM_ATTRIBUTES[field] for field in fields)
+
+
+def project_item(item: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    """Read the given fields of an item row into a response dict."""
+    return {field: getattr(item, ITEM_ATTRIBUTES[field]) for field in fields}
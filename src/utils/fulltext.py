@@ -0,0 +1,151 @@
+import math
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Optional, Pattern
+from src.utils.sorting import sql_lower
+
+# Mirrors the unicode61 tokenizer: letters and digits are token characters, everything else separates
+_TOKEN = re.compile(r"[^\W_]+")
+
+# FTS5's bm25() constants
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def search_terms(query_text: str) -> List[str]:
+    """Split free text into the terms the full-text index can match."""
+    return _TOKEN.findall(query_text)
+
+
+def build_match_query(query_text: str) -> Optional[str]:
+    """Translate free text into an FTS5 MATCH expression.
+
+    Every term must match (implicit AND) and each term matches as a prefix, so
+    ``"grill chick"`` finds "Grilled Chicken". Terms are quoted, so FTS5
+    operators typed by users are treated as plain text. Returns None when the
+    text has no searchable terms.
+    """
+    terms = search_terms(query_text)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def fold_term(term: str) -> str:
+    """Case-fold a term and strip its diacritics, as ``remove_diacritics 2`` does."""
+    if term.isascii():
+        return term.lower()
+    decomposed = unicodedata.normalize("NFD", term)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def like_regex(pattern: str) -> Pattern:
+    """Compile a SQL LIKE pattern into a regex matching the same values as SQLite.
+
+    ``%`` and ``_`` are wildcards and only ASCII letters match case-insensitively,
+    which is also how the trigram index answers LIKE. Use with ``fullmatch``.
+    """
+    parts = [".*" if char == "%" else "." if char == "_" else re.escape(char) for char in pattern]
+    return re.compile("".join(parts), re.IGNORECASE | re.ASCII | re.DOTALL)
+
+
+def like_substring_regex(text: str, separator: str = "\x00") -> Pattern:
+    """Compile the LIKE pattern ``%text%`` for searching many values joined into one string.
+
+    The values must be lowered with ``sql_lower`` and joined by ``separator``;
+    wildcards never cross a separator, so each match lies within one value.
+    Use with ``search``.
+    """
+    any_char = f"[^{re.escape(separator)}]"
+    parts = [any_char + "*" if char == "%" else any_char if char == "_" else re.escape(char) for char in sql_lower(text)]
+    return re.compile("".join(parts))
+
+
+class TextIndex:
+    """In-memory mirror of ``menu_items_fts``: prefix matching with bm25 ranks.
+
+    Rows are numbered in insertion order. Ranks are computed with the same
+    formula and operation order as FTS5's ``bm25()``, so results order the
+    same way as the SQLite index.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, array] = {}
+        self._sizes = array("I")
+        self._total_size = 0
+        self._folded: Dict[str, str] = {}
+        self._vocabulary: List[str] = []
+
+    def add(self, *columns: Optional[str]) -> None:
+        """Index the next row's column values."""
+        row = len(self._sizes)
+        size = 0
+        for text in columns:
+            if not text:
+                continue
+            for token in _TOKEN.findall(text):
+                folded = self._folded.get(token)
+                if folded is None:
+                    folded = self._folded[token] = fold_term(token)
+                postings = self._postings.get(folded)
+                if postings is None:
+                    postings = self._postings[folded] = array("I")
+                postings.append(row)
+                size += 1
+        self._sizes.append(size)
+        self._total_size += size
+
+    def freeze(self) -> None:
+        """Finish indexing; prefix lookups need the vocabulary in sorted order."""
+        self._vocabulary = sorted(self._postings)
+        self._folded = {}
+
+    def _prefix_hits(self, prefix: str) -> Counter:
+        hits: Counter = Counter()
+        vocabulary = self._vocabulary
+        index = bisect_left(vocabulary, prefix)
+        while index < len(vocabulary) and vocabulary[index].startswith(prefix):
+            hits.update(self._postings[vocabulary[index]])
+            index += 1
+        return hits
+
+    def rank(self, terms: List[str]) -> Dict[int, float]:
+        """Get the bm25 rank of every row matching all terms as prefixes; lower ranks are better."""
+        row_count = len(self._sizes)
+        if not terms or not row_count:
+            return {}
+
+        phrases = []
+        for term in terms:
+            hits = self._prefix_hits(fold_term(term))
+            if not hits:
+                return {}
+            phrases.append(hits)
+        matches = set(phrases[0])
+        for hits in phrases[1:]:
+            matches.intersection_update(hits)
+
+        average_size = self._total_size / row_count
+        idfs = []
+        for hits in phrases:
+            idf = math.log((row_count - len(hits) + 0.5) / (len(hits) + 0.5))
+            idfs.append(idf if idf > 0.0 else 1e-6)
+
+        # Rows with the same size and term frequencies share a score, so each is computed once
+        rows = list(matches)
+        signatures = list(zip(map(self._sizes.__getitem__, rows), *[map(hits.__getitem__, rows) for hits in phrases]))
+        scores = {}
+        for signature in set(signatures):
+            size = float(signature[0])
+            score = 0.0
+            for idf, frequency in zip(idfs, signature[1:]):
+                frequency = float(frequency)
+                score += idf * (
+                    (frequency * (BM25_K1 + 1.0)) /
+                    (frequency + BM25_K1 * (1 - BM25_B + BM25_B * size / average_size))
+                )
+            scores[signature] = -1.0 * score
+        return dict(zip(rows, map(scores.__getitem__, signatures)))
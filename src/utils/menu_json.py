@@ -0,0 +1,66 @@
+import json
+from typing import Any, Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional: encode_json_fast falls back to the standard library
+    orjson = None
+
+# Same output as FastAPI's JSONResponse, so pre-rendered and live responses are byte-identical
+_encode = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode
+
+
+def encode_json(value: Any) -> bytes:
+    """Serialize a value exactly as the API would."""
+    return _encode(value).encode()
+
+
+def encode_json_fast(value: Any) -> bytes:
+    """Serialize plain dicts, lists and scalars with orjson when it is installed, else as ``encode_json``.
+
+    orjson writes the same compact UTF-8 JSON, except that very large or small
+    floats use a shorter exponent form (``1e16`` rather than ``1e+16``).
+    """
+    if orjson is None:
+        return encode_json(value)
+    return orjson.dumps(value)
+
+
+class RenderedMenu(NamedTuple):
+    menu: bytes
+    sections: bytes
+    section_items: List[Tuple[str, bytes]]
+
+
+def render_menu(rows: Iterable[Tuple[Optional[int], Optional[str], Optional[str], Optional[str], Any]]) -> RenderedMenu:
+    """Render a restaurant's menu rows as JSON in one pass, without building dicts.
+
+    Rows are ``(section_id, section_name, item_name, description, price)`` in
+    menu order, as returned by ``RestaurantRepository.get_menu_rows``. Produces
+    the full menu object, the list of section names and each section's item
+    array.
+    """
+    section_names = []
+    section_items = []
+    items = []
+    current_section = None
+
+    def close_section():
+        section_items.append((section_names[-1], ("[" + ",".join(items) + "]").encode()))
+
+    for section_id, section_name, name, description, price in rows:
+        if section_id is None:
+            break
+        if section_id != current_section:
+            if current_section is not None:
+                close_section()
+            section_names.append(section_name)
+            items = []
+            current_section = section_id
+        if name is not None:
+            items.append(f'{{"name":{_encode(name)},"description":{_encode(description)},"price":{_encode(price)}}}')
+    if current_section is not None:
+        close_section()
+
+    menu = "{" + ",".join(f"{_encode(name)}:{body.decode()}" for name, body in section_items) + "}"
+    return RenderedMenu(menu.encode(), encode_json(section_names), section_items)
@@ -0,0 +1,179 @@
+import base64
+import binascii
+import json
+from bisect import bisect_left, bisect_right
+from itertools import chain, islice
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Sequence
+from sqlalchemy import and_, or_
+from src.core.exceptions import ValidationError
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str] = None
+
+
+class SortKey(NamedTuple):
+    """The expression a listing is ordered by, ahead of the ID tiebreak."""
+    expression: Any
+    descending: bool = False
+    nullable: bool = False
+
+
+def encode_cursor(scope: str, position: List[Any]) -> str:
+    """Encode the sort position of the last row on a page as an opaque token."""
+    payload = json.dumps({"s": scope, "k": position}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, scope: str, size: int) -> List[Any]:
+    """Decode a cursor token, rejecting tokens issued for a different listing or sort.
+
+    A valid position holds ``size`` JSON scalars: the ID alone, or the sort key then the ID.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        position = payload["k"]
+        valid = (
+            payload["s"] == scope and isinstance(position, list) and len(position) == size
+            and all(value is None or type(value) in (str, int, float) for value in position)
+        )
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        raise ValidationError("Invalid cursor", {"cursor": cursor})
+    return position
+
+
+def seek_condition(key, id_column, position: List[Any], descending: bool = False):
+    """Match rows strictly after ``position`` in ``(key, id)`` order, as one condition.
+
+    Suits keys without an index, such as FTS5 rank; ``keyset_page`` splits the
+    seek into index ranges instead.
+    """
+    value, last_id = position
+    if descending:
+        return and_(key <= value, or_(key < value, id_column < last_id))
+    return and_(key >= value, or_(key > value, id_column > last_id))
+
+
+def _page(rows: List[Any], limit: Optional[int], scope: str, position_of: Callable[[Any], List[Any]]) -> Page:
+    if limit is None or len(rows) <= limit:
+        return Page(rows)
+    rows = rows[:limit]
+    return Page(rows, encode_cursor(scope, position_of(rows[-1])))
+
+
+def keyset_page(
+    query,
+    id_column,
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    sort_key: Optional[SortKey] = None,
+    scope: str = ""
+) -> Page:
+    """Fetch one page of an ORM query ordered by ``sort_key`` then ID.
+
+    Pages seek past the previous page's last row instead of using OFFSET, so
+    every page costs the same. A continuation is read as up to three index
+    ranges in turn: the rest of the rows sharing the last key, the rows with
+    greater keys, then, for nullable keys, the NULL rows, which always sort
+    last. A ``limit`` of None returns every row as a single page.
+    """
+    position = decode_cursor(cursor, scope, 1 if sort_key is None else 2) if cursor else None
+    fetch = None if limit is None else limit + 1
+    descending = sort_key is not None and sort_key.descending
+    id_order = id_column.desc() if descending else id_column.asc()
+
+    def after_id(last_id):
+        return id_column < last_id if descending else id_column > last_id
+
+    if sort_key is None:
+        if position is not None:
+            query = query.filter(after_id(position[0]))
+        rows = query.order_by(id_order).limit(fetch).all()
+        return _page(rows, limit, scope, lambda row: [getattr(row, id_column.key)])
+
+    key = sort_key.expression
+    key_order = key.desc() if descending else key.asc()
+    query = query.add_columns(key)
+    if position is None:
+        if sort_key.nullable:
+            key_order = key_order.nulls_last()
+        segments = [query.order_by(key_order, id_order)]
+    else:
+        value, last_id = position
+        if value is None:
+            segments = [query.filter(key.is_(None), after_id(last_id)).order_by(id_order)]
+        else:
+            segments = [
+                query.filter(key == value, after_id(last_id)).order_by(id_order),
+                query.filter(key < value if descending else key > value).order_by(key_order, id_order),
+            ]
+            if sort_key.nullable:
+                segments.append(query.filter(key.is_(None)).order_by(id_order))
+
+    rows = []
+    for segment in segments:
+        rows += segment.limit(None if fetch is None else fetch - len(rows)).all()
+        if fetch is not None and len(rows) >= fetch:
+            break
+
+    page = _page(rows, limit, scope, lambda row: [row[1], getattr(row[0], id_column.key)])
+    return Page([row[0] for row in page.items], page.next_cursor)
+
+
+def _after(rows: Sequence[Any], target: Any, sort_of: Callable[[Any], Any], descending: bool) -> Iterable[Any]:
+    """Iterate ``rows``, sorted ascending by ``sort_of``, from just past ``target`` in the given direction."""
+    try:
+        if descending:
+            end = bisect_left(rows, target, key=sort_of)
+            return (rows[index] for index in range(end - 1, -1, -1))
+        return islice(rows, bisect_right(rows, target, key=sort_of), None)
+    except TypeError:
+        raise ValidationError("Invalid cursor", {"position": target})
+
+
+def ordered_page(
+    rows: Sequence[Any],
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    key: Optional[Callable[[Any], Any]] = None,
+    descending: bool = False,
+    unkeyed: Sequence[Any] = (),
+    predicate: Optional[Callable[[Any], bool]] = None,
+    scope: str = ""
+) -> Page:
+    """Page through in-memory rows the way ``keyset_page`` pages a query.
+
+    ``rows`` are sorted ascending by ``(key(row), row.id)``, or by ID alone
+    without a key, and ``unkeyed`` holds the rows whose key is None in ID
+    order. Descending pages read both backwards, with the unkeyed rows still
+    last. Cursors are interchangeable with those of ``keyset_page`` for the
+    same scope. ``predicate`` filters rows as they are read.
+    """
+    position = decode_cursor(cursor, scope, 1 if key is None else 2) if cursor else None
+    if key is None:
+        sort_of = lambda row: row.id
+        position_of = lambda row: [row.id]
+    else:
+        sort_of = lambda row: (key(row), row.id)
+        position_of = lambda row: [key(row), row.id]
+
+    if position is None:
+        segments = [reversed(rows), reversed(unkeyed)] if descending else [rows, unkeyed]
+    elif key is None:
+        segments = [_after(rows, position[0], sort_of, descending)]
+    else:
+        value, last_id = position
+        if value is None:
+            segments = [_after(unkeyed, last_id, lambda row: row.id, descending)]
+        else:
+            segments = [
+                _after(rows, (value, last_id), sort_of, descending),
+                reversed(unkeyed) if descending else unkeyed,
+            ]
+
+    selected = filter(predicate, chain.from_iterable(segments))
+    page_rows = list(selected if limit is None else islice(selected, limit + 1))
+    return _page(page_rows, limit, scope, position_of)
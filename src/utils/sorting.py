@@ -1,5 +1,11 @@
-from typing import List, Dict, Any, Optional
+import string
+from operator import attrgetter
+from typing import Any, Callable, Optional
 from enum import Enum
+from sqlalchemy import func
+from src.utils.pagination import SortKey
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
 
 
 class SortBy(str, Enum):
@@ -12,33 +18,30 @@ class Order(str, Enum):
     desc = "desc"
 
 
-def sort_menu_items(
-    items: List[Dict[str, Any]], 
-    sort_by: Optional[SortBy] = None, 
-    order: Order = Order.asc
-) -> List[Dict[str, Any]]:
-    """Sort menu items by name or price."""
-    if not sort_by:
-        return items
+def sort_key(name_column, price_column, sort_by: Optional[SortBy] = None, order: Order = Order.asc) -> Optional[SortKey]:
+    """Get the key for sorting menu items by name or price.
     
+    Names sort case-insensitively and items without a price always come last.
+    Both keys match an index, so ``LIMIT`` queries return the true top rows
+    from an index-ordered scan.
+    """
+    descending = order == Order.desc
     if sort_by == SortBy.name:
-        return sorted(
-            items, 
-            key=lambda x: x.get("name", "").lower(), 
-            reverse=(order == Order.desc)
-        )
-    elif sort_by == SortBy.price:
-        # Separate items with and without prices
-        items_with_price = [item for item in items if item.get("price") is not None]
-        items_without_price = [item for item in items if item.get("price") is None]
-        
-        # Sort items with prices
-        items_with_price.sort(
-            key=lambda x: x["price"], 
-            reverse=(order == Order.desc)
-        )
-        
-        # Return items with prices first, then items without prices
-        return items_with_price + items_without_price
-    
-    return items
\ No newline at end of file
+        return SortKey(func.lower(name_column), descending)
+    if sort_by == SortBy.price:
+        return SortKey(price_column, descending, nullable=True)
+    return None
+
+
+def sql_lower(value: str) -> str:
+    """Lowercase a string the way SQLite's lower() does, which only folds ASCII letters."""
+    return value.translate(_ASCII_LOWER)
+
+
+def sort_value(sort_by: Optional[SortBy] = None) -> Optional[Callable[[Any], Any]]:
+    """Get a function computing an in-memory item's value for ``sort_key``, or None for ID order."""
+    if sort_by == SortBy.name:
+        return lambda item: sql_lower(item.name)
+    if sort_by == SortBy.price:
+        return attrgetter("price")
+    return None
@@ -0,0 +1,36 @@
+from typing import Any, Iterable, Iterator
+from src.utils.menu_json import encode_json, encode_json_fast
+
+# Values serialized per chunk; large enough that per-chunk overhead does not dominate
+STREAM_BATCH_SIZE = 1000
+
+
+def iter_json_array(values: Iterable[Any], batch_size: int = STREAM_BATCH_SIZE) -> Iterator[bytes]:
+    """Serialize values as one JSON array, emitted in chunks as they are produced.
+
+    Values are encoded as ``encode_json`` does, so the array matches the bytes of a buffered response.
+    """
+    yield b"["
+    separator = b""
+    batch = []
+    for value in values:
+        batch.append(encode_json(value))
+        if len(batch) >= batch_size:
+            yield separator + b",".join(batch)
+            separator = b","
+            batch = []
+    if batch:
+        yield separator + b",".join(batch)
+    yield b"]"
+
+
+def iter_ndjson(values: Iterable[Any], batch_size: int = STREAM_BATCH_SIZE) -> Iterator[bytes]:
+    """Serialize values as newline-delimited JSON, one value per line, emitted in chunks."""
+    batch = []
+    for value in values:
+        batch.append(encode_json_fast(value))
+        if len(batch) >= batch_size:
+            yield b"\n".join(batch) + b"\n"
+            batch = []
+    if batch:
+        yield b"\n".join(batch) + b"\n"
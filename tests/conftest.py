@@ -2,7 +2,7 @@
 Shared test configuration and fixtures.
 """
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
 
@@ -32,12 +32,37 @@ def override_get_database_session():
 app.dependency_overrides[get_database_session] = override_get_database_session
 
 
+class QueryCounter:
+    """Count the SQL statements an engine executes inside a ``with`` block."""
+    
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+    
+    def _on_execute(self, *args):
+        self.count += 1
+    
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+    
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
 @pytest.fixture(scope="session")
 def test_client():
     """Create a test client for the FastAPI app."""
     return TestClient(app)
 
 
+@pytest.fixture
+def query_counter():
+    """Count the queries the API runs against the shared test database."""
+    return QueryCounter(engine)
+
+
 @pytest.fixture(scope="session")
 def test_db():
     """Create test database."""
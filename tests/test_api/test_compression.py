@@ -0,0 +1,94 @@
+"""
+Tests for response compression.
+"""
+import gzip
+import pytest
+from tests.conftest import TestingSessionLocal
+from src.api import middleware
+from src.api.middleware import compressed_payloads, negotiate_encoding
+from src.models.database import Restaurant, Section, MenuItem
+
+MENU_PATH = "/restaurants/Gzip Grill"
+GZIP = {"Accept-Encoding": "gzip"}
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+@pytest.fixture(scope="module")
+def setup_database(test_db):
+    """Set up a restaurant whose menu is well over the compression threshold."""
+    db = TestingSessionLocal()
+    try:
+        restaurant = Restaurant(name="Gzip Grill")
+        db.add(restaurant)
+        db.flush()
+        section = Section(name="Grill", restaurant_id=restaurant.id)
+        db.add(section)
+        db.flush()
+        db.add_all([
+            MenuItem(name=f"Skewer {i}", description="Chargrilled over oak", price=8.5, section_id=section.id)
+            for i in range(60)
+        ])
+        db.commit()
+    finally:
+        db.close()
+    compressed_payloads.clear()
+    
+    yield
+    
+    db = TestingSessionLocal()
+    try:
+        db.query(MenuItem).delete()
+        db.query(Section).delete()
+        db.query(Restaurant).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_negotiate_encoding(monkeypatch):
+    """Test Accept-Encoding negotiation with quality values and wildcards."""
+    monkeypatch.setattr(middleware, "brotli", None)
+    assert negotiate_encoding("gzip, deflate, br") == "gzip"
+    assert negotiate_encoding("*") == "gzip"
+    assert negotiate_encoding("GZIP;q=0.5") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("*;q=0, identity") is None
+    assert negotiate_encoding("") is None
+
+
+def test_large_response_is_gzipped(setup_database, test_client):
+    """Test that a large menu is gzipped when accepted and sent as is otherwise."""
+    plain = test_client.get(MENU_PATH, headers=IDENTITY)
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+    
+    response = test_client.get(MENU_PATH, headers=GZIP)
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.content == plain.content
+    assert int(response.headers["Content-Length"]) < len(plain.content) / 4
+    assert response.headers["ETag"] == "W/" + plain.headers["ETag"].removeprefix("W/")
+    
+    not_modified = test_client.get(MENU_PATH, headers={**GZIP, "If-None-Match": response.headers["ETag"]})
+    assert not_modified.status_code == 304
+
+
+def test_hot_payload_is_compressed_once(setup_database, test_client):
+    """Test that repeated responses reuse the cached compressed payload."""
+    compressed_payloads.clear()
+    first = test_client.get(MENU_PATH, headers=GZIP)
+    second = test_client.get(MENU_PATH, headers=GZIP)
+    assert second.content == first.content
+    assert (compressed_payloads.misses, compressed_payloads.hits) == (1, 1)
+
+
+def test_small_and_streamed_responses(setup_database, test_client):
+    """Test that small bodies are left alone and streamed bodies are compressed on the fly."""
+    sections = test_client.get(MENU_PATH + "/sections", headers=GZIP)
+    assert sections.json() == ["Grill"]
+    assert "Content-Encoding" not in sections.headers
+    
+    with test_client.stream("GET", "/restaurants", headers=GZIP) as streamed:
+        raw = b"".join(streamed.iter_raw())
+    assert streamed.headers["Content-Encoding"] == "gzip"
+    assert "Gzip Grill" in gzip.decompress(raw).decode()
@@ -0,0 +1,119 @@
+"""
+Tests for ETag, Last-Modified and Cache-Control handling on GET endpoints.
+"""
+from datetime import timedelta
+from email.utils import format_datetime
+import pytest
+from tests.conftest import TestingSessionLocal
+from src.api.middleware import SERVED_SINCE, response_etags
+from src.models.database import Restaurant, Section, MenuItem, engine_manager
+
+MENU_PATH = "/restaurants/Etag Bistro"
+
+
+@pytest.fixture(scope="module")
+def setup_database(test_db):
+    """Set up one small restaurant."""
+    db = TestingSessionLocal()
+    try:
+        restaurant = Restaurant(name="Etag Bistro")
+        db.add(restaurant)
+        db.flush()
+        section = Section(name="Mains", restaurant_id=restaurant.id)
+        db.add(section)
+        db.flush()
+        db.add(MenuItem(name="Steak", description="Grilled", price=25.0, section_id=section.id))
+        db.commit()
+    finally:
+        db.close()
+    
+    yield
+    
+    db = TestingSessionLocal()
+    try:
+        db.query(MenuItem).delete()
+        db.query(Section).delete()
+        db.query(Restaurant).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def built_at(setup_database, monkeypatch):
+    """Pretend the serving database was stamped by a build."""
+    built_at = SERVED_SINCE + timedelta(hours=1)
+    monkeypatch.setattr(engine_manager, "generation", "build-1")
+    monkeypatch.setattr(engine_manager, "built_at", built_at)
+    response_etags.clear()
+    yield built_at
+    response_etags.clear()
+
+
+def test_etag_revalidation(setup_database, test_client):
+    """Test that a matching If-None-Match gets an empty 304 and anything else the full menu."""
+    response = test_client.get(MENU_PATH)
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+    assert "Last-Modified" not in response.headers
+    
+    strong = etag.removeprefix("W/")
+    for if_none_match in [etag, f'"other", W/{strong}', strong, "*"]:
+        not_modified = test_client.get(MENU_PATH, headers={"If-None-Match": if_none_match})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["ETag"] == etag
+    
+    changed = test_client.get(MENU_PATH, headers={"If-None-Match": '"other"'})
+    assert (changed.status_code, changed.content) == (200, response.content)
+
+
+def test_known_etag_skips_endpoint(built_at, test_client, query_counter):
+    """Test that once an ETag is known for the generation, revalidations run no queries."""
+    etag = test_client.get(MENU_PATH).headers["ETag"]
+    with query_counter:
+        response = test_client.get(MENU_PATH, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert query_counter.count == 0
+    
+    engine_manager.generation = "build-2"
+    with query_counter:
+        response = test_client.get(MENU_PATH, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert query_counter.count > 0
+
+
+def test_if_modified_since(built_at, test_client):
+    """Test that Last-Modified is the build time and If-Modified-Since is honoured."""
+    last_modified = format_datetime(built_at.replace(microsecond=0), usegmt=True)
+    assert test_client.get(MENU_PATH).headers["Last-Modified"] == last_modified
+    
+    response = test_client.get(MENU_PATH, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+    assert response.headers["Last-Modified"] == last_modified
+    
+    # Without a known ETag, only a 200 from the endpoint can become a 304
+    response_etags.clear()
+    response = test_client.get(MENU_PATH, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+    later = format_datetime(built_at + timedelta(days=1), usegmt=True)
+    for path in ["/restaurants/Nope Nope Nope", "/export/items", "/restaurants"]:
+        response = test_client.get(path, headers={"If-Modified-Since": later})
+        assert response.status_code != 304, path
+    
+    earlier = format_datetime(built_at - timedelta(days=1), usegmt=True)
+    assert test_client.get(MENU_PATH, headers={"If-Modified-Since": earlier}).status_code == 200
+    assert test_client.get(MENU_PATH, headers={"If-Modified-Since": "yesterday"}).status_code == 200
+
+
+def test_responses_without_etag(setup_database, test_client):
+    """Test that streamed, failed and process-level responses carry no ETag."""
+    streamed = test_client.get("/restaurants")
+    assert "ETag" not in streamed.headers
+    assert streamed.headers["Cache-Control"] == "public, max-age=60"
+    
+    assert "ETag" not in test_client.get("/restaurants/Nowhere Grill Xyz").headers
+    
+    stats = test_client.get("/stats/cache")
+    assert "ETag" not in stats.headers
+    assert stats.headers["Cache-Control"] == "no-store"
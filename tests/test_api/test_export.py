@@ -0,0 +1,53 @@
+"""
+Tests for the NDJSON export endpoint.
+"""
+import json
+import pytest
+from tests.conftest import TestingSessionLocal
+from src.models.database import Restaurant, Section, MenuItem
+
+
+@pytest.fixture(scope="module")
+def setup_database(test_db):
+    """Set up two restaurants, one without items."""
+    db = TestingSessionLocal()
+    try:
+        cafe = Restaurant(name="Export Café")
+        empty = Restaurant(name="Empty Kitchen")
+        db.add_all([cafe, empty])
+        db.flush()
+        section = Section(name="Pastries", restaurant_id=cafe.id)
+        db.add(section)
+        db.flush()
+        db.add_all([
+            MenuItem(name="Croissant", description="Buttery", price=3.5, section_id=section.id),
+            MenuItem(name="Pain au chocolat", description=None, price=None, section_id=section.id),
+        ])
+        db.commit()
+    finally:
+        db.close()
+    
+    yield
+    
+    db = TestingSessionLocal()
+    try:
+        db.query(MenuItem).delete()
+        db.query(Section).delete()
+        db.query(Restaurant).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_export_items(setup_database, test_client):
+    """Test that every item is streamed as one JSON object per line."""
+    response = test_client.get("/export/items")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.text.endswith("\n")
+    
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows == [
+        {"restaurant": "Export Café", "section": "Pastries", "name": "Croissant", "description": "Buttery", "price": 3.5},
+        {"restaurant": "Export Café", "section": "Pastries", "name": "Pain au chocolat", "description": None, "price": None},
+    ]
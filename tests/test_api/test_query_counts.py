@@ -0,0 +1,86 @@
+"""
+Tests that endpoints run a fixed number of queries regardless of result size.
+"""
+import pytest
+from tests.conftest import TestingSessionLocal
+from src.models.database import Restaurant, Section, MenuItem
+
+
+ENDPOINTS = [
+    "/restaurants",
+    "/restaurants/Query Restaurant",
+    "/restaurants/Query Restaurant/sections",
+    "/restaurants/Query Restaurant/sections/Section 0",
+    "/restaurants/Query Restaurant/items",
+    "/search/items?query=dish",
+    "/search/items?restaurant=Query Restaurant",
+    "/search/by-price-range?min_price=0&max_price=100",
+    "/search/restaurants-with-item?item_name=dish",
+    "/stats/restaurant/Query Restaurant",
+]
+
+# Generous upper bound; the point is that it does not grow with the data
+MAX_QUERIES = 5
+
+
+def add_menu(section_count: int, items_per_section: int):
+    """Add sections and items to the test restaurant."""
+    db = TestingSessionLocal()
+    try:
+        restaurant = db.query(Restaurant).filter(Restaurant.name == "Query Restaurant").first()
+        if restaurant is None:
+            restaurant = Restaurant(name="Query Restaurant")
+            db.add(restaurant)
+            db.flush()
+        offset = db.query(Section).filter(Section.restaurant_id == restaurant.id).count()
+        for s in range(offset, offset + section_count):
+            section = Section(name=f"Section {s}", restaurant_id=restaurant.id)
+            db.add(section)
+            db.flush()
+            db.add_all([
+                MenuItem(name=f"Dish {s}-{i}", description="House dish", price=5.0 + i, section_id=section.id)
+                for i in range(items_per_section)
+            ])
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def setup_database(test_db):
+    """Start from an empty database and clean up afterwards."""
+    def clear():
+        db = TestingSessionLocal()
+        try:
+            db.query(MenuItem).delete()
+            db.query(Section).delete()
+            db.query(Restaurant).delete()
+            db.commit()
+        finally:
+            db.close()
+
+    clear()
+    yield
+    clear()
+
+
+def count_queries(test_client, query_counter):
+    counts = {}
+    for url in ENDPOINTS:
+        with query_counter:
+            response = test_client.get(url)
+        assert response.status_code == 200, url
+        counts[url] = query_counter.count
+    return counts
+
+
+def test_query_count_independent_of_rows(setup_database, test_client, query_counter):
+    """Test that every endpoint runs the same small number of queries as the menu grows."""
+    add_menu(section_count=2, items_per_section=2)
+    small = count_queries(test_client, query_counter)
+
+    add_menu(section_count=20, items_per_section=10)
+    large = count_queries(test_client, query_counter)
+
+    assert large == small
+    assert max(large.values()) <= MAX_QUERIES
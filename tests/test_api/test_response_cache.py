@@ -0,0 +1,89 @@
+"""
+Tests for the response cache in front of the search and stats endpoints.
+"""
+import pytest
+from tests.conftest import TestingSessionLocal
+from src.api.middleware import response_cache
+from src.models.database import Restaurant, Section, MenuItem, engine_manager
+
+
+@pytest.fixture(scope="module")
+def setup_database(test_db):
+    """Set up one small restaurant."""
+    db = TestingSessionLocal()
+    try:
+        restaurant = Restaurant(name="Cache Cafe")
+        db.add(restaurant)
+        db.flush()
+        section = Section(name="Drinks", restaurant_id=restaurant.id)
+        db.add(section)
+        db.flush()
+        db.add_all([
+            MenuItem(name=f"Tea {i}", description="Hot tea", price=2.0 + i, section_id=section.id)
+            for i in range(3)
+        ])
+        db.commit()
+    finally:
+        db.close()
+    
+    yield
+    
+    db = TestingSessionLocal()
+    try:
+        db.query(MenuItem).delete()
+        db.query(Section).delete()
+        db.query(Restaurant).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def stamped(setup_database, monkeypatch):
+    """Pretend the serving database was stamped by a build, starting from an empty cache."""
+    monkeypatch.setattr(engine_manager, "generation", "build-1")
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+
+def test_repeated_query_skips_database(stamped, test_client, query_counter):
+    """Test that a repeated query, with parameters in any order, is answered from the cache."""
+    first = test_client.get("/search/items?query=tea&sort_by=price&limit=2")
+    assert first.headers["X-Cache"] == "MISS"
+    
+    with query_counter:
+        second = test_client.get("/search/items?limit=2&sort_by=price&query=tea")
+    assert query_counter.count == 0
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.content == first.content
+    assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+    
+    stats = test_client.get("/stats/cache").json()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+
+def test_errors_are_not_cached(stamped, test_client):
+    """Test that only successful responses are stored."""
+    for _ in range(2):
+        response = test_client.get("/stats/restaurant/Nowhere At All")
+        assert response.status_code == 404
+        assert response.headers["X-Cache"] == "MISS"
+    assert test_client.get("/stats/cache").json()["size"] == 0
+
+
+def test_new_generation_invalidates(stamped, test_client, monkeypatch):
+    """Test that a new build generation empties the cache."""
+    test_client.get("/stats/restaurant/Cache Cafe")
+    assert test_client.get("/stats/restaurant/Cache Cafe").headers["X-Cache"] == "HIT"
+    
+    monkeypatch.setattr(engine_manager, "generation", "build-2")
+    assert test_client.get("/stats/restaurant/Cache Cafe").headers["X-Cache"] == "MISS"
+
+
+def test_unstamped_database_is_not_cached(setup_database, test_client):
+    """Test that databases without a generation are always read."""
+    assert engine_manager.generation is None
+    response = test_client.get("/search/items?query=tea")
+    assert response.status_code == 200
+    assert "X-Cache" not in response.headers
@@ -2,8 +2,11 @@
 Tests for restaurant API endpoints.
 """
 import pytest
-from tests.conftest import TestingSessionLocal
+from tests.conftest import TestingSessionLocal, engine
+from src.core.config import settings
 from src.models.database import Restaurant, Section, MenuItem
+from src.repositories.memory_repository import load_snapshot, snapshot_manager
+from src.utils.menu_json import encode_json
 
 
 @pytest.fixture(scope="module")
@@ -59,6 +62,36 @@ def test_get_restaurants(setup_database, test_client):
     assert "Test Restaurant" in data
 
 
+def test_get_restaurants_lists_all_and_pages(setup_database, test_client):
+    """Test that the listing streams every restaurant and pages on request."""
+    db = TestingSessionLocal()
+    try:
+        db.add_all([Restaurant(name=f"Extra Restaurant {i}") for i in range(250)])
+        db.add(Restaurant(name="Extra Restaurant Café"))
+        db.commit()
+        
+        response = test_client.get("/restaurants")
+        assert response.status_code == 200
+        assert len(response.json()) == 252
+        # Streamed names are encoded like every other response, without \u escapes
+        assert response.content == encode_json(response.json())
+        
+        names = []
+        params = {"limit": 100}
+        while True:
+            response = test_client.get("/restaurants", params=params)
+            assert len(response.json()) <= 100
+            names.extend(response.json())
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["X-Next-Cursor"]
+        assert len(names) == len(set(names)) == 252
+    finally:
+        db.query(Restaurant).filter(Restaurant.name.like("Extra Restaurant %")).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
 def test_get_restaurant_menu(setup_database, test_client):
     """Test getting restaurant menu."""
     response = test_client.get("/restaurants/Test Restaurant")
@@ -96,12 +129,79 @@ def test_get_restaurant_items(setup_database, test_client):
     assert len(data) == 2
 
 
+def test_sparse_fields(setup_database, test_client):
+    """Test that fields narrows the items of menus, sections and item listings."""
+    response = test_client.get("/restaurants/Test Restaurant?fields=name,price")
+    assert response.status_code == 200
+    assert response.json() == {
+        "Test Section": [{"name": "Test Item 1", "price": 10.99}, {"name": "Test Item 2", "price": 15.5}]
+    }
+    
+    response = test_client.get("/restaurants/Test Restaurant/sections/Test Section?fields=description")
+    assert response.json() == [{"description": "Description 1"}, {"description": "Description 2"}]
+    
+    response = test_client.get("/restaurants/Test Restaurant/items?sort_by=price&order=desc&fields=price")
+    assert response.json() == [{"price": 15.5}, {"price": 10.99}]
+    
+    # Asking for every field is the same as asking for none
+    full = test_client.get("/restaurants/Test Restaurant")
+    assert test_client.get("/restaurants/Test Restaurant?fields=price,description,name").content == full.content
+    
+    response = test_client.get("/restaurants/Test Restaurant?fields=section")
+    assert response.status_code == 400
+
+
+def test_memory_backend_serves_same_responses(setup_database, test_client, monkeypatch):
+    """Test that the memory backend answers every endpoint exactly as SQLite does."""
+    paths = [
+        "/restaurants",
+        "/restaurants/Test Restaurant",
+        "/restaurants/Test Restaurant/sections/Test Section",
+        "/restaurants/Test Restaurant/items?sort_by=price&order=desc",
+        "/restaurants/Test Restaurant?fields=price",
+        "/restaurants/Test Restaurant/sections/Test Section?fields=name,description",
+        "/restaurants/Test Restaurant/items?fields=section,price",
+        "/search/items?query=item&fields=restaurant,name",
+        "/search/items?query=item",
+        "/search/by-price-range?min_price=0&max_price=12",
+        "/search/restaurants-with-item?item_name=test",
+        "/stats/restaurant/Test Restaurant",
+        "/restaurants/Nonexistent Restaurant",
+    ]
+    expected = [test_client.get(path) for path in paths]
+    
+    monkeypatch.setattr(settings, "backend", "memory")
+    monkeypatch.setattr(snapshot_manager, "get_snapshot", lambda: load_snapshot(engine))
+    for path, sqlite_response in zip(paths, expected):
+        response = test_client.get(path)
+        assert (response.status_code, response.content) == (sqlite_response.status_code, sqlite_response.content)
+
+
 def test_get_nonexistent_restaurant(test_client):
     """Test getting nonexistent restaurant."""
     response = test_client.get("/restaurants/Nonexistent Restaurant")
     assert response.status_code == 404
 
 
+def test_loosely_written_restaurant_name(setup_database, test_client):
+    """Test that near-miss names resolve to the closest restaurant, or 404 with suggestions."""
+    expected = test_client.get("/restaurants/Test Restaurant")
+    for path in ["/restaurants/test restaurant", "/restaurants/TEST"]:
+        response = test_client.get(path)
+        assert response.status_code == 200
+        assert response.content == expected.content
+        assert response.headers["X-Resolved-Restaurant"] == "Test%20Restaurant"
+    assert "X-Resolved-Restaurant" not in expected.headers
+    
+    response = test_client.get("/restaurants/tset/items?sort_by=price")
+    assert response.status_code == 404
+    assert response.json()["detail"]["suggestions"] == []
+    
+    response = test_client.get("/restaurants/Test Restaurnt/sections")
+    assert response.status_code == 404
+    assert response.json()["detail"]["suggestions"] == ["Test Restaurant"]
+
+
 def test_root_endpoint(test_client):
     """Test root endpoint."""
     response = test_client.get("/")
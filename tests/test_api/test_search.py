@@ -1,9 +1,13 @@
 """
 Tests for search API endpoints.
 """
+import base64
+import json
 import pytest
 from tests.conftest import TestingSessionLocal
+from src.core.config import settings
 from src.models.database import Restaurant, Section, MenuItem
+from src.utils.pagination import encode_cursor
 
 
 @pytest.fixture(scope="module")
@@ -138,4 +142,105 @@ def test_search_no_results(setup_database, test_client):
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
-    assert len(data) == 0
\ No newline at end of file
+    assert len(data) == 0
+
+def test_search_items_cursor_pagination(setup_database, test_client):
+    """Test paging through search results with the next-page cursor header."""
+    names = []
+    response = test_client.get("/search/items?sort_by=price&limit=4")
+    names.extend(item["name"] for item in response.json())
+    cursor = response.headers["X-Next-Cursor"]
+    
+    response = test_client.get(f"/search/items?sort_by=price&limit=4&cursor={cursor}")
+    assert response.status_code == 200
+    assert "X-Next-Cursor" not in response.headers
+    names.extend(item["name"] for item in response.json())
+    
+    assert len(names) == len(set(names)) == 6
+
+
+def test_search_items_filtered_text_query_pagination(setup_database, test_client):
+    """Test paging a relevance-ordered text search narrowed by price and restaurant filters."""
+    for params in ["query=burger&price_lt=50", "query=pizza&restaurant=Pizza Place", "query=classic&price_gt=1"]:
+        expected = [item["name"] for item in test_client.get(f"/search/items?{params}").json()]
+        names = []
+        response = test_client.get(f"/search/items?{params}&limit=1")
+        while True:
+            assert response.status_code == 200, params
+            names.extend(item["name"] for item in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            response = test_client.get(f"/search/items?{params}&limit=1&cursor={cursor}")
+        assert names == expected and len(names) == 2, params
+
+
+def test_search_items_invalid_cursor(setup_database, test_client):
+    """Test that a malformed cursor is rejected."""
+    response = test_client.get("/search/items?cursor=bogus")
+    assert response.status_code == 400
+
+
+def test_search_items_malformed_cursor_positions(setup_database, test_client):
+    """Test that cursors with the wrong number or kind of position values are rejected."""
+    for params, positions in [
+        ("sort_by=price&limit=1", [[1], [], ["a", "b", "c"], [[1], 2], [{"p": 1}, 2]]),
+        ("limit=1", [[], [1, 2], [[1]]]),
+    ]:
+        cursor = test_client.get(f"/search/items?{params}").headers["X-Next-Cursor"]
+        scope = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))["s"]
+        for position in positions:
+            response = test_client.get(f"/search/items?{params}&cursor={encode_cursor(scope, position)}")
+            assert response.status_code == 400, position
+
+
+def test_suggest(setup_database, test_client):
+    """Test type-ahead completions across restaurant, section and item names."""
+    response = test_client.get("/search/suggest?prefix=pi")
+    assert response.status_code == 200
+    assert response.json() == [
+        {"text": "Pizza Place", "type": "restaurant"},
+        {"text": "Pizzas", "type": "section"},
+    ]
+
+    response = test_client.get("/search/suggest?prefix=C&limit=1")
+    assert response.json() == [{"text": "Cheese Burger", "type": "item"}]
+
+    response = test_client.get("/search/suggest?prefix=")
+    assert response.status_code == 422
+
+
+def test_fast_json_matches_response_models(setup_database, test_client, monkeypatch):
+    """Test that the fast serialization path returns the same bytes and cursors."""
+    paths = [
+        "/search/items?sort_by=price&limit=2",
+        "/search/items?query=burger",
+        "/search/by-price-range?min_price=5&max_price=15&limit=3",
+        "/restaurants/Burger Joint/items?sort_by=name&limit=2",
+        "/restaurants/burger joint/items",
+    ]
+    expected = [test_client.get(path) for path in paths]
+    
+    monkeypatch.setattr(settings, "fast_json", True)
+    for path, model_response in zip(paths, expected):
+        response = test_client.get(path)
+        assert response.status_code == 200
+        assert response.content == model_response.content
+        for header in ["X-Next-Cursor", "X-Resolved-Restaurant"]:
+            assert response.headers.get(header) == model_response.headers.get(header)
+
+
+def test_search_items_sparse_fields(setup_database, test_client):
+    """Test that fields narrows each item to the requested keys, in their usual order."""
+    full = test_client.get("/search/items?query=burger&sort_by=price").json()
+    response = test_client.get("/search/items?query=burger&sort_by=price&fields=price,name")
+    assert response.status_code == 200
+    assert response.json() == [{"name": item["name"], "price": item["price"]} for item in full]
+
+    full = test_client.get("/search/by-price-range?min_price=5&max_price=15").json()
+    response = test_client.get("/search/by-price-range?min_price=5&max_price=15&fields=restaurant")
+    assert response.json() == [{"restaurant": item["restaurant"]} for item in full]
+
+    response = test_client.get("/search/items?fields=name,calories")
+    assert response.status_code == 400
+    assert response.json()["detail"]["field"] == "fields"
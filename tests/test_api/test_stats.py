@@ -2,40 +2,13 @@
 Tests for statistics API endpoints.
 """
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-from main import app
-from src.models.database import Base, Restaurant, Section, MenuItem
-from src.api.dependencies import get_database_session
-
-
-# Test database setup
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test_stats_api.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-def override_get_db():
-    """Override database dependency for testing."""
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
-
-
-app.dependency_overrides[get_database_session] = override_get_db
-
-client = TestClient(app)
+from tests.conftest import TestingSessionLocal
+from src.models.database import Restaurant, Section, MenuItem
 
 
 @pytest.fixture(scope="module")
-def setup_database():
+def setup_database(test_db):
     """Set up test database with sample data."""
-    Base.metadata.create_all(bind=engine)
-    
     # Add sample data
     db = TestingSessionLocal()
     try:
@@ -66,12 +39,19 @@ def setup_database():
     yield
     
     # Cleanup
-    Base.metadata.drop_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        db.query(MenuItem).delete()
+        db.query(Section).delete()
+        db.query(Restaurant).delete()
+        db.commit()
+    finally:
+        db.close()
 
 
-def test_get_restaurant_stats(setup_database):
+def test_get_restaurant_stats(setup_database, test_client):
     """Test getting restaurant statistics."""
-    response = client.get("/stats/restaurant/Stats Restaurant")
+    response = test_client.get("/stats/restaurant/Stats Restaurant")
     assert response.status_code == 200
     data = response.json()
     
@@ -85,10 +65,18 @@ def test_get_restaurant_stats(setup_database):
     assert data["average_price"] == round((8.99 + 12.99 + 28.99 + 24.99) / 4, 2)
 
 
-def test_get_restaurant_stats_not_found(setup_database):
+def test_get_restaurant_stats_not_found(setup_database, test_client):
     """Test getting stats for nonexistent restaurant."""
-    response = client.get("/stats/restaurant/Nonexistent Restaurant")
+    response = test_client.get("/stats/restaurant/Nonexistent Restaurant")
     assert response.status_code == 404
     data = response.json()
     assert "error" in data["detail"]
-    assert "not found" in data["detail"]["message"].lower()
\ No newline at end of file
+    assert "not found" in data["detail"]["message"].lower()
+
+
+def test_get_restaurant_stats_loose_name(setup_database, test_client):
+    """Test that stats resolve a loosely written restaurant name."""
+    response = test_client.get("/stats/restaurant/stats")
+    assert response.status_code == 200
+    assert response.json()["restaurant"] == "Stats Restaurant"
+    assert response.headers["X-Resolved-Restaurant"] == "Stats%20Restaurant"
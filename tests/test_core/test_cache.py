@@ -0,0 +1,46 @@
+"""
+Tests for the generation-scoped LRU response cache.
+"""
+from src.core import cache as cache_module
+from src.core.cache import ResponseCache
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first."""
+    cache = ResponseCache(max_size=2)
+    assert cache.get("a", "g1") is None
+    cache.put("a", 1, "g1")
+    cache.put("b", 2, "g1")
+    assert cache.get("a", "g1") == 1
+    cache.put("c", 3, "g1")
+    assert cache.get("b", "g1") is None
+    assert (cache.get("a", "g1"), cache.get("c", "g1")) == (1, 3)
+    assert cache.stats() == {
+        "generation": "g1", "size": 2, "max_size": 2, "ttl": None,
+        "hits": 3, "misses": 2, "evictions": 1, "hit_rate": 0.6,
+    }
+
+
+def test_ttl_expiry(monkeypatch):
+    """Test that entries older than the time to live are treated as misses."""
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(max_size=10, ttl=5)
+    cache.get("a", "g1")
+    cache.put("a", 1, "g1")
+    now[0] += 5
+    assert cache.get("a", "g1") == 1
+    now[0] += 1
+    assert cache.get("a", "g1") is None
+    assert len(cache) == 0
+
+
+def test_generation_change_invalidates():
+    """Test that a new generation empties the cache and stale values are not stored."""
+    cache = ResponseCache(max_size=10)
+    cache.get("a", "g1")
+    cache.put("a", 1, "g1")
+    assert cache.get("a", "g2") is None
+    cache.put("a", 1, "g1")
+    assert cache.get("a", "g2") is None
+    assert cache.generation == "g2"
@@ -0,0 +1,61 @@
+"""
+Tests for single-flight call coalescing.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+from src.core.singleflight import SingleFlight
+
+
+def run_concurrently(flight, key, function, callers=8):
+    """Start callers that all join the same flight while its leader is still running."""
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def leader_work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return function()
+
+    with ThreadPoolExecutor(callers) as pool:
+        futures = [pool.submit(flight.do, key, leader_work)]
+        started.wait(5)
+        futures += [pool.submit(flight.do, key, leader_work) for _ in range(callers - 1)]
+        while flight.shared < callers - 1:
+            time.sleep(0.001)
+        release.set()
+    return calls, futures
+
+
+def test_concurrent_calls_share_one_result():
+    """Test that callers arriving during a call get its result without running it again."""
+    flight = SingleFlight()
+    result = ["menu"]
+    calls, futures = run_concurrently(flight, "key", lambda: result)
+    assert len(calls) == 1
+    assert all(future.result() is result for future in futures)
+    assert flight.do("key", lambda: "again") == "again"
+
+
+def test_concurrent_calls_share_one_error():
+    """Test that an exception reaches every waiting caller."""
+    def fail():
+        raise LookupError("gone")
+
+    flight = SingleFlight()
+    calls, futures = run_concurrently(flight, "key", fail)
+    assert len(calls) == 1
+    for future in futures:
+        with pytest.raises(LookupError):
+            future.result()
+
+
+def test_different_keys_run_separately():
+    """Test that only calls with the same key are coalesced."""
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.shared == 0
@@ -0,0 +1,152 @@
+"""
+Tests for incremental database rebuilds.
+"""
+import copy
+import json
+import pytest
+from sqlalchemy import create_engine, select, text, update
+from sqlalchemy.orm import sessionmaker
+
+from cli import build_database
+from src.core.config import settings
+from src.ingest.incremental import incremental_load, supports_incremental
+from src.ingest.loader import bulk_load
+from src.ingest.normalize import normalize_restaurant
+from src.ingest.swap import finalize_build
+from src.models.database import Base, BuildMeta, Restaurant, Section, MenuItem
+
+
+# Test database setup
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_ingest_incremental.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+MENU_DATA = {
+    "Pizza Place": {
+        "sections": [
+            {"name": "Pizzas", "items": [{"name": "Margherita", "price": 14.99}]},
+            {"name": "Drinks", "items": [{"name": "Soda", "price": 2}]},
+            {"name": "Desserts", "items": [{"name": "Tiramisu", "price": 7}]}
+        ]
+    },
+    "Burger Joint": {"sections": [{"name": "Burgers", "items": [{"name": "Cheese Burger", "price": 12}]}]},
+    "Taco Stand": {"sections": [{"name": "Tacos", "items": [{"name": "Al Pastor", "price": 3.5}]}]}
+}
+
+
+def records(menu_data):
+    return [normalize_restaurant(name, data) for name, data in menu_data.items()]
+
+
+def snapshot():
+    """Return the full menu content of the test database."""
+    db = TestingSessionLocal()
+    try:
+        return {
+            restaurant.name: [
+                (section.name, [(item.name, item.price) for item in section.items])
+                for section in sorted(restaurant.sections, key=lambda s: s.id)
+            ]
+            for restaurant in db.query(Restaurant).all()
+        }
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def loaded_db():
+    """Create tables holding the baseline menu data."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    bulk_load(engine, records(MENU_DATA))
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_incremental_no_changes(loaded_db):
+    """Test that unchanged input writes nothing."""
+    stats = incremental_load(engine, records(MENU_DATA))
+
+    assert stats["unchanged"] == 3
+    assert stats["inserted"] == stats["updated"] == stats["deleted"] == 0
+    assert stats["rows"] == 0
+
+
+def test_incremental_applies_diff(loaded_db):
+    """Test insert, update and delete produce the same content as a full build."""
+    changed = copy.deepcopy(MENU_DATA)
+    changed["Pizza Place"]["sections"][1]["items"][0]["price"] = 2.5
+    del changed["Taco Stand"]
+    changed["Noodle Bar"] = {"sections": [{"name": "Noodles", "items": [{"name": "Ramen", "price": 13}]}]}
+
+    db = TestingSessionLocal()
+    pizza_id = db.query(Restaurant.id).filter(Restaurant.name == "Pizza Place").scalar()
+    first_section_id = db.query(Section.id).filter(Section.name == "Pizzas").scalar()
+    db.close()
+
+    stats = incremental_load(engine, records(changed))
+
+    assert stats["inserted"] == 1
+    assert stats["updated"] == 1
+    assert stats["deleted"] == 1
+    assert stats["unchanged"] == 1
+    # Only the changed section and the ones after it are rewritten
+    assert stats["sections"] == 3
+
+    expected = {
+        name: [(s["name"], [(i["name"], i["price"]) for i in s["items"]]) for s in record["sections"]]
+        for name, record in ((r["name"], r) for r in records(changed))
+    }
+    assert snapshot() == expected
+
+    db = TestingSessionLocal()
+    try:
+        assert db.query(Restaurant.id).filter(Restaurant.name == "Pizza Place").scalar() == pizza_id
+        assert db.query(Section.id).filter(Section.name == "Pizzas").scalar() == first_section_id
+        assert db.query(MenuItem).filter(MenuItem.name == "Al Pastor").count() == 0
+        assert db.query(Section).filter(Section.name == "Tacos").count() == 0
+        # The full-text index follows the diff through its triggers
+        fts_matches = "SELECT count(*) FROM menu_items_fts WHERE menu_items_fts MATCH :term"
+        assert db.execute(text(fts_matches), {"term": "pastor"}).scalar() == 0
+        assert db.execute(text(fts_matches), {"term": "ramen"}).scalar() == 1
+    finally:
+        db.close()
+
+
+def test_supports_incremental(loaded_db):
+    """Test that only databases stamped with the current schema version are diffed."""
+    assert not supports_incremental(engine)
+
+    finalize_build(engine)
+    assert supports_incremental(engine)
+
+    with engine.begin() as connection:
+        connection.execute(update(BuildMeta).where(BuildMeta.key == "schema_version").values(value="1"))
+    assert not supports_incremental(engine)
+
+
+def test_incremental_build_falls_back_to_full_rebuild(tmp_path, monkeypatch):
+    """Test that an incremental build over an outdated database rebuilds it from scratch."""
+    source = tmp_path / "menus.json"
+    source.write_text(json.dumps(MENU_DATA))
+    target = tmp_path / "menu_data.db"
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{target}")
+
+    build_database(str(source))
+    live = create_engine(f"sqlite:///{target}")
+    try:
+        with live.begin() as connection:
+            connection.execute(update(BuildMeta).where(BuildMeta.key == "schema_version").values(value="1"))
+    finally:
+        live.dispose()
+
+    build_database(str(source), incremental=True)
+    live = create_engine(f"sqlite:///{target}")
+    try:
+        assert supports_incremental(live)
+        with live.connect() as connection:
+            names = connection.execute(select(Restaurant.name).order_by(Restaurant.name)).scalars().all()
+        assert names == sorted(MENU_DATA)
+    finally:
+        live.dispose()
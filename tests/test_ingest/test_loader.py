@@ -0,0 +1,109 @@
+"""
+Tests for the bulk import engine.
+"""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from src.ingest.loader import bulk_load
+from src.ingest.normalize import normalize_price, normalize_restaurant
+from src.models.database import Base, Restaurant, Section, MenuItem
+
+
+# Test database setup
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_ingest_loader.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+MENU_DATA = {
+    "Pizza Place": {
+        "sections": [
+            {
+                "name": "Pizzas",
+                "items": [
+                    {"name": "Margherita", "description": "Mozzarella and basil", "price": 14.99},
+                    {"name": "Special", "price": "MKT"}
+                ]
+            },
+            {"name": "Drinks", "items": [{"name": "Soda", "price": "2"}]}
+        ]
+    },
+    "Burger Joint": {
+        "sections": [{"name": "Burgers", "items": [{"name": "Cheese Burger", "price": 12}]}]
+    }
+}
+
+
+@pytest.fixture
+def fresh_db():
+    """Create empty tables for each test."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_normalize_price():
+    """Test price normalization."""
+    assert normalize_price(12) == 12.0
+    assert normalize_price("7.5") == 7.5
+    assert normalize_price("MKT") is None
+    assert normalize_price(None) is None
+
+
+def test_bulk_load_counts(fresh_db):
+    """Test that bulk load inserts every row and reports throughput."""
+    records = [normalize_restaurant(name, data) for name, data in MENU_DATA.items()]
+    stats = bulk_load(engine, records, batch_size=2, defer_indexes=True)
+
+    assert stats["restaurants"] == 2
+    assert stats["sections"] == 3
+    assert stats["items"] == 4
+    assert stats["rows"] == 9
+    assert stats["rows_per_second"] > 0
+
+    # Derived search indexes are rebuilt once at the end of a deferred load
+    with engine.connect() as connection:
+        matches = connection.execute(
+            text("SELECT rowid FROM menu_items_fts WHERE menu_items_fts MATCH 'mozzarella'")
+        ).all()
+        burger_restaurants = connection.execute(
+            text("SELECT restaurant_id FROM menu_item_trigrams WHERE name LIKE '%burg%'")
+        ).scalars().all()
+    assert len(matches) == 1
+    assert len(burger_restaurants) == 1
+
+
+def test_bulk_load_links_parents(fresh_db):
+    """Test that client-side IDs link items to the right sections and restaurants."""
+    records = [normalize_restaurant(name, data) for name, data in MENU_DATA.items()]
+    bulk_load(engine, records, batch_size=2)
+
+    db = TestingSessionLocal()
+    try:
+        restaurant = db.query(Restaurant).filter(Restaurant.name == "Pizza Place").first()
+        sections = {section.name: section for section in restaurant.sections}
+        assert set(sections) == {"Pizzas", "Drinks"}
+        assert [item.name for item in sections["Pizzas"].items] == ["Margherita", "Special"]
+        assert sections["Pizzas"].items[1].price is None
+        assert sections["Drinks"].items[0].price == 2.0
+    finally:
+        db.close()
+
+
+def test_bulk_load_appends_after_existing_rows(fresh_db):
+    """Test that IDs continue after rows already in the database."""
+    records = [normalize_restaurant(name, data) for name, data in MENU_DATA.items()]
+    bulk_load(engine, records[:1])
+    bulk_load(engine, records[1:])
+
+    db = TestingSessionLocal()
+    try:
+        assert db.query(Restaurant).count() == 2
+        assert db.query(Section).count() == 3
+        assert db.query(MenuItem).count() == 4
+        burger = db.query(MenuItem).filter(MenuItem.name == "Cheese Burger").first()
+        assert burger.section.restaurant.name == "Burger Joint"
+    finally:
+        db.close()
@@ -0,0 +1,101 @@
+"""
+Tests for the streaming menu reader.
+"""
+import io
+import json
+import pytest
+
+from src.ingest.reader import iter_restaurants, load_restaurants
+from src.core.exceptions import ValidationError
+
+
+MENU_DATA = {
+    "Pizza Place": {
+        "sections": [
+            {
+                "name": "Pizzas",
+                "items": [
+                    {"name": "Margherita", "description": 'Mozzarella, basil & "oil"', "price": 14.99},
+                    {"name": "Special", "price": "MKT"}
+                ]
+            }
+        ]
+    },
+    "Burger Joint": {"sections": [{"name": "Burgers", "items": [{"name": "Cheese Burger", "price": 12}]}]},
+    "Empty": {}
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+def test_iter_restaurants_matches_json_load(chunk_size):
+    """Test that streaming yields the same restaurants as json.load for any chunk size."""
+    text = json.dumps(MENU_DATA, indent=2)
+    result = list(iter_restaurants(io.StringIO(text), chunk_size=chunk_size))
+
+    assert result == list(MENU_DATA.items())
+
+
+def test_iter_restaurants_number_across_chunks():
+    """Test that a top-level number split across chunks is not truncated."""
+    result = list(iter_restaurants(io.StringIO('{"a": 12345}'), chunk_size=8))
+
+    assert result == [("a", 12345)]
+
+
+def test_iter_restaurants_empty_object():
+    """Test streaming an empty mapping."""
+    assert list(iter_restaurants(io.StringIO(" { } "))) == []
+
+
+@pytest.mark.parametrize("text", ['[]', '{"a": {}', '{"a": {}} {}', '{"a" {}}', '{1: {}}'])
+def test_iter_restaurants_invalid_json(text):
+    """Test that malformed input raises a JSON decode error."""
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_restaurants(io.StringIO(text), chunk_size=4))
+
+
+class CountingReader(io.StringIO):
+    """A text stream that counts the characters read from it."""
+
+    def __init__(self, text: str):
+        super().__init__(text)
+        self.chars_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.chars_read += len(chunk)
+        return chunk
+
+
+def test_iter_restaurants_early_syntax_error():
+    """Test that a malformed record fails without reading the rest of the file."""
+    tail = json.dumps({f"Restaurant {i}": {"sections": []} for i in range(10000)})[1:]
+    for record in ['{"sections": [}', '{"sections": [] "x": 1}', '{"name": "a\x01b"}']:
+        fp = CountingReader('{"Broken": ' + record + ", " + tail)
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_restaurants(fp, chunk_size=64))
+        assert fp.chars_read <= 128, record
+
+
+def test_iter_restaurants_long_string_across_chunks():
+    """Test that a string spanning many chunks is read to its end."""
+    description = "x" * 1000
+    text = json.dumps({"a": {"description": description}})
+    assert list(iter_restaurants(io.StringIO(text), chunk_size=8)) == [("a", {"description": description})]
+
+
+@pytest.mark.parametrize("read", [iter_restaurants, load_restaurants])
+def test_duplicate_name(read):
+    """Test that duplicate restaurant names are rejected whether or not the file is streamed."""
+    with pytest.raises(ValidationError):
+        list(read(io.StringIO('{"a": {}, "a": {}}')))
+    # Repeated keys inside a restaurant are not restaurant names
+    assert list(read(io.StringIO('{"a": {"x": 1, "x": 2}, "b": {"a": {}}}'))) == [("a", {"x": 2}), ("b", {"a": {}})]
+
+
+def test_load_restaurants_matches_json_load():
+    """Test that loading the whole file yields the same restaurants as streaming it."""
+    text = json.dumps(MENU_DATA)
+    assert load_restaurants(io.StringIO(text)) == list(iter_restaurants(io.StringIO(text)))
+    with pytest.raises(json.JSONDecodeError):
+        load_restaurants(io.StringIO("[]"))
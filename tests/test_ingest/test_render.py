@@ -0,0 +1,107 @@
+"""
+Tests for menu JSON pre-rendered at build time.
+"""
+import json
+import pytest
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.orm import sessionmaker
+
+from src.ingest.incremental import incremental_load
+from src.ingest.loader import bulk_load
+from src.ingest.normalize import normalize_restaurant
+from src.ingest.render import render_menus
+from src.models.database import Base, MenuDocument, SectionDocument
+from src.services.restaurant_service import RestaurantService
+
+
+# Test database setup
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_ingest_render.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+MENU_DATA = {
+    "Pizza Place": {
+        "sections": [
+            {
+                "name": "Pizzas",
+                "items": [
+                    {"name": "Margherita", "description": "Mozzarella \"fior di latte\"", "price": 14.99},
+                    {"name": "Special", "price": "MKT"}
+                ]
+            },
+            {"name": "Empty", "items": []},
+            {"name": "Drinks", "items": [{"name": "Café", "price": "2"}]}
+        ]
+    },
+    "Burger Joint": {"sections": [{"name": "Burgers", "items": [{"name": "Cheese Burger", "price": 12}]}]}
+}
+
+
+def records(menu_data):
+    return [normalize_restaurant(name, data) for name, data in menu_data.items()]
+
+
+@pytest.fixture
+def fresh_db():
+    """Create empty tables for each test."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def live_responses(service, restaurant, sections):
+    """Render a restaurant's responses from the menu tables, bypassing stored documents."""
+    with engine.begin() as connection:
+        connection.execute(delete(SectionDocument))
+        connection.execute(delete(MenuDocument))
+    return (
+        service.get_restaurant_menu_json(restaurant),
+        service.get_restaurant_sections_json(restaurant),
+        [service.get_section_items_json(restaurant, section) for section in sections],
+    )
+
+
+def test_rendered_documents_match_live_responses(fresh_db):
+    """Test that stored documents are byte-identical to live-rendered responses."""
+    bulk_load(engine, records(MENU_DATA), defer_indexes=True)
+    assert render_menus(engine) == {"rendered": 2, "removed": 0}
+
+    db = TestingSessionLocal()
+    try:
+        service = RestaurantService(db)
+        sections = ["Pizzas", "Empty", "Drinks"]
+        rendered = (
+            service.get_restaurant_menu_json("Pizza Place"),
+            service.get_restaurant_sections_json("Pizza Place"),
+            [service.get_section_items_json("Pizza Place", section) for section in sections],
+        )
+        assert json.loads(rendered[0])["Drinks"] == [{"name": "Café", "description": None, "price": 2.0}]
+        assert json.loads(rendered[1]) == sections
+        db.expire_all()
+        assert live_responses(service, "Pizza Place", sections) == rendered
+    finally:
+        db.close()
+
+
+def test_incremental_build_rerenders_only_changes(fresh_db):
+    """Test that only changed restaurants are re-rendered and removed ones are dropped."""
+    bulk_load(engine, records(MENU_DATA), defer_indexes=True)
+    render_menus(engine)
+
+    changed = {"Pizza Place": MENU_DATA["Pizza Place"], "Taco Stand": {"sections": []}}
+    changed["Pizza Place"] = {"sections": [{"name": "Pizzas", "items": [{"name": "Marinara", "price": 11}]}]}
+    incremental_load(engine, records(changed))
+    assert render_menus(engine) == {"rendered": 2, "removed": 1}
+    assert render_menus(engine) == {"rendered": 0, "removed": 0}
+
+    with engine.connect() as connection:
+        menus = dict(connection.execute(select(MenuDocument.restaurant_name, MenuDocument.menu)).all())
+        sections = connection.execute(select(SectionDocument.restaurant_name, SectionDocument.section_name)).all()
+    assert set(menus) == {"Pizza Place", "Taco Stand"}
+    assert json.loads(menus["Pizza Place"]) == {
+        "Pizzas": [{"name": "Marinara", "description": None, "price": 11.0}]
+    }
+    assert json.loads(menus["Taco Stand"]) == {}
+    assert sections == [("Pizza Place", "Pizzas")]
@@ -0,0 +1,66 @@
+"""
+Tests for multi-file menu sources.
+"""
+import json
+import pytest
+
+from src.ingest.sources import is_multi_file_source, iter_parsed, parse_file, resolve_sources
+from src.core.exceptions import ValidationError
+
+
+@pytest.fixture
+def menu_dir(tmp_path):
+    """Create a directory mixing per-restaurant JSON and NDJSON files."""
+    (tmp_path / "acre.json").write_text(json.dumps({
+        "sections": [{"name": "Mains", "items": [{"name": "Steak", "price": "32"}, {"name": "Fish", "price": "MKT"}]}]
+    }))
+    (tmp_path / "more.ndjson").write_text("\n".join([
+        json.dumps({"name": "Pizza Place", "sections": [{"name": "Pizzas", "items": [{"name": "Margherita"}]}]}),
+        "",
+        json.dumps({"Burger Joint": {"sections": []}}),
+    ]))
+    (tmp_path / "notes.txt").write_text("ignored")
+    return tmp_path
+
+
+def test_resolve_sources(menu_dir):
+    """Test directory and glob expansion."""
+    assert is_multi_file_source(str(menu_dir))
+    assert is_multi_file_source(str(menu_dir / "*.json"))
+    assert [p.split("/")[-1] for p in resolve_sources(str(menu_dir))] == ["acre.json", "more.ndjson"]
+    assert [p.split("/")[-1] for p in resolve_sources(str(menu_dir / "*.json"))] == ["acre.json"]
+
+
+def test_parse_file_normalizes(menu_dir):
+    """Test that a per-restaurant file is named after the file and prices are normalized."""
+    records = parse_file(str(menu_dir / "acre.json"))
+
+    assert len(records) == 1
+    assert records[0]["name"] == "acre"
+    assert [item["price"] for item in records[0]["sections"][0]["items"]] == [32.0, None]
+    assert records[0]["content_hash"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_iter_parsed(menu_dir, workers):
+    """Test that serial and pooled parsing yield the same records in file order."""
+    records = list(iter_parsed(resolve_sources(str(menu_dir)), workers=workers))
+
+    assert [record["name"] for record in records] == ["acre", "Pizza Place", "Burger Joint"]
+
+
+def test_iter_parsed_rejects_duplicates(menu_dir):
+    """Test that a restaurant defined in two files is rejected."""
+    (menu_dir / "zz.ndjson").write_text(json.dumps({"acre": {"sections": []}}))
+
+    with pytest.raises(ValidationError):
+        list(iter_parsed(resolve_sources(str(menu_dir)), workers=1))
+
+
+def test_parse_file_rejects_malformed(tmp_path):
+    """Test validation of malformed menu files."""
+    path = tmp_path / "bad.json"
+    path.write_text(json.dumps({"Bad": {"sections": [{"name": "Mains", "items": "Steak"}]}}))
+
+    with pytest.raises(ValidationError, match="bad.json"):
+        parse_file(str(path))
@@ -0,0 +1,68 @@
+"""
+Tests for atomic build-and-swap of the database file.
+"""
+import os
+import pytest
+from sqlalchemy import text
+
+from src.ingest.loader import bulk_load
+from src.ingest.normalize import normalize_restaurant
+from src.ingest.swap import staged_build
+from src.models.database import EngineManager, create_tables, read_generation
+
+
+def build(target_path, menu_data):
+    with staged_build(target_path) as staged:
+        create_tables(staged.engine)
+        bulk_load(staged.engine, [normalize_restaurant(name, data) for name, data in menu_data.items()])
+    return staged.generation
+
+
+def restaurant_names(engine):
+    with engine.connect() as connection:
+        return [row[0] for row in connection.execute(text("SELECT name FROM restaurants ORDER BY id"))]
+
+
+@pytest.fixture
+def target_path(tmp_path):
+    return str(tmp_path / "menu_data.db")
+
+
+def test_staged_build_stamps_generation(target_path):
+    """Test that a build is swapped into place with a generation stamp."""
+    generation = build(target_path, {"Pizza Place": {"sections": []}})
+
+    assert os.path.exists(target_path)
+    assert not os.path.exists(f"{target_path}.build-{os.getpid()}")
+    manager = EngineManager(f"sqlite:///{target_path}")
+    assert manager.generation == generation
+    assert restaurant_names(manager.get_engine()) == ["Pizza Place"]
+
+
+def test_failed_build_leaves_live_database(target_path):
+    """Test that an error during a build keeps the previous database in place."""
+    generation = build(target_path, {"Pizza Place": {"sections": []}})
+
+    with pytest.raises(RuntimeError):
+        with staged_build(target_path) as staged:
+            create_tables(staged.engine)
+            raise RuntimeError("source went away")
+
+    assert not os.path.exists(f"{target_path}.build-{os.getpid()}")
+    manager = EngineManager(f"sqlite:///{target_path}")
+    assert read_generation(manager.get_engine()) == generation
+
+
+def test_engine_manager_reopens_after_swap(target_path):
+    """Test that a serving engine picks up a newly swapped-in build."""
+    build(target_path, {"Pizza Place": {"sections": []}})
+    manager = EngineManager(f"sqlite:///{target_path}", check_interval=0)
+    old_engine = manager.get_engine()
+    assert restaurant_names(old_engine) == ["Pizza Place"]
+
+    generation = build(target_path, {"Burger Joint": {"sections": []}})
+
+    new_engine = manager.get_engine()
+    assert new_engine is not old_engine
+    assert manager.generation == generation
+    assert restaurant_names(new_engine) == ["Burger Joint"]
@@ -0,0 +1,199 @@
+"""
+Tests for the in-memory snapshot repository, checked against the SQLite repository.
+"""
+import json
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.ingest.loader import bulk_load
+from src.ingest.normalize import normalize_restaurant
+from src.repositories.memory_repository import MemoryRestaurantRepository, load_snapshot, load_snapshot_file
+from src.repositories.restaurant_repository import RestaurantRepository
+from src.services.restaurant_service import RestaurantService
+from src.models.database import Base
+from src.utils.pagination import encode_cursor
+from src.utils.sorting import SortBy, Order
+from src.core.exceptions import NotFoundError, ValidationError
+
+
+# Test database setup
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_memory_repo.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+MENU_DATA = {
+    "Pizza Place": {
+        "sections": [
+            {
+                "name": "Pizzas",
+                "items": [
+                    {"name": "Margherita", "description": "Tomato and mozzarella", "price": 14.99},
+                    {"name": "pepperoni", "description": "Spicy pepperoni pizza", "price": 16.5},
+                    {"name": "Chicken Pizza", "description": "Grilled chicken, chicken sauce", "price": 16.5},
+                    {"name": "Special", "description": "Ask your server", "price": "MKT"}
+                ]
+            },
+            {"name": "Empty", "items": []},
+            {"name": "Pizzas", "items": [{"name": "Calzone", "price": 12}]}
+        ]
+    },
+    "Burger Joint": {
+        "sections": [
+            {
+                "name": "Burgers",
+                "items": [
+                    {"name": "Chicken Burger", "description": "Crispy chicken", "price": 11},
+                    {"name": "Crème Brûlée Burger", "description": "Café special_100%", "price": 13},
+                    {"name": "Zucchini Fries", "price": None}
+                ]
+            }
+        ]
+    },
+    "Taco Stand": {}
+}
+
+
+def as_rows(items):
+    return [
+        (item.id, item.name, item.description, item.price, item.section_name, item.restaurant_name)
+        for item in items
+    ]
+
+
+@pytest.fixture(scope="module")
+def repositories():
+    """Load the menu into the database and snapshot it."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    bulk_load(engine, [normalize_restaurant(name, data) for name, data in MENU_DATA.items()])
+    session = TestingSessionLocal()
+    yield RestaurantRepository(session), MemoryRestaurantRepository(load_snapshot(engine))
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+QUERIES = [
+    {},
+    {"query_text": "chicken"},
+    {"query_text": "chick pizza"},
+    {"query_text": "creme"},
+    {"query_text": "%"},
+    {"query_text": "_1"},
+    {"query_text": "chicken", "sort_by": SortBy.price, "order": Order.desc},
+    {"query_text": "chicken", "order": Order.desc},
+    {"sort_by": SortBy.name},
+    {"sort_by": SortBy.price},
+    {"sort_by": SortBy.price, "order": Order.desc},
+    {"price_gt": 12, "price_lt": 16.5},
+    {"restaurant_name": "Pizza Place", "sort_by": SortBy.name, "order": Order.desc},
+    {"query_text": "pizza", "restaurant_name": "Pizza Place"},
+]
+
+
+@pytest.mark.parametrize("params", QUERIES)
+def test_search_pages_match_sqlite(repositories, params):
+    """Test that every page and cursor of a search matches the SQLite repository."""
+    sql, memory = repositories
+    cursor = None
+    while True:
+        expected = sql.search_items_page(limit=2, cursor=cursor, **params)
+        page = memory.search_items_page(limit=2, cursor=cursor, **params)
+        assert as_rows(page.items) == as_rows(expected.items)
+        assert page.next_cursor == expected.next_cursor
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+
+@pytest.mark.parametrize("sort_by", [None, SortBy.name, SortBy.price])
+@pytest.mark.parametrize("order", list(Order))
+def test_restaurant_items_match_sqlite(repositories, sort_by, order):
+    """Test restaurant item listings with every sort, with and without filters."""
+    sql, memory = repositories
+    for price_gt, price_lt in [(None, None), (12, None), (None, 16.5)]:
+        args = ("Pizza Place", price_gt, price_lt, sort_by, order)
+        assert as_rows(memory.get_restaurant_items(*args)) == as_rows(sql.get_restaurant_items(*args))
+
+    first = sql.get_restaurant_items_page("Pizza Place", None, None, sort_by, order, limit=2)
+    rest = memory.get_restaurant_items_page("Pizza Place", None, None, sort_by, order, 10, first.next_cursor)
+    expected = sql.get_restaurant_items_page("Pizza Place", None, None, sort_by, order, 10, first.next_cursor)
+    assert as_rows(rest.items) == as_rows(expected.items)
+
+
+def test_reads_match_sqlite(repositories):
+    """Test names, menus, sections, price ranges, item lookups and stats."""
+    sql, memory = repositories
+    assert list(memory.iter_names()) == list(sql.iter_names())
+    assert list(memory.iter_items(batch_size=2)) == [tuple(row) for row in sql.iter_items(batch_size=2)]
+    assert memory.get_names_page(2) == sql.get_names_page(2)
+    for name in ["Pizza Place", "Taco Stand", "Nowhere"]:
+        assert memory.get_menu_rows(name) == [tuple(row) for row in sql.get_menu_rows(name)]
+    assert [(item.id, item.name) for item in memory.get_section_by_name("Pizza Place", "Pizzas").items] == [
+        (item.id, item.name) for item in sql.get_section_by_name("Pizza Place", "Pizzas").items
+    ]
+
+    expected = sql.get_items_by_price_range_page(11, 16.5, 3)
+    page = memory.get_items_by_price_range_page(11, 16.5, 3)
+    assert (as_rows(page.items), page.next_cursor) == (as_rows(expected.items), expected.next_cursor)
+    assert as_rows(memory.get_items_by_price_range_page(11, 16.5, 3, page.next_cursor).items) == as_rows(
+        sql.get_items_by_price_range_page(11, 16.5, 3, page.next_cursor).items
+    )
+
+    for item_name in ["chicken", "CRÈME", "crème", "_ries", "burger%", "nothing"]:
+        assert [r.name for r in memory.get_restaurants_with_item(item_name)] == [
+            r.name for r in sql.get_restaurants_with_item(item_name)
+        ]
+
+    for name in ["Pizza Place", "Burger Joint", "Taco Stand"]:
+        assert memory.get_restaurant_stats(name) == sql.get_restaurant_stats(name)
+    with pytest.raises(NotFoundError):
+        memory.get_restaurant_stats("Nowhere")
+
+
+def test_rendered_json_matches_sqlite(repositories):
+    """Test that menus rendered from the snapshot are byte-identical to the SQLite responses."""
+    sql, memory = repositories
+    sql_service, memory_service = RestaurantService(repository=sql), RestaurantService(repository=memory)
+    for name in ["Pizza Place", "Burger Joint", "Taco Stand"]:
+        assert memory_service.get_restaurant_menu_json(name) == sql_service.get_restaurant_menu_json(name)
+        assert memory_service.get_restaurant_sections_json(name) == sql_service.get_restaurant_sections_json(name)
+    assert memory_service.get_section_items_json("Pizza Place", "Pizzas") == (
+        sql_service.get_section_items_json("Pizza Place", "Pizzas")
+    )
+    with pytest.raises(NotFoundError):
+        memory_service.get_section_items_json("Pizza Place", "Desserts")
+
+
+def test_invalid_cursor(repositories):
+    """Test that cursors from another listing, or with the wrong value types, are rejected."""
+    _, memory = repositories
+    cursor = memory.search_items_page(sort_by=SortBy.price, limit=1).next_cursor
+    with pytest.raises(ValidationError):
+        memory.search_items_page(sort_by=SortBy.name, limit=1, cursor=cursor)
+
+    with pytest.raises(ValidationError):
+        memory.search_items_page(sort_by=SortBy.price, limit=1, cursor=encode_cursor("items:price:asc", ["cheap", 1]))
+
+    scope = "items:price:asc"
+    for position in [[1], [], ["a", "b", "c"], [[1], 2], ["cheap", 1]]:
+        with pytest.raises(ValidationError):
+            memory.search_items_page(sort_by=SortBy.price, limit=1, cursor=encode_cursor(scope, position))
+    for position in [[], [1, 2], [[1]]]:
+        with pytest.raises(ValidationError):
+            memory.search_items_page(limit=1, cursor=encode_cursor("items:id:asc", position))
+    for position in [[1], [], [[1], 2]]:
+        with pytest.raises(ValidationError):
+            memory.get_items_by_price_range_page(0, 100, 1, encode_cursor("price", position))
+
+
+def test_snapshot_from_json_file(repositories, tmp_path):
+    """Test that a snapshot read from JSON numbers rows exactly as a fresh build does."""
+    _, memory = repositories
+    path = tmp_path / "menus.json"
+    path.write_text(json.dumps(MENU_DATA))
+
+    from_file = MemoryRestaurantRepository(load_snapshot_file(str(path)))
+    assert as_rows(from_file.search_items_page(limit=None).items) == as_rows(memory.search_items_page(limit=None).items)
+    assert from_file.get_menu_rows("Pizza Place") == memory.get_menu_rows("Pizza Place")
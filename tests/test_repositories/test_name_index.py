@@ -0,0 +1,33 @@
+"""
+Tests for the fuzzy restaurant name index.
+"""
+from src.repositories.name_index import NameMatch, RestaurantNameIndex, name_key
+
+NAMES = ["acre", "bao_toan_kitchen_and_bar.", "Pizza Place", "Pizza Palace", "Café Luna", "CAFE LUNA!"]
+
+
+def test_name_key_normalization():
+    """Test that keys ignore case, accents, punctuation and filler words."""
+    assert name_key("bao_toan_kitchen_and_bar.") == "bao toan kitchen bar"
+    assert name_key("Bao Toan Kitchen & Bar") == "bao toan kitchen bar"
+    assert name_key("Acre Restaurant") == "acre"
+    assert name_key("The Restaurant") == "the restaurant"
+
+
+def test_match_resolves_normalized_names_and_typos():
+    """Test resolution through the normalized form and through trigram similarity."""
+    index = RestaurantNameIndex(NAMES)
+    assert index.match("Acre").name == "acre"
+    assert index.match("acre restaurant").name == "acre"
+    assert index.match("Bao Toan Kitchen & Bar").name == "bao_toan_kitchen_and_bar."
+    assert index.match("bao toan kitchen").name == "bao_toan_kitchen_and_bar."
+    assert index.match("pizza plaace").name == "Pizza Place"
+
+
+def test_match_suggests_when_ambiguous_or_distant():
+    """Test that close calls and shared normalized forms return suggestions instead of a guess."""
+    index = RestaurantNameIndex(NAMES)
+    assert index.match("pizza") == NameMatch(None, ["Pizza Place", "Pizza Palace"])
+    assert index.match("pizza", limit=1).suggestions == ["Pizza Place"]
+    assert index.match("cafe luna") == NameMatch(None, ["Café Luna", "CAFE LUNA!"])
+    assert index.match("sushi bar") == NameMatch(None, [])
@@ -0,0 +1,105 @@
+"""
+Tests for the in-process price index.
+"""
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.ingest.loader import bulk_load
+from src.ingest.normalize import normalize_restaurant
+from src.repositories.generation_cache import GenerationCache
+from src.repositories.price_index import PriceIndex
+from src.repositories.restaurant_repository import RestaurantRepository
+from src.models.database import Base
+from src.utils.sorting import SortBy, Order
+from src.core.exceptions import ValidationError
+
+
+# Test database setup
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_price_index.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+PRICES = [9.5, None, 12, 12, 3.25, 20, 12, None, 7, 15.75, 12, 9.5]
+
+
+@pytest.fixture(scope="module")
+def setup_test_db():
+    """Load one restaurant whose items have repeated and missing prices."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    items = [{"name": f"Item {i}", "price": price} for i, price in enumerate(PRICES)]
+    bulk_load(engine, [normalize_restaurant("Diner", {"sections": [{"name": "All", "items": items}]})])
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def repositories(setup_test_db, monkeypatch):
+    """A plain SQL repository and one that reads ranges from the price index."""
+    index = PriceIndex.load(engine)
+    session = TestingSessionLocal()
+    indexed = RestaurantRepository(session)
+    monkeypatch.setattr(indexed, "_price_index", lambda: index)
+    yield RestaurantRepository(session), indexed
+    session.close()
+
+
+def read_all(fetch):
+    """Follow cursors to the end, collecting item IDs and the cursors issued."""
+    ids, cursors, cursor = [], [], None
+    while True:
+        page = fetch(cursor)
+        ids += [item.id for item in page.items]
+        cursors.append(page.next_cursor)
+        cursor = page.next_cursor
+        if cursor is None:
+            return ids, cursors
+
+
+def test_seek_matches_sorted_scan():
+    """Test ranges, bounds and seeks against a brute-force scan."""
+    pairs = sorted((price, item_id) for item_id, price in enumerate(PRICES, start=1) if price is not None)
+    index = PriceIndex(np.array([p for p, _ in pairs]), np.array([i for _, i in pairs]))
+
+    assert index.seek(9.5, 12) == [pair for pair in pairs if 9.5 <= pair[0] <= 12]
+    assert index.seek(9.5, 12, False, False) == [pair for pair in pairs if 9.5 < pair[0] < 12]
+    assert index.seek(high=12, descending=True, limit=3) == [pair for pair in reversed(pairs) if pair[0] <= 12][:3]
+    assert index.seek(after=[12.0, 4]) == [pair for pair in pairs if pair > (12.0, 4)]
+    assert index.seek(after=[12.0, 4], descending=True) == [pair for pair in reversed(pairs) if pair < (12.0, 4)]
+    assert index.seek(100) == []
+    with pytest.raises(ValidationError):
+        index.seek(after=["cheap", 1])
+
+
+def test_price_range_pages_match_sql(repositories):
+    """Test that indexed price-range pages, cursors included, match the SQL results."""
+    sql, indexed = repositories
+    for low, high in [(0, 100), (9.5, 12), (12, 12), (13, 14)]:
+        expected = read_all(lambda cursor: sql.get_items_by_price_range_page(low, high, 2, cursor))
+        assert read_all(lambda cursor: indexed.get_items_by_price_range_page(low, high, 2, cursor)) == expected
+
+
+@pytest.mark.parametrize("order", list(Order))
+@pytest.mark.parametrize("price_gt, price_lt", [(9.5, None), (None, 12), (3.25, 15.75)])
+def test_price_sorted_search_matches_sql(repositories, order, price_gt, price_lt):
+    """Test price-sorted searches bounded by price filters in both directions."""
+    sql, indexed = repositories
+
+    def fetch(repository):
+        return lambda cursor: repository.search_items_page(
+            price_gt=price_gt, price_lt=price_lt, sort_by=SortBy.price, order=order, limit=2, cursor=cursor
+        )
+
+    assert read_all(fetch(indexed)) == read_all(fetch(sql))
+
+
+def test_cache_rebuilds_per_generation(setup_test_db):
+    """Test that the cached index is reused within a generation and rebuilt for a new one."""
+    cache = GenerationCache("price index", PriceIndex.load)
+    assert cache.get(engine, None) is None
+    first = cache.get(engine, "a")
+    assert cache.get(engine, "a") is first
+    assert cache.get(engine, "b") is not first
+    assert len(first) == len([price for price in PRICES if price is not None])
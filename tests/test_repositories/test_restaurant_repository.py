@@ -3,11 +3,13 @@ Tests for restaurant repository.
 """
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.orm import sessionmaker
 
 from src.repositories.restaurant_repository import RestaurantRepository
 from src.models.database import Base, Restaurant, Section, MenuItem
-from src.core.exceptions import NotFoundError
+from src.utils.sorting import SortBy, Order
+from src.core.exceptions import NotFoundError, ValidationError
 
 
 # Test database setup
@@ -108,6 +110,26 @@ def test_get_restaurant_items(db_session):
     assert len(items) == 4
 
 
+def test_item_fields_limit_columns_read(db_session):
+    """Test that item fields narrow the columns loaded from the database."""
+    repo = RestaurantRepository(db_session)
+    items = repo.get_restaurant_items_page("Test Restaurant", sort_by=SortBy.price, fields=["name", "price"]).items
+    assert [(item.name, item.price) for item in items] == [
+        ("Salad", 8.50), ("Wings", 12.99), ("Steak", 25.00), ("Special", None)
+    ]
+    with pytest.raises(InvalidRequestError):
+        items[0].description
+    
+    db_session.expunge_all()
+    items = repo.search_items_page("steak", fields=["restaurant"]).items
+    assert [item.restaurant_name for item in items] == ["Test Restaurant"]
+    with pytest.raises(InvalidRequestError):
+        items[0].name
+    
+    rows = repo.get_menu_rows("Test Restaurant", fields=["price"])
+    assert [row[3] for row in rows] == [12.99, 8.50, 25.00, None]
+
+
 def test_get_restaurant_items_with_price_filter(db_session):
     """Test getting restaurant items with price filtering."""
     repo = RestaurantRepository(db_session)
@@ -119,6 +141,31 @@ def test_get_restaurant_items_with_price_filter(db_session):
     assert len(filtered_items) >= 1
 
 
+def test_flat_items_follow_writes(db_session):
+    """Test that the denormalized item table tracks inserts, renames and deletes."""
+    repo = RestaurantRepository(db_session)
+    
+    items = repo.get_restaurant_items("Test Restaurant", price_gt=20)
+    assert [(item.name, item.section_name, item.restaurant_name) for item in items] == [
+        ("Steak", "Main Courses", "Test Restaurant")
+    ]
+    
+    restaurant = repo.get_by_name("Test Restaurant")
+    restaurant.name = "Renamed Restaurant"
+    db_session.flush()
+    section = repo.get_section_by_name("Renamed Restaurant", "Appetizers")
+    section.name = "Starters"
+    db_session.add(MenuItem(name="Nachos", price=9.0, section_id=section.id))
+    db_session.query(MenuItem).filter(MenuItem.name == "Salad").delete()
+    db_session.commit()
+    
+    assert repo.get_restaurant_items("Test Restaurant") == []
+    items = repo.get_restaurant_items("Renamed Restaurant", price_lt=15)
+    assert sorted((item.name, item.section_name) for item in items) == [
+        ("Nachos", "Starters"), ("Wings", "Starters")
+    ]
+
+
 def test_search_items_across_restaurants(db_session):
     """Test searching items across all restaurants."""
     repo = RestaurantRepository(db_session)
@@ -129,6 +176,15 @@ def test_search_items_across_restaurants(db_session):
     assert any("wings" in item.name.lower() for item in items)
 
 
+def test_search_items_prefix_and_multi_term(db_session):
+    """Test full-text search with prefix terms and several terms."""
+    repo = RestaurantRepository(db_session)
+    
+    assert [item.name for item in repo.search_items_across_restaurants(query_text="wing")] == ["Wings"]
+    assert [item.name for item in repo.search_items_across_restaurants(query_text="grill steak")] == ["Steak"]
+    assert repo.search_items_across_restaurants(query_text="grilled wings") == []
+
+
 def test_get_items_by_price_range(db_session):
     """Test getting items by price range."""
     repo = RestaurantRepository(db_session)
@@ -149,6 +205,20 @@ def test_get_restaurants_with_item(db_session):
     assert any(r.name == "Test Restaurant" for r in restaurants)
 
 
+def test_get_restaurants_with_item_substring(db_session):
+    """Test that item lookups match case-insensitive substrings, including short ones."""
+    repo = RestaurantRepository(db_session)
+    
+    assert [r.name for r in repo.get_restaurants_with_item("TEA")] == ["Test Restaurant"]
+    assert [r.name for r in repo.get_restaurants_with_item("al")] == ["Test Restaurant"]
+    assert repo.get_restaurants_with_item("Buffalo") == []
+    
+    db_session.query(MenuItem).filter(MenuItem.name == "Steak").update({"name": "Ribeye"})
+    db_session.commit()
+    assert repo.get_restaurants_with_item("steak") == []
+    assert [r.name for r in repo.get_restaurants_with_item("ribe")] == ["Test Restaurant"]
+
+
 def test_get_restaurant_stats(db_session):
     """Test getting restaurant statistics."""
     repo = RestaurantRepository(db_session)
@@ -169,4 +239,59 @@ def test_get_restaurant_stats_not_found(db_session):
     repo = RestaurantRepository(db_session)
     
     with pytest.raises(NotFoundError):
-        repo.get_restaurant_stats("Nonexistent Restaurant")
\ No newline at end of file
+        repo.get_restaurant_stats("Nonexistent Restaurant")
+
+def walk_pages(fetch_page):
+    """Follow cursors until the last page and return every item seen."""
+    items, cursor = [], None
+    while True:
+        page = fetch_page(cursor)
+        items.extend(page.items)
+        if page.next_cursor is None:
+            return items
+        cursor = page.next_cursor
+
+
+def test_keyset_pages_cover_every_item(db_session):
+    """Test that walking pages returns every item exactly once, in sorted order."""
+    section = db_session.query(Section).first()
+    db_session.add_all([
+        MenuItem(name=f"{'Pasta' if i % 2 else 'pasta'} {i % 3}", description="Pasta dish",
+                 price=None if i % 4 == 0 else float(i % 5), section_id=section.id)
+        for i in range(17)
+    ])
+    db_session.commit()
+    repo = RestaurantRepository(db_session)
+    
+    for sort_by in (None, SortBy.name, SortBy.price):
+        for order in (Order.asc, Order.desc):
+            expected = repo.get_restaurant_items("Test Restaurant", sort_by=sort_by, order=order)
+            paged = walk_pages(lambda cursor: repo.get_restaurant_items_page(
+                "Test Restaurant", sort_by=sort_by, order=order, limit=3, cursor=cursor
+            ))
+            assert [item.id for item in paged] == [item.id for item in expected]
+            
+            searched = walk_pages(lambda cursor: repo.search_items_page(
+                sort_by=sort_by, order=order, limit=4, cursor=cursor
+            ))
+            assert [item.id for item in searched] == [item.id for item in expected]
+    
+    ranked = repo.search_items_page(query_text="pasta", limit=100).items
+    assert [item.id for item in walk_pages(
+        lambda cursor: repo.search_items_page(query_text="pasta", limit=5, cursor=cursor)
+    )] == [item.id for item in ranked]
+    
+    priced = walk_pages(lambda cursor: repo.get_items_by_price_range_page(1, 3, limit=2, cursor=cursor))
+    assert [item.price for item in priced] == sorted(item.price for item in priced)
+    assert len(priced) == len(repo.get_items_by_price_range(1, 3, limit=100))
+
+
+def test_keyset_page_rejects_foreign_cursor(db_session):
+    """Test that a cursor only continues the listing and sort it came from."""
+    repo = RestaurantRepository(db_session)
+    cursor = repo.get_restaurant_items_page("Test Restaurant", sort_by=SortBy.price, limit=1).next_cursor
+    
+    with pytest.raises(ValidationError):
+        repo.get_restaurant_items_page("Test Restaurant", sort_by=SortBy.name, limit=1, cursor=cursor)
+    with pytest.raises(ValidationError):
+        repo.search_items_page(cursor="not-a-cursor")
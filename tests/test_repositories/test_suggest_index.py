@@ -0,0 +1,80 @@
+"""
+Tests for the name completion index.
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.ingest.loader import bulk_load
+from src.ingest.normalize import normalize_restaurant
+from src.repositories.memory_repository import MemoryRestaurantRepository, load_snapshot
+from src.repositories.restaurant_repository import RestaurantRepository
+from src.repositories.suggest_index import SuggestIndex, Suggestion
+from src.models.database import Base
+
+
+# Test database setup
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_suggest_index.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def test_complete_folds_case_and_accents():
+    """Test that prefixes match regardless of case and accents, in folded order."""
+    index = SuggestIndex([
+        ("Crème Brûlée", "item", 1),
+        ("Crepes", "section", 1),
+        ("Cream Soda", "item", 1),
+        ("Burger", "item", 1),
+    ])
+    assert index.complete("CRE") == [
+        Suggestion("Cream Soda", "item"),
+        Suggestion("Crème Brûlée", "item"),
+        Suggestion("Crepes", "section"),
+    ]
+    assert index.complete("crè") == index.complete("cre")
+    assert index.complete("  bur") == [Suggestion("Burger", "item")]
+    assert index.complete("x") == []
+    assert index.complete(" ") == []
+
+
+def test_spellings_merge_and_kinds_stay_apart():
+    """Test that spellings of one name merge to the most common one, per kind."""
+    index = SuggestIndex([
+        ("fries", "item", 1),
+        ("Fries", "item", 3),
+        ("FRIES", "item", 3),
+        ("Fries", "section", 1),
+        ("Fries", "restaurant", 1),
+    ])
+    assert index.complete("fr") == [
+        Suggestion("Fries", "restaurant"),
+        Suggestion("Fries", "section"),
+        Suggestion("FRIES", "item"),
+    ]
+    assert index.complete("fr", limit=2) == index.complete("fr")[:2]
+    assert len(index) == 3
+
+
+def test_memory_suggestions_match_sqlite(monkeypatch):
+    """Test that the snapshot and the database suggest the same names."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    menus = {
+        "Pizza Place": {"sections": [
+            {"name": "Pizzas", "items": [{"name": "Pepperoni"}, {"name": "pepperoni"}, {"name": "Pepperoni"}]},
+            {"name": "Pasta", "items": [{"name": "Penne"}]},
+        ]},
+        "Pasta Bar": {"sections": [{"name": "pasta", "items": [{"name": "Penne"}]}]},
+    }
+    bulk_load(engine, [normalize_restaurant(name, data) for name, data in menus.items()])
+    session = TestingSessionLocal()
+    try:
+        sql, memory = RestaurantRepository(session), MemoryRestaurantRepository(load_snapshot(engine))
+        # The test database has no build generation, so it is queried by prefix rather than indexed
+        monkeypatch.setattr(SuggestIndex, "load", None)
+        for prefix in ["p", "pa", "PE", "pizza", "z"]:
+            assert memory.get_suggestions(prefix, 3) == sql.get_suggestions(prefix, 3)
+        assert sql.get_suggestions("pe") == [Suggestion("Penne", "item"), Suggestion("Pepperoni", "item")]
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
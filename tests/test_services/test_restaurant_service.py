@@ -1,12 +1,16 @@
 """
 Tests for restaurant service.
 """
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from unittest.mock import Mock
 
-from src.services.restaurant_service import RestaurantService
+from src.repositories.restaurant_repository import RestaurantRepository
+from src.services.restaurant_service import RestaurantService, restaurant_flights
 from src.models.database import Base, Restaurant, Section, MenuItem
 from src.core.exceptions import NotFoundError
 
@@ -78,6 +82,32 @@ def test_get_restaurant_menu(db_session):
     assert menu["Test Section"][0]["name"] == "Test Item"
 
 
+def test_get_restaurant_menu_order_and_json(db_session):
+    """Test that the menu keeps menu order, empty sections and matches its JSON form."""
+    restaurant = db_session.query(Restaurant).first()
+    desserts = Section(name="Desserts", restaurant_id=restaurant.id)
+    drinks = Section(name="Drinks", restaurant_id=restaurant.id)
+    db_session.add_all([desserts, drinks, Restaurant(name="Empty Restaurant")])
+    db_session.flush()
+    db_session.add_all([
+        MenuItem(name="Sorbet", description=None, price=None, section_id=desserts.id),
+        MenuItem(name="Crème brûlée", description="Vanilla \"custard\"", price=7.5, section_id=desserts.id),
+    ])
+    db_session.commit()
+    service = RestaurantService(db_session)
+    
+    menu = service.get_restaurant_menu("Test Restaurant")
+    assert list(menu) == ["Test Section", "Desserts", "Drinks"]
+    assert [item["name"] for item in menu["Desserts"]] == ["Sorbet", "Crème brûlée"]
+    assert menu["Drinks"] == []
+    assert json.loads(service.get_restaurant_menu_json("Test Restaurant")) == menu
+    
+    assert service.get_restaurant_menu("Empty Restaurant") == {}
+    assert service.get_restaurant_menu_json("Empty Restaurant") == b"{}"
+    with pytest.raises(NotFoundError):
+        service.get_restaurant_menu_json("Nonexistent Restaurant")
+
+
 def test_get_nonexistent_restaurant_menu(db_session):
     """Test getting menu for nonexistent restaurant."""
     service = RestaurantService(db_session)
@@ -114,4 +144,22 @@ def test_get_restaurant_items(db_session):
     assert isinstance(items, list)
     assert len(items) >= 1
     assert items[0]["name"] == "Test Item"
-    assert items[0]["section"] == "Test Section"
\ No newline at end of file
+    assert items[0]["section"] == "Test Section"
+
+def test_concurrent_stats_share_one_read(db_session):
+    """Test that identical concurrent stats requests read the database once."""
+    release = threading.Event()
+    repository = RestaurantRepository(db_session)
+    read_stats = repository.get_restaurant_stats
+    repository.get_restaurant_stats = Mock(side_effect=lambda name: release.wait(5) and read_stats(name))
+    service = RestaurantService(repository=repository)
+    
+    shared_before = restaurant_flights.shared
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(service.get_restaurant_stats, "Test Restaurant") for _ in range(4)]
+        while restaurant_flights.shared < shared_before + 3:
+            release.wait(0.001)
+        release.set()
+    
+    assert repository.get_restaurant_stats.call_count == 1
+    assert all(future.result()["total_items"] == 1 for future in futures)
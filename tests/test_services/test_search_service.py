@@ -113,6 +113,22 @@ def test_search_items_with_sorting(db_session):
     assert prices == sorted(prices)
 
 
+def test_search_items_sorted_top_k(db_session):
+    """Test that sorting is applied before the limit, with unpriced items last."""
+    db_session.add(MenuItem(name="Daily Special", price=None, section_id=db_session.query(Section).first().id))
+    db_session.commit()
+    service = SearchService(db_session)
+    
+    cheapest = service.search_items(sort_by=SortBy.price, order=Order.asc, limit=2)
+    assert [item["price"] for item in cheapest] == [8.50, 11.25]
+    
+    priciest = service.search_items(sort_by=SortBy.price, order=Order.desc, limit=10)
+    assert [item["price"] for item in priciest] == [18.99, 15.75, 12.99, 11.25, 8.50, None]
+    
+    by_name = service.search_items(query="chicken", sort_by=SortBy.name, order=Order.desc, limit=2)
+    assert [item["name"] for item in by_name] == ["Grilled Chicken", "Chicken Wings"]
+
+
 def test_search_by_price_range(db_session):
     """Test searching by price range."""
     service = SearchService(db_session)